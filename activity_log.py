@@ -0,0 +1,443 @@
+"""
+Activity Log
+Append-only record of what the system did each day, with rolling aggregates
+
+Every event is one JSON line appended to logs/activity_log.jsonl and fsync'd,
+so a run never rewrites history and a crash can at worst lose the line being
+written. Per-day and per-week counts live in logs/activity_summary.json and are
+updated incrementally from the log tail after each append - reading a week
+means reading that small file, not the whole history.
+
+Appends and summary updates happen under an exclusive file lock, so two runs
+(cron + a manual run) can't clobber each other. Once the log grows past
+COMPACT_BYTES (and has doubled since the last compaction), events older than
+RETAIN_DAYS are folded into one "rollup" line per day; the summary stays
+derivable from the log alone.
+
+Events are typed (EVENT_TYPES): the tracker, draft store and email sender
+record applications, follow-ups, published posts and recruiter contacts as
+they happen; manual LinkedIn activity can be logged from the command line.
+window() answers "how many of each in this date range" from prefix sums over
+the daily totals - a couple of binary searches, however long the history.
+
+The old logs/activity_log.json array is imported the first time the log is
+created.
+
+Usage:
+    python activity_log.py record post_published topic="RAG evaluation"
+    python activity_log.py record recruiter_contacted contact="Priya (Swiggy)" via=linkedin
+    python activity_log.py window 2026-01-01 2026-01-31
+    python activity_log.py days --days 7
+    python activity_log.py weeks --weeks 4
+    python activity_log.py compact
+"""
+
+import argparse
+import bisect
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+DEFAULT_LOG_DIR = 'logs'
+LEGACY_LOG_NAME = 'activity_log.json'
+
+ROLLUP = "rollup"
+
+# Event type -> fields every event of that type must carry
+EVENT_TYPES = {
+    "prep_completed": (),
+    "post_published": ("topic",),
+    "application_sent": ("company", "role"),
+    "follow_up_sent": ("company",),
+    "recruiter_contacted": ("contact",),
+}
+
+# Compact once the log passes this size; keep raw events this many days
+COMPACT_BYTES = 1024 * 1024
+RETAIN_DAYS = 90
+
+
+def week_key(date: str) -> str:
+    """'2026-01-30' -> ISO week '2026-W05' (weeks start on Monday)"""
+    year, week, _ = datetime.strptime(date, "%Y-%m-%d").isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _bump(bucket: Dict[str, Dict[str, int]], key: str, counts: Dict[str, int]):
+    totals = bucket.setdefault(key, {})
+    for event_type, count in counts.items():
+        totals[event_type] = totals.get(event_type, 0) + count
+
+
+class ActivityLog:
+    """
+    JSONL event log plus an incrementally maintained day/week summary
+    """
+
+    def __init__(self, directory: str = DEFAULT_LOG_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.log_path = os.path.join(directory, 'activity_log.jsonl')
+        self.summary_path = os.path.join(directory, 'activity_summary.json')
+        self.lock_path = os.path.join(directory, '.activity_log.lock')
+        self._prefix_cache: Optional[Tuple] = None
+
+        if not os.path.exists(self.log_path):
+            self._import_legacy(os.path.join(directory, LEGACY_LOG_NAME))
+
+    # ------------------------------------------------------------------ locking
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Exclusive lock across processes for append + summary update"""
+        with open(self.lock_path, 'a+b') as f:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    # ------------------------------------------------------------------ writes
+
+    def record(self, event_type: str, when: Optional[datetime] = None, **fields) -> Dict:
+        """
+        Append one event and fold it into the day/week totals
+
+        Args:
+            event_type: one of EVENT_TYPES
+            when: event time (default now)
+            **fields: the type's required fields plus any JSON-serialisable extras
+
+        Returns:
+            The stored event
+        """
+        return self.record_many(event_type, [fields], when)[0]
+
+    def record_many(self, event_type: str, items: Iterable[Dict],
+                    when: Optional[datetime] = None) -> List[Dict]:
+        """Append several events of one type with a single write + fsync"""
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"Unknown event type: {event_type!r} (use one of {', '.join(EVENT_TYPES)})")
+        when = when or datetime.now()
+        events = []
+        for fields in items:
+            missing = [name for name in EVENT_TYPES[event_type] if not fields.get(name)]
+            if missing:
+                raise ValueError(f"{event_type} events need: {', '.join(missing)}")
+            events.append({
+                "type": event_type,
+                "date": when.strftime("%Y-%m-%d"),
+                "timestamp": when.isoformat(),
+                **fields
+            })
+        if not events:
+            return events
+
+        with self._locked():
+            self._append(events)
+            summary = self._catch_up()
+            # Compact again only once the log has doubled since the last time
+            if summary["log_offset"] > max(COMPACT_BYTES, 2 * summary.get("compacted_size", 0)):
+                self._compact_locked(RETAIN_DAYS)
+        return events
+
+    def _append(self, events: List[Dict]):
+        data = ''.join(json.dumps(event, ensure_ascii=False) + '\n' for event in events).encode('utf-8')
+        with open(self.log_path, 'a+b') as f:
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(end - 1)
+                if f.read(1) != b'\n':
+                    # Torn line from a crashed write: terminate it so ours parses
+                    data = b'\n' + data
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _import_legacy(self, legacy_path: str):
+        """Carry the old JSON array over (left in place untouched)"""
+        try:
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        events = []
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict) or not entry.get('date'):
+                continue
+            events.append({
+                "type": entry.get('status') or 'prep_completed',
+                "date": entry['date'],
+                "timestamp": entry.get('timestamp') or entry['date'],
+                "source": LEGACY_LOG_NAME
+            })
+        if events:
+            with self._locked():
+                if not os.path.exists(self.log_path):
+                    self._append(events)
+
+    # ------------------------------------------------------------------ summary upkeep
+
+    def _log_identity(self) -> Tuple[str, int]:
+        """(inode, size) of the log - compaction swaps the inode"""
+        try:
+            stat = os.stat(self.log_path)
+        except FileNotFoundError:
+            return '', 0
+        return str(stat.st_ino), stat.st_size
+
+    @staticmethod
+    def _empty_summary() -> Dict:
+        return {"log_inode": '', "log_offset": 0, "days": {}, "weeks": {}}
+
+    def _load_summary(self) -> Dict:
+        try:
+            with open(self.summary_path, 'r', encoding='utf-8') as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            return self._empty_summary()
+        if not isinstance(summary, dict) or "days" not in summary:
+            return self._empty_summary()
+        return summary
+
+    def _scan(self, start: int) -> Iterator[Tuple[int, Optional[Dict]]]:
+        """Yield (end offset, event or None if unreadable) for each complete line from start"""
+        with open(self.log_path, 'rb') as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # being written right now; pick it up next time
+                offset += len(line)
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    event = None
+                if not isinstance(event, dict) or not event.get('date'):
+                    event = None
+                yield offset, event
+
+    def _catch_up(self) -> Dict:
+        """Fold unseen log lines into the summary; caller holds the lock"""
+        summary = self._load_summary()
+        inode, size = self._log_identity()
+        offset = summary["log_offset"]
+        if inode != summary["log_inode"] or offset > size:
+            # Log was compacted elsewhere or replaced: rebuild
+            summary = self._empty_summary()
+            offset = 0
+        if offset == size and inode == summary["log_inode"]:
+            return summary
+
+        if size:
+            for offset, event in self._scan(offset):
+                if event is None:
+                    continue
+                if event.get('type') == ROLLUP:
+                    counts = event.get('counts') or {}
+                else:
+                    counts = {event.get('type') or 'unknown': 1}
+                _bump(summary["days"], event['date'], counts)
+                _bump(summary["weeks"], week_key(event['date']), counts)
+
+        summary["log_inode"] = inode
+        summary["log_offset"] = offset
+        self._write_summary(summary)
+        return summary
+
+    def _write_summary(self, summary: Dict):
+        tmp_path = self.summary_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.summary_path)
+
+    def summary(self) -> Dict:
+        """Current summary, caught up with anything other runs appended"""
+        summary = self._load_summary()
+        inode, size = self._log_identity()
+        if summary["log_inode"] == inode and summary["log_offset"] == size:
+            return summary
+        with self._locked():
+            return self._catch_up()
+
+    # ------------------------------------------------------------------ compaction
+
+    def compact(self, retain_days: int = RETAIN_DAYS) -> Tuple[int, int]:
+        """
+        Fold events older than retain_days into one rollup line per day
+
+        Returns:
+            (bytes before, bytes after)
+        """
+        with self._locked():
+            return self._compact_locked(retain_days)
+
+    def _compact_locked(self, retain_days: int) -> Tuple[int, int]:
+        summary = self._catch_up()
+        before = summary["log_offset"]
+        if not before:
+            return 0, 0
+        cutoff = (datetime.now() - timedelta(days=retain_days)).strftime("%Y-%m-%d")
+
+        rollups: Dict[str, Dict[str, int]] = {}
+        kept = []
+        for _, event in self._scan(0):
+            if event is None:
+                continue
+            if event['date'] >= cutoff:
+                kept.append(event)
+            elif event.get('type') == ROLLUP:
+                _bump(rollups, event['date'], event.get('counts') or {})
+            else:
+                _bump(rollups, event['date'], {event.get('type') or 'unknown': 1})
+
+        tmp_path = self.log_path + '.compact'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for date in sorted(rollups):
+                f.write(json.dumps({"type": ROLLUP, "date": date, "counts": rollups[date]}) + '\n')
+            for event in kept:
+                f.write(json.dumps(event, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.log_path)
+
+        # Totals are unchanged by compaction; only the log position moves
+        summary["log_inode"], summary["log_offset"] = self._log_identity()
+        summary["compacted_size"] = summary["log_offset"]
+        self._write_summary(summary)
+        return before, summary["log_offset"]
+
+    # ------------------------------------------------------------------ reads
+
+    def _prefix_sums(self) -> Tuple[List[str], List[Dict[str, int]]]:
+        """
+        Sorted active dates and running totals: cumulative[i] = sum of days before dates[i]
+
+        Rebuilt only when the summary changed since the last call.
+        """
+        summary = self.summary()
+        key = (summary["log_inode"], summary["log_offset"])
+        if self._prefix_cache and self._prefix_cache[0] == key:
+            return self._prefix_cache[1], self._prefix_cache[2]
+
+        dates = sorted(summary["days"])
+        cumulative = [{}]
+        for date in dates:
+            running = dict(cumulative[-1])
+            for event_type, count in summary["days"][date].items():
+                running[event_type] = running.get(event_type, 0) + count
+            cumulative.append(running)
+        self._prefix_cache = (key, dates, cumulative)
+        return dates, cumulative
+
+    def window(self, start: str, end: Optional[str] = None) -> Dict[str, int]:
+        """
+        {event type: count} for start..end inclusive (YYYY-MM-DD)
+
+        Every type in EVENT_TYPES is present (0 if none happened).
+        """
+        end = end or datetime.now().strftime("%Y-%m-%d")
+        dates, cumulative = self._prefix_sums()
+        lo = cumulative[bisect.bisect_left(dates, start)]
+        hi = cumulative[bisect.bisect_right(dates, end)]
+        totals = dict.fromkeys(EVENT_TYPES, 0)
+        for event_type, count in hi.items():
+            totals[event_type] = count - lo.get(event_type, 0)
+        return totals
+
+    def days(self, start: str, end: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """{date: {event type: count}} for start..end inclusive (YYYY-MM-DD)"""
+        end = end or datetime.now().strftime("%Y-%m-%d")
+        return {date: counts for date, counts in sorted(self.summary()["days"].items())
+                if start <= date <= end}
+
+    def weeks(self, count: int = 4) -> Dict[str, Dict[str, int]]:
+        """{ISO week: {event type: count}} for the last `count` weeks, oldest first"""
+        today = datetime.now()
+        keys = [week_key((today - timedelta(weeks=n)).strftime("%Y-%m-%d")) for n in range(count)]
+        weeks = self.summary()["weeks"]
+        return {key: weeks.get(key, {}) for key in reversed(keys)}
+
+    def days_active(self, start: str, end: Optional[str] = None) -> int:
+        end = end or datetime.now().strftime("%Y-%m-%d")
+        dates, _ = self._prefix_sums()
+        return bisect.bisect_right(dates, end) - bisect.bisect_left(dates, start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Activity log summaries')
+    parser.add_argument('--dir', default=DEFAULT_LOG_DIR, help='Log directory')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_record = sub.add_parser('record', help='Log an event by hand')
+    p_record.add_argument('type', choices=list(EVENT_TYPES))
+    p_record.add_argument('fields', nargs='*', metavar='key=value')
+
+    p_window = sub.add_parser('window', help='Event totals for a date range')
+    p_window.add_argument('start', help='YYYY-MM-DD')
+    p_window.add_argument('end', nargs='?', help='YYYY-MM-DD (default today)')
+
+    p_days = sub.add_parser('days', help='Per-day event counts')
+    p_days.add_argument('--days', type=int, default=7)
+
+    p_weeks = sub.add_parser('weeks', help='Per-week event counts')
+    p_weeks.add_argument('--weeks', type=int, default=4)
+
+    p_compact = sub.add_parser('compact', help='Fold old events into daily rollups')
+    p_compact.add_argument('--retain-days', type=int, default=RETAIN_DAYS)
+
+    args = parser.parse_args()
+    log = ActivityLog(args.dir)
+
+    if args.command == 'record':
+        fields = dict(field.partition('=')[::2] for field in args.fields)
+        try:
+            event = log.record(args.type, **fields)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        print(f"✅ Logged {event['type']} on {event['date']}")
+
+    elif args.command == 'window':
+        totals = log.window(args.start, args.end)
+        print(f"\n📊 {args.start} → {args.end or 'today'}:")
+        for name, count in totals.items():
+            print(f"   {name:20} {count}")
+
+    elif args.command == 'days':
+        start = (datetime.now() - timedelta(days=args.days - 1)).strftime("%Y-%m-%d")
+        days = log.days(start)
+        print(f"\n📅 Last {args.days} days ({len(days)} active):")
+        for date, counts in days.items():
+            print(f"   {date}  " + ", ".join(f"{name}: {n}" for name, n in sorted(counts.items())))
+
+    elif args.command == 'weeks':
+        print(f"\n📊 Last {args.weeks} weeks:")
+        for week, counts in log.weeks(args.weeks).items():
+            detail = ", ".join(f"{name}: {n}" for name, n in sorted(counts.items())) or "no activity"
+            print(f"   {week}  {detail}")
+
+    elif args.command == 'compact':
+        before, after = log.compact(args.retain_days)
+        print(f"✅ Compacted {log.log_path}: {before:,} → {after:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
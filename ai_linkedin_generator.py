@@ -4,10 +4,14 @@ Uses Claude API to create highly personalized, natural posts from study notes
 """
 
 import json
-from datetime import datetime
+from array import array
 from typing import List, Dict, Optional
 import os
 
+from draft_store import DraftStore
+from post_scoring import engagement_score, score_posts, BatchScores, HOOK_EMOJIS
+from engagement_model import EngagementModel, DEFAULT_MODEL_PATH
+
 
 class AILinkedInPostGenerator:
     """
@@ -18,18 +22,22 @@ class AILinkedInPostGenerator:
     - For standalone use, get API key from console.anthropic.com
     """
     
-    def __init__(self, user_profile: Dict[str, str] = None):
+    def __init__(self, user_profile: Dict[str, str] = None,
+                 engagement_model_path: str = DEFAULT_MODEL_PATH):
         """
         Initialize with optional user profile for personalization
         
         Args:
             user_profile: Dict with keys like 'name', 'background', 'goal', 'tone'
+            engagement_model_path: Trained engagement model (see engagement_model.py);
+                                   if the file is missing the heuristic score is used
         """
         self.user_profile = user_profile or {
             "background": "AI/ML learner completing certification",
             "goal": "Breaking into AI/ML career",
             "tone": "enthusiastic and educational"
         }
+        self.engagement_model = EngagementModel.load_if_present(engagement_model_path)
     
     def generate_ai_post(self, study_notes: str, style: str = "story") -> str:
         """
@@ -167,16 +175,16 @@ Now actively looking for opportunities to apply these skills in a professional s
         
         return templates.get(style, templates["story"])
     
-    def create_from_notes(self, notes_file: str, output_dir: str = "generated_posts") -> List[str]:
+    def create_from_notes(self, notes_file: str, store: Optional[DraftStore] = None) -> List[str]:
         """
         Read study notes from file and generate multiple post options
         
         Args:
             notes_file: Path to your notes (txt, md, etc.)
-            output_dir: Where to save generated posts
+            store: Draft store to save into (default data/drafts)
         
         Returns:
-            List of generated post filenames
+            List of draft ids, one per style
         """
         
         # Read notes
@@ -185,32 +193,29 @@ Now actively looking for opportunities to apply these skills in a professional s
         
         # Generate posts in different styles
         styles = ["story", "tips", "breakdown"]
-        generated_files = []
-        
-        os.makedirs(output_dir, exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        draft_ids = []
+        drafts = store or DraftStore()
+        topic = os.path.splitext(os.path.basename(notes_file))[0].replace('_', ' ')
         
         for style in styles:
             post = self.generate_ai_post(notes, style)
             
-            filename = f"{output_dir}/linkedin_{style}_{timestamp}.txt"
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(f"=== LinkedIn Post - {style.upper()} Style ===\n")
-                f.write(f"Generated: {datetime.now()}\n")
-                f.write(f"{'='*60}\n\n")
-                f.write(post)
-                f.write("\n\n" + "="*60)
-                f.write("\n\n📝 REVIEW CHECKLIST:")
-                f.write("\n[ ] Does it sound like me?")
-                f.write("\n[ ] Is it valuable to readers?")
-                f.write("\n[ ] Are hashtags relevant?")
-                f.write("\n[ ] Proofread for typos?")
-                f.write("\n[ ] Ready to engage with comments?")
-            
-            generated_files.append(filename)
-            print(f"✅ Generated {style} post: {filename}")
+            draft = drafts.save(post, topic=topic, style=style, content_type="personal_learning",
+                                source=f"notes:{notes_file}")
+            draft_ids.append(draft["id"])
+            print(f"✅ Generated {style} post: draft {draft['id']}")
+        
+        if store is None:
+            drafts.close()
         
-        return generated_files
+        print("\n📝 REVIEW CHECKLIST:")
+        print("[ ] Does it sound like me?")
+        print("[ ] Is it valuable to readers?")
+        print("[ ] Are hashtags relevant?")
+        print("[ ] Proofread for typos?")
+        print("[ ] Ready to engage with comments?")
+        
+        return draft_ids
     
     def analyze_post_quality(self, post_text: str) -> Dict[str, any]:
         """
@@ -221,6 +226,7 @@ Now actively looking for opportunities to apply these skills in a professional s
         - has_question
         - hashtag_count
         - engagement_score (estimated)
+        - score_source ('model' if a trained engagement model is loaded, else 'heuristic')
         - suggestions
         """
         
@@ -246,20 +252,45 @@ Now actively looking for opportunities to apply these skills in a professional s
         if '!' in post_text[:50]:
             suggestions.append("Great hook! Exclamation in first line grabs attention")
         
-        # Simple engagement score (0-100)
-        score = 50  # baseline
-        score += 10 if 150 <= words <= 200 else -10
-        score += 15 if has_question else 0
-        score += 10 if 3 <= hashtags <= 5 else -5
-        score += 10 if any(emoji in post_text for emoji in ['🎯', '💡', '🚀', '✨']) else 0
+        # Engagement score (0-100): learned from post history when available
+        if self.engagement_model:
+            score = self.engagement_model.score(post_text)
+        else:
+            has_emoji = any(emoji in post_text for emoji in HOOK_EMOJIS)
+            score = engagement_score(words, has_question, hashtags, has_emoji)
         
         return {
             "word_count": words,
             "has_question": has_question,
             "hashtag_count": hashtags,
-            "engagement_score": max(0, min(100, score)),
+            "engagement_score": score,
+            "score_source": "model" if self.engagement_model else "heuristic",
             "suggestions": suggestions
         }
+    
+    def analyze_post_batch(self, posts: List[str], weights: Dict[str, float] = None) -> BatchScores:
+        """
+        Score many candidate posts at once (e.g. A/B variants for one topic)
+        
+        Args:
+            posts: Candidate post texts
+            weights: Optional overrides for post_scoring.DEFAULT_WEIGHTS
+        
+        Returns:
+            BatchScores with word_count, has_question, hashtag_count,
+            has_emoji and engagement_score columns (engagement_score comes
+            from the trained model when one is loaded and no weights are given)
+        """
+        scores = score_posts(posts, weights)
+        
+        if self.engagement_model and weights is None:
+            predicted = self.engagement_model.score_batch(posts)
+            if isinstance(scores.engagement_score, array):
+                scores.engagement_score = array(scores.engagement_score.typecode, predicted)
+            else:  # NumPy column
+                scores.engagement_score[:] = predicted
+        
+        return scores
 
 
 def create_study_notes_template():
@@ -353,15 +384,14 @@ custom dataset with just 1000 images thanks to transfer learning.
         "tone": "enthusiastic learner, humble, technical but accessible"
     })
     
-    generated_files = generator.create_from_notes('/home/claude/example_notes.txt')
+    draft_ids = generator.create_from_notes('/home/claude/example_notes.txt')
     
     # Step 4: Analyze quality
     print("\n📊 STEP 4: Quality analysis...")
     
-    with open(generated_files[0], 'r') as f:
-        content = f.read()
-        # Extract just the post part
-        post_text = content.split('='*60)[2].strip()
+    drafts = DraftStore()
+    post_text = drafts.get(draft_ids[0])["text"]
+    drafts.close()
     
     analysis = generator.analyze_post_quality(post_text)
     
@@ -408,7 +438,7 @@ custom dataset with just 1000 images thanks to transfer learning.
    ✓ Mobile preview - most people read on phone
     """)
     
-    print("\n✅ All posts ready in 'generated_posts/' folder!")
+    print("\n✅ All posts saved as drafts - open them from the dashboard or: python draft_store.py list")
     print("🎯 Next: Review, personalize, and schedule your posts!")
 
 
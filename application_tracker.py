@@ -0,0 +1,706 @@
+"""
+Job Application Tracker
+SQLite-backed store for applications, statuses and next actions
+
+Replaces reading data/application_tracker.json whole. Status rollups, "due
+today" lists and this week's counts are indexed queries, so they stay instant
+with thousands of applications. Every update runs in one transaction and
+status changes are kept in a history table. Adding an application and
+marking a follow-up done from the CLI are recorded in the activity log.
+
+Follow-ups (7/14/21 days after applying) are materialized as rows when an
+application is added and cancelled in the same transaction when it moves to
+Interview, Offer or Rejected. The daily agenda reads only what is due, in date
+order, straight off partial indexes - it never recomputes dates for the whole
+tracker.
+
+The JSON file is still supported for import/export in its existing shape
+({"applications": [...], "template": {...}}), and is imported automatically
+into an empty database that hasn't imported it yet. Entries that don't
+validate are skipped and reported instead of stopping the import.
+
+Usage:
+    python application_tracker.py add Google "ML Engineer" --recruiter "Jane Smith" --next-date 2026-02-04
+    python application_tracker.py update 12 --status Interview --next-action "Prep system design"
+    python application_tracker.py list --status Applied
+    python application_tracker.py due
+    python application_tracker.py done 7            # mark follow-up #7 as sent
+    python application_tracker.py stats
+    python application_tracker.py import data/application_tracker.json
+    python application_tracker.py export data/application_tracker.json
+"""
+
+import heapq
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from activity_log import ActivityLog
+
+
+DEFAULT_DB_PATH = 'data/applications.db'
+DEFAULT_JSON_PATH = 'data/application_tracker.json'
+
+STATUSES = ("Applied", "In Review", "Interview", "Offer", "Rejected")
+
+# Applications in these states need no further follow-up
+CLOSED_STATUSES = ("Offer", "Rejected")
+
+# (kind, days after applying) - same cadence as the Day 7/14/21 checklist
+FOLLOW_UP_SCHEDULE = (("first_follow_up", 7), ("second_follow_up", 14), ("final_follow_up", 21))
+
+# Once an application reaches one of these, pending follow-ups are cancelled
+STOP_FOLLOW_UP_STATUSES = ("Interview", "Offer", "Rejected")
+
+# Columns callers may set through add()/update()
+FIELDS = ("company", "role", "recruiter", "recruiter_email", "job_url", "status",
+          "applied_date", "next_action", "next_action_date", "notes", "priority")
+
+_JSON_TEMPLATE = {
+    "date": "YYYY-MM-DD",
+    "company": "",
+    "role": "",
+    "recruiter": "",
+    "status": "Applied",
+    "next_action": ""
+}
+
+
+def normalize_status(status: str) -> str:
+    """'in review' -> 'In Review'; raises ValueError for unknown statuses"""
+    if not isinstance(status, str):
+        raise ValueError(f"Status must be text, got {status!r}")
+    for known in STATUSES:
+        if known.lower() == status.strip().lower():
+            return known
+    raise ValueError(f"Unknown status '{status}' (expected one of: {', '.join(STATUSES)})")
+
+
+def _check_date(value: Optional[str], field: str) -> Optional[str]:
+    """Dates are stored as zero-padded YYYY-MM-DD text so they sort and index correctly"""
+    if not value:
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"{field} must be YYYY-MM-DD, got {value!r}")
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"{field} must be YYYY-MM-DD, got {value!r}")
+
+
+class ApplicationStore:
+    """
+    Applications table plus a status history, with indexes for the daily queries
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA foreign_keys = ON")
+        has_follow_ups = self.db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'follow_ups'"
+        ).fetchone() is not None
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS applications (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                company TEXT NOT NULL,
+                role TEXT NOT NULL,
+                recruiter TEXT NOT NULL DEFAULT '',
+                recruiter_email TEXT NOT NULL DEFAULT '',
+                job_url TEXT NOT NULL DEFAULT '',
+                status TEXT NOT NULL DEFAULT 'Applied',
+                applied_date TEXT NOT NULL,
+                next_action TEXT NOT NULL DEFAULT '',
+                next_action_date TEXT,
+                notes TEXT NOT NULL DEFAULT '',
+                priority TEXT NOT NULL DEFAULT '',
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                UNIQUE (company, role, applied_date)
+            );
+            CREATE INDEX IF NOT EXISTS idx_applications_status ON applications (status);
+            CREATE INDEX IF NOT EXISTS idx_applications_next_action
+                ON applications (next_action_date) WHERE next_action_date IS NOT NULL;
+            CREATE INDEX IF NOT EXISTS idx_applications_applied ON applications (applied_date);
+
+            CREATE TABLE IF NOT EXISTS status_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                application_id INTEGER NOT NULL REFERENCES applications (id) ON DELETE CASCADE,
+                old_status TEXT,
+                new_status TEXT NOT NULL,
+                changed_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_status_history_app ON status_history (application_id);
+
+            CREATE TABLE IF NOT EXISTS follow_ups (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                application_id INTEGER NOT NULL REFERENCES applications (id) ON DELETE CASCADE,
+                kind TEXT NOT NULL,
+                due_date TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                completed_at TEXT,
+                UNIQUE (application_id, kind)
+            );
+            CREATE INDEX IF NOT EXISTS idx_follow_ups_pending
+                ON follow_ups (due_date) WHERE status = 'pending';
+
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """)
+        self.db.commit()
+
+        # Databases created before follow-ups existed get them on first open
+        if not has_follow_ups:
+            self.sync_follow_ups()
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self) -> 'ApplicationStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------ writes
+
+    def add(self, company: str, role: str, applied_date: Optional[str] = None,
+            status: str = "Applied", **fields) -> int:
+        """
+        Record a new application
+
+        Returns:
+            Application id
+        """
+        if not company.strip() or not role.strip():
+            raise ValueError("company and role are required")
+        values = self._clean({**fields, "status": status,
+                              "applied_date": applied_date or datetime.now().strftime("%Y-%m-%d")})
+        values["company"] = company.strip()
+        values["role"] = role.strip()
+
+        now = datetime.now().isoformat()
+        columns = list(values) + ["created_at", "updated_at"]
+        with self.db:
+            cursor = self.db.execute(
+                f"INSERT INTO applications ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                [*values.values(), now, now]
+            )
+            self._log_status(cursor.lastrowid, None, values["status"], now)
+            self._schedule_follow_ups(cursor.lastrowid, values["applied_date"], values["status"])
+        return cursor.lastrowid
+
+    def update(self, application_id: int, **changes) -> sqlite3.Row:
+        """
+        Change fields of one application in a single transaction
+
+        A status change is written to status_history in the same transaction.
+
+        Returns:
+            The updated row
+        """
+        values = self._clean(changes)
+        if not values:
+            raise ValueError("Nothing to update")
+
+        now = datetime.now().isoformat()
+        with self.db:
+            # Take the write lock before reading so the status history can't race
+            self.db.execute("BEGIN IMMEDIATE")
+            row = self.get(application_id)
+            if row is None:
+                raise KeyError(f"No application with id {application_id}")
+
+            assignments = ', '.join(f"{column} = ?" for column in values)
+            self.db.execute(
+                f"UPDATE applications SET {assignments}, updated_at = ? WHERE id = ?",
+                [*values.values(), now, application_id]
+            )
+            if "status" in values and values["status"] != row["status"]:
+                self._log_status(application_id, row["status"], values["status"], now)
+
+            status = values.get("status", row["status"])
+            if status in STOP_FOLLOW_UP_STATUSES:
+                self._cancel_follow_ups(application_id)
+            elif values.get("applied_date", row["applied_date"]) != row["applied_date"]:
+                # Re-dated application: rebuild the follow-ups that haven't happened yet
+                self.db.execute(
+                    "DELETE FROM follow_ups WHERE application_id = ? AND status IN ('pending', 'skipped')",
+                    (application_id,)
+                )
+                self._schedule_follow_ups(application_id, values["applied_date"], status)
+
+        return self.get(application_id)
+
+    def delete(self, application_id: int) -> bool:
+        with self.db:
+            cursor = self.db.execute("DELETE FROM applications WHERE id = ?", (application_id,))
+        return cursor.rowcount > 0
+
+    def _log_status(self, application_id: int, old: Optional[str], new: str, changed_at: str):
+        self.db.execute(
+            "INSERT INTO status_history (application_id, old_status, new_status, changed_at) "
+            "VALUES (?, ?, ?, ?)",
+            (application_id, old, new, changed_at)
+        )
+
+    # ------------------------------------------------------------------ follow-ups
+
+    def _schedule_follow_ups(self, application_id: int, applied_date: str, status: str,
+                             today: Optional[str] = None):
+        """
+        Materialize the follow-up rows for one application (idempotent)
+
+        When an old application is imported, follow-ups whose successor is also
+        already due are stored as 'skipped', so the agenda shows one reminder
+        per application instead of a backlog of three.
+        """
+        if status in STOP_FOLLOW_UP_STATUSES:
+            return
+        today = today or datetime.now().strftime("%Y-%m-%d")
+        base = datetime.strptime(applied_date, "%Y-%m-%d")
+        dates = [(kind, (base + timedelta(days=days)).strftime("%Y-%m-%d")) for kind, days in FOLLOW_UP_SCHEDULE]
+
+        rows = []
+        for i, (kind, due_date) in enumerate(dates):
+            superseded = i + 1 < len(dates) and dates[i + 1][1] <= today
+            rows.append((application_id, kind, due_date, 'skipped' if superseded else 'pending'))
+        self.db.executemany(
+            "INSERT OR IGNORE INTO follow_ups (application_id, kind, due_date, status) VALUES (?, ?, ?, ?)",
+            rows
+        )
+
+    def _cancel_follow_ups(self, application_id: int):
+        self.db.execute(
+            "UPDATE follow_ups SET status = 'cancelled' WHERE application_id = ? AND status = 'pending'",
+            (application_id,)
+        )
+
+    def sync_follow_ups(self) -> int:
+        """
+        Schedule follow-ups for open applications that have none yet
+
+        Returns:
+            Number of applications scheduled
+        """
+        rows = self.db.execute(
+            f"SELECT id, applied_date, status FROM applications a "
+            f"WHERE status NOT IN ({', '.join('?' for _ in STOP_FOLLOW_UP_STATUSES)}) "
+            f"AND NOT EXISTS (SELECT 1 FROM follow_ups f WHERE f.application_id = a.id)",
+            STOP_FOLLOW_UP_STATUSES
+        ).fetchall()
+        with self.db:
+            for row in rows:
+                self._schedule_follow_ups(row["id"], row["applied_date"], row["status"])
+        return len(rows)
+
+    def follow_ups_due(self, on_date: Optional[str] = None) -> List[sqlite3.Row]:
+        """Pending follow-ups due on or before on_date (default today), oldest first"""
+        on_date = on_date or datetime.now().strftime("%Y-%m-%d")
+        return self.db.execute(
+            "SELECT f.id AS follow_up_id, f.kind, f.due_date, a.id AS application_id, "
+            "a.company, a.role, a.recruiter, a.recruiter_email, a.status "
+            "FROM follow_ups f JOIN applications a ON a.id = f.application_id "
+            "WHERE f.status = 'pending' AND f.due_date <= ? ORDER BY f.due_date, f.id",
+            (on_date,)
+        ).fetchall()
+
+    def complete_follow_up(self, follow_up_id: int) -> Optional[sqlite3.Row]:
+        """
+        Mark a follow-up as sent
+
+        Returns:
+            The follow-up with its application's company/role/recruiter,
+            or None if it wasn't pending
+        """
+        with self.db:
+            cursor = self.db.execute(
+                "UPDATE follow_ups SET status = 'done', completed_at = ? WHERE id = ? AND status = 'pending'",
+                (datetime.now().isoformat(), follow_up_id)
+            )
+        if not cursor.rowcount:
+            return None
+        return self.db.execute(
+            "SELECT f.id AS follow_up_id, f.kind, f.due_date, a.id AS application_id, "
+            "a.company, a.role, a.recruiter "
+            "FROM follow_ups f JOIN applications a ON a.id = f.application_id WHERE f.id = ?",
+            (follow_up_id,)
+        ).fetchone()
+
+    def agenda(self, on_date: Optional[str] = None) -> List[Dict]:
+        """
+        Everything due on or before on_date: follow-ups and manual next actions
+
+        Both sources come back date-ordered from their indexes, so they are
+        merged lazily rather than re-sorted - the cost is proportional to what
+        is due, not to the size of the tracker.
+
+        Returns:
+            List of {due_date, type, application_id, company, role, action, follow_up_id}
+        """
+        follow_ups = (
+            {
+                "due_date": row["due_date"],
+                "type": "follow_up",
+                "application_id": row["application_id"],
+                "company": row["company"],
+                "role": row["role"],
+                "action": f"{row['kind'].replace('_', ' ').capitalize()}"
+                          + (f" with {row['recruiter']}" if row["recruiter"] else ""),
+                "follow_up_id": row["follow_up_id"]
+            }
+            for row in self.follow_ups_due(on_date)
+        )
+        next_actions = (
+            {
+                "due_date": row["next_action_date"],
+                "type": "next_action",
+                "application_id": row["id"],
+                "company": row["company"],
+                "role": row["role"],
+                "action": row["next_action"] or "Next action",
+                "follow_up_id": None
+            }
+            for row in self.due(on_date)
+        )
+        return list(heapq.merge(follow_ups, next_actions, key=lambda item: item["due_date"]))
+
+    # ------------------------------------------------------------------ validation
+
+    @staticmethod
+    def _clean(fields: Dict) -> Dict:
+        """Validate caller-supplied columns (unknown names, statuses and dates raise)"""
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown application fields: {', '.join(sorted(unknown))}")
+
+        values = {}
+        for field, value in fields.items():
+            if field == "status":
+                value = normalize_status(value)
+            elif field in ("applied_date", "next_action_date"):
+                value = _check_date(value, field)
+                if value is None and field == "applied_date":
+                    raise ValueError("applied_date cannot be empty")
+            elif value is None:
+                value = ''
+            else:
+                value = str(value).strip()
+            values[field] = value
+        return values
+
+    # ------------------------------------------------------------------ reads
+
+    def get(self, application_id: int) -> Optional[sqlite3.Row]:
+        return self.db.execute("SELECT * FROM applications WHERE id = ?", (application_id,)).fetchone()
+
+    def list(self, status: Optional[str] = None, limit: Optional[int] = None) -> List[sqlite3.Row]:
+        """Applications, newest first, optionally for one status"""
+        query = "SELECT * FROM applications"
+        params = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(normalize_status(status))
+        query += " ORDER BY applied_date DESC, id DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self.db.execute(query, params).fetchall()
+
+    def history(self, application_id: int) -> List[sqlite3.Row]:
+        return self.db.execute(
+            "SELECT old_status, new_status, changed_at FROM status_history "
+            "WHERE application_id = ? ORDER BY id",
+            (application_id,)
+        ).fetchall()
+
+    def status_counts(self) -> Dict[str, int]:
+        """{status: count} straight off the status index"""
+        return dict(self.db.execute(
+            "SELECT status, COUNT(*) FROM applications GROUP BY status"
+        ).fetchall())
+
+    def count_applied_since(self, since_date: str) -> int:
+        return self.db.execute(
+            "SELECT COUNT(*) FROM applications WHERE applied_date >= ?", (since_date,)
+        ).fetchone()[0]
+
+    def due(self, on_date: Optional[str] = None) -> List[sqlite3.Row]:
+        """Open applications whose next action is due on or before on_date (default today)"""
+        on_date = on_date or datetime.now().strftime("%Y-%m-%d")
+        return self.db.execute(
+            f"SELECT * FROM applications WHERE next_action_date IS NOT NULL AND next_action_date <= ? "
+            f"AND status NOT IN ({', '.join('?' for _ in CLOSED_STATUSES)}) "
+            f"ORDER BY next_action_date, id",
+            (on_date, *CLOSED_STATUSES)
+        ).fetchall()
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM applications").fetchone()[0]
+
+    def meta(self, key: str) -> Optional[str]:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    # ------------------------------------------------------------------ JSON import/export
+
+    def import_json(self, path: str = DEFAULT_JSON_PATH) -> Tuple[int, List[str]]:
+        """
+        Import applications from the JSON tracker format, in one transaction
+
+        Entries already present (same company, role and date) are updated rather
+        than duplicated, so importing the same file twice is harmless. Entries
+        that don't validate (no company or role, unknown status, bad date) are
+        skipped and reported; the rest are imported.
+
+        Returns:
+            (number of entries imported, one message per skipped entry)
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        now = datetime.now().isoformat()
+        count = 0
+        skipped = []
+        with self.db:
+            for number, entry in enumerate(data.get('applications', []), 1):
+                if not isinstance(entry, dict):
+                    skipped.append(f"entry {number}: not a JSON object")
+                    continue
+                company = str(entry.get('company') or '').strip()
+                role = str(entry.get('role') or '').strip()
+                if not company or not role:
+                    skipped.append(f"entry {number}: missing company/role")
+                    continue
+                extra = {field: entry[field] for field in FIELDS if field in entry and field != "applied_date"}
+                try:
+                    values = self._clean({**extra, "applied_date": entry.get('date') or entry.get('applied_date')
+                                          or datetime.now().strftime("%Y-%m-%d")})
+                except (ValueError, TypeError, AttributeError) as e:
+                    skipped.append(f"entry {number} ({company} - {role}): {e}")
+                    continue
+                values["company"], values["role"] = company, role
+                values.setdefault("status", "Applied")
+
+                columns = list(values)
+                updates = ', '.join(f"{column} = excluded.{column}" for column in columns
+                                    if column not in ("company", "role", "applied_date"))
+                self.db.execute(
+                    f"INSERT INTO applications ({', '.join(columns)}, created_at, updated_at) "
+                    f"VALUES ({', '.join('?' for _ in columns)}, ?, ?) "
+                    f"ON CONFLICT (company, role, applied_date) DO UPDATE SET {updates}, updated_at = excluded.updated_at",
+                    [*values.values(), now, now]
+                )
+                app_id = self.db.execute(
+                    "SELECT id FROM applications WHERE company = ? AND role = ? AND applied_date = ?",
+                    (company, role, values["applied_date"])
+                ).fetchone()[0]
+                if not self.db.execute("SELECT 1 FROM status_history WHERE application_id = ?", (app_id,)).fetchone():
+                    self._log_status(app_id, None, values["status"], now)
+                if values["status"] in STOP_FOLLOW_UP_STATUSES:
+                    self._cancel_follow_ups(app_id)
+                else:
+                    self._schedule_follow_ups(app_id, values["applied_date"], values["status"])
+                count += 1
+            self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_imported', ?)", (now,))
+
+        return count, skipped
+
+    def export_json(self, path: str = DEFAULT_JSON_PATH) -> int:
+        """
+        Write every application in the JSON tracker format
+
+        The "template" block of an existing file is preserved.
+
+        Returns:
+            Number of applications written
+        """
+        template = _JSON_TEMPLATE
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    template = json.load(f).get('template', template)
+            except (OSError, ValueError):
+                pass
+
+        applications = []
+        for row in self.db.execute("SELECT * FROM applications ORDER BY applied_date, id"):
+            entry = {
+                "date": row["applied_date"],
+                "company": row["company"],
+                "role": row["role"],
+                "recruiter": row["recruiter"],
+                "status": row["status"],
+                "next_action": row["next_action"]
+            }
+            # Optional columns only appear when set, keeping the file close to the original shape
+            for field in ("next_action_date", "recruiter_email", "job_url", "notes", "priority"):
+                if row[field]:
+                    entry[field] = row[field]
+            applications.append(entry)
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"applications": applications, "template": template}, f, indent=2, ensure_ascii=False)
+
+        return len(applications)
+
+
+def open_tracker(path: str = DEFAULT_DB_PATH, json_path: str = DEFAULT_JSON_PATH) -> ApplicationStore:
+    """
+    Open the tracker database, importing the JSON tracker on first use
+
+    "First use" is an empty database that has never imported the file, so an
+    import that failed part-way is retried on the next open.
+    """
+    store = ApplicationStore(path)
+    if os.path.exists(json_path) and store.meta('json_imported') is None and not len(store):
+        count, skipped = store.import_json(json_path)
+        print(f"📥 Imported {count} applications from {json_path}")
+        for message in skipped:
+            print(f"   ⚠️  Skipped {message}")
+    return store
+
+
+def week_start(today: Optional[datetime] = None) -> str:
+    """Date seven days ago (inclusive window for weekly rollups)"""
+    return ((today or datetime.now()) - timedelta(days=6)).strftime("%Y-%m-%d")
+
+
+def _print_rows(rows: List[sqlite3.Row]):
+    if not rows:
+        print("   (none)")
+    for row in rows:
+        line = f"   #{row['id']:<4} {row['applied_date']}  {row['status']:<10} {row['company']} - {row['role']}"
+        if row['next_action'] or row['next_action_date']:
+            line += f"\n         → {row['next_action'] or 'next action'} ({row['next_action_date'] or 'no date'})"
+        print(line)
+
+
+def _print_agenda(items: List[Dict]):
+    if not items:
+        print("   (nothing due)")
+    for item in items:
+        tag = f"follow-up #{item['follow_up_id']}" if item["follow_up_id"] else f"app #{item['application_id']}"
+        print(f"   {item['due_date']}  {item['company']} - {item['role']}")
+        print(f"         → {item['action']} ({tag})")
+
+
+def main():
+    """Command-line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Track job applications')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def add_field_options(command, for_update=False):
+        if for_update:
+            command.add_argument('--company')
+            command.add_argument('--role')
+            command.add_argument('--date', dest='applied_date')
+        command.add_argument('--status', default=None if for_update else 'Applied')
+        command.add_argument('--recruiter')
+        command.add_argument('--recruiter-email')
+        command.add_argument('--job-url')
+        command.add_argument('--next-action')
+        command.add_argument('--next-date', dest='next_action_date')
+        command.add_argument('--notes')
+        command.add_argument('--priority', choices=['High', 'Medium', 'Low'])
+
+    add = sub.add_parser('add', help='Record a new application')
+    add.add_argument('company')
+    add.add_argument('role')
+    add.add_argument('--date', dest='applied_date', help='Application date (default today)')
+    add_field_options(add)
+
+    update = sub.add_parser('update', help='Change an application')
+    update.add_argument('id', type=int)
+    add_field_options(update, for_update=True)
+
+    listing = sub.add_parser('list', help='List applications')
+    listing.add_argument('--status')
+    listing.add_argument('--limit', type=int, default=50)
+
+    due = sub.add_parser('due', help='Follow-ups and next actions due today or earlier')
+    due.add_argument('--date', help='Check as of this date (default today)')
+
+    done = sub.add_parser('done', help='Mark a follow-up as sent')
+    done.add_argument('follow_up_id', type=int)
+
+    sub.add_parser('stats', help='Status counts')
+
+    for name, help_text in (('import', 'Import the JSON tracker'), ('export', 'Export to the JSON tracker')):
+        command = sub.add_parser(name, help=help_text)
+        command.add_argument('path', nargs='?', default=DEFAULT_JSON_PATH)
+
+    args = parser.parse_args()
+    fields = {field: getattr(args, field) for field in FIELDS
+              if getattr(args, field, None) is not None and field not in ('company', 'role')}
+
+    with ApplicationStore(args.db) as store:
+        try:
+            if args.command == 'add':
+                app_id = store.add(args.company, args.role, **fields)
+                print(f"✅ Added application #{app_id}: {args.company} - {args.role}")
+                applied = store.get(app_id)["applied_date"]
+                ActivityLog().record("application_sent", when=datetime.strptime(applied, "%Y-%m-%d"),
+                                     company=args.company, role=args.role, application_id=app_id)
+
+            elif args.command == 'update':
+                if args.company:
+                    fields['company'] = args.company
+                if args.role:
+                    fields['role'] = args.role
+                row = store.update(args.id, **fields)
+                print(f"✅ Updated #{row['id']}: {row['company']} - {row['role']} [{row['status']}]")
+
+            elif args.command == 'list':
+                rows = store.list(args.status, args.limit)
+                print(f"\n📋 Applications ({len(rows)} shown, {len(store)} total):")
+                _print_rows(rows)
+
+            elif args.command == 'due':
+                items = store.agenda(args.date)
+                print(f"\n⏰ Due ({len(items)}):")
+                _print_agenda(items)
+
+            elif args.command == 'done':
+                follow_up = store.complete_follow_up(args.follow_up_id)
+                if follow_up:
+                    print(f"✅ Follow-up #{args.follow_up_id} done")
+                    ActivityLog().record("follow_up_sent", company=follow_up["company"], role=follow_up["role"],
+                                         kind=follow_up["kind"], application_id=follow_up["application_id"])
+                else:
+                    print(f"❌ No pending follow-up #{args.follow_up_id}")
+
+            elif args.command == 'stats':
+                print(f"\n📊 {len(store)} applications, {store.count_applied_since(week_start())} this week")
+                for status, count in sorted(store.status_counts().items()):
+                    print(f"   {status:<10} {count}")
+
+            elif args.command == 'import':
+                count, skipped = store.import_json(args.path)
+                print(f"✅ Imported {count} applications from {args.path}")
+                for message in skipped:
+                    print(f"   ⚠️  Skipped {message}")
+
+            elif args.command == 'export':
+                print(f"✅ Exported {store.export_json(args.path)} applications to {args.path}")
+
+        except sqlite3.IntegrityError:
+            # UNIQUE (company, role, applied_date) - from add, or an update that collides
+            print("❌ An application with that company, role and date is already recorded "
+                  "(see: python application_tracker.py list)")
+        except (KeyError, ValueError) as e:
+            print(f"❌ {e.args[0] if e.args else e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,8 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import os
 
+from template_engine import TemplateEngine, get_default_engine
+
 
 class ContentAggregator:
     """
@@ -181,71 +183,19 @@ class ContentTypeGenerator:
     Generate LinkedIn posts for different content types
     """
     
-    def __init__(self):
+    def __init__(self, template_engine: TemplateEngine = None):
+        self.template_engine = template_engine or get_default_engine()
         self.post_templates = self._load_templates()
     
     def _load_templates(self) -> Dict:
-        """Load post templates for different content types"""
+        """Hook options and structure for each content type (from data/post_templates.json)"""
         return {
-            "personal_learning": {
-                "hook_options": [
-                    "Just learned something mind-blowing about",
-                    "Today's breakthrough:",
-                    "Finally understood why",
-                    "Deep dive into"
-                ],
-                "structure": "hook + insights + question + hashtags"
-            },
-            
-            "news_update": {
-                "hook_options": [
-                    "Breaking in AI:",
-                    "Major update:",
-                    "Just dropped:",
-                    "This changes everything:"
-                ],
-                "structure": "hook + summary + implications + link + hashtags"
-            },
-            
-            "app_launch": {
-                "hook_options": [
-                    "New tool alert:",
-                    "Just discovered:",
-                    "Game-changer just launched:",
-                    "Worth checking out:"
-                ],
-                "structure": "hook + features + use_cases + call_to_action + hashtags"
-            },
-            
-            "research_paper": {
-                "hook_options": [
-                    "Fascinating new research:",
-                    "Paper breakdown:",
-                    "Latest from [Lab]:",
-                    "This paper is wild:"
-                ],
-                "structure": "hook + key_findings + implications + link + hashtags"
-            },
-            
-            "company_announcement": {
-                "hook_options": [
-                    "Big news from [Company]:",
-                    "[Company] just announced:",
-                    "Major development:",
-                    "Industry shift:"
-                ],
-                "structure": "hook + announcement + analysis + implications + hashtags"
-            },
-            
-            "tutorial_share": {
-                "hook_options": [
-                    "Here's how to",
-                    "Quick tutorial:",
-                    "Step-by-step:",
-                    "Learn this in 5 minutes:"
-                ],
-                "structure": "hook + steps + example + resources + hashtags"
+            content_type: {
+                "hook_options": definition["hook_options"],
+                "structure": definition["structure"]
             }
+            for content_type, definition in self.template_engine.definitions.items()
+            if "hook_options" in definition
         }
     
     def generate_news_post(self, title: str, summary: str, source: str, 
@@ -258,82 +208,19 @@ class ContentTypeGenerator:
             summary: Brief summary
             source: Source name (e.g., "OpenAI Blog")
             link: URL to original content
-            post_style: 'informative', 'excited', 'analytical'
+            post_style: 'informative', 'excited', 'analytical' (or any news_update
+                        style added to data/post_templates.json)
         """
         
-        if post_style == "excited":
-            post = f"""🚀 Just saw this - {title}
-
-{summary}
-
-This is HUGE because:
-→ [Your insight 1]
-→ [Your insight 2]
-→ [Your insight 3]
-
-What are your thoughts on this development?
-
-Source: {source}
-Read more: {link}
-
-#AI #MachineLearning #TechNews #Innovation"""
-
-        elif post_style == "analytical":
-            post = f"""📊 Analysis: {title}
-
-Key points:
-• {summary[:100]}...
-
-My take:
-This signals [your analysis]. The implications for AI/ML are significant because [your reasoning].
-
-Worth watching: [what to watch next]
-
-Full details: {link}
-
-#ArtificialIntelligence #AITrends #TechAnalysis"""
-
-        else:  # informative
-            post = f"""📰 Update from {source}:
-
-{title}
-
-{summary}
-
-Why this matters:
-→ [Implication 1]
-→ [Implication 2]
-
-Link in comments 👇
-
-#AI #MachineLearning #TechUpdate #{source.replace(' ', '')}"""
-        
-        return post
+        return self.template_engine.render("news_update", post_style, title=title,
+                                           summary=summary, source=source, link=link)
     
     def generate_app_launch_post(self, app_name: str, description: str, 
                                  features: List[str], link: str) -> str:
         """Generate post for new app/tool launch"""
         
-        features_text = "\n".join([f"✓ {feature}" for feature in features[:4]])
-        
-        post = f"""🔥 New tool alert: {app_name}
-
-{description}
-
-Key features:
-{features_text}
-
-Perfect for: [your use case]
-
-I'm particularly excited about [specific feature] because [reason].
-
-Who's planning to try this?
-
-Check it out: {link}
-
-#AITools #MachineLearning #ProductLaunch #TechTools"""
-        
-        return post
+        return self.template_engine.render("app_launch", None, app_name=app_name,
+                                           description=description, features=features, link=link)
     
     def generate_learning_news_mix(self, learning_content: str, 
                                    news_content: str) -> str:
@@ -341,21 +228,9 @@ Check it out: {link}
         Mix personal learning with news - shows you're both learning and informed
         """
         
-        post = f"""🎯 Connecting the dots...
-
-While studying {learning_content}, I came across this news:
-
-{news_content}
-
-Interesting timing! This real-world development validates exactly what I've been learning about. 
-
-The practical implications are clear: [your insight]
-
-Anyone else seeing this pattern?
-
-#MachineLearning #AI #ContinuousLearning #TechNews"""
-        
-        return post
+        return self.template_engine.render("learning_news_mix", None,
+                                           learning_content=learning_content,
+                                           news_content=news_content)
 
 
 class ContentCalendar:
@@ -0,0 +1,448 @@
+"""
+Local Dashboard Server
+Serves content_creator_dashboard.html plus a small JSON API over the news items
+
+Endpoints:
+    GET /                        the dashboard
+    GET /api/items               paginated, filterable news items (newest first)
+        ?page=1&per_page=20&category=blogs&source=OpenAI%20Blog&q=agents&since=2026-01-29
+    GET /api/items/<id>          one item (for pre-filling the news form)
+    GET /api/sources             {category: {source: item count}}
+    GET /api/stream              server-sent events: new items as they are aggregated
+    GET /api/drafts              saved drafts, newest first (?page, per_page, status, style, topic, q)
+    GET /api/drafts/<id>         one draft with its full text
+    POST /api/drafts             create a draft, or save a new revision ({"id": ...})
+    GET /metrics                 aggregator metrics, Prometheus text format (see feed_metrics.py)
+
+Responses carry an ETag and honour If-None-Match (304), and are gzipped when
+the browser accepts it. The browser only ever fetches one page of items, so
+the dashboard stays fast however many months of news have been aggregated.
+
+The live stream only sends deltas: a watcher thread notices when the
+aggregated files change and broadcasts just the new items to every open tab.
+Event ids carry a per-run prefix, so a browser reconnecting with
+Last-Event-ID gets exactly what it missed - or a "reset" event telling it to
+reload when the gap can't be filled (server restarted, or it was away so long
+the backlog was trimmed).
+
+Binds to localhost only - this is a personal tool, not a public service.
+
+Usage:
+    python dashboard_server.py              # http://127.0.0.1:8000
+    python dashboard_server.py --port 8080
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import feed_metrics
+from draft_store import DraftStore
+from news_store import DEFAULT_CONTENT_PATHS, NewsItemStore
+
+
+DASHBOARD_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'content_creator_dashboard.html')
+
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+
+# Smaller bodies aren't worth the gzip header overhead
+GZIP_MIN_BYTES = 1024
+
+# A LinkedIn post is at most 3,000 characters; anything far larger is a mistake
+MAX_POST_BODY_BYTES = 256 * 1024
+
+# Live stream tuning
+WATCH_INTERVAL_SECONDS = 2      # how often the content files are stat()ed
+HEARTBEAT_SECONDS = 15          # comment lines keep proxies from closing idle streams
+STREAM_BACKLOG = 500            # events kept for Last-Event-ID resume
+SSE_RETRY_MS = 3000
+
+
+class NewsBroadcaster:
+    """
+    Fan-out of new-item events to any number of SSE connections
+
+    Events live in one shared ring buffer; each connection just remembers the
+    last sequence number it sent and waits on a condition for more. A slow tab
+    never blocks the others, and nothing is copied per subscriber.
+    """
+
+    def __init__(self, backlog: int = STREAM_BACKLOG):
+        # Distinguishes this run's event ids from a previous server's
+        self.epoch = format(int(time.time() * 1000), 'x')
+        self._events = deque(maxlen=backlog)    # (seq, payload json)
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def publish(self, items: List[Dict]):
+        payload = json.dumps({"items": items}, ensure_ascii=False)
+        with self._cond:
+            self._seq += 1
+            self._events.append((self._seq, payload))
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def resume_point(self, last_event_id: Optional[str]) -> Tuple[int, bool]:
+        """
+        Where a (re)connecting client should continue
+
+        Returns:
+            (last sequence number the client has, whether it must reset)
+        """
+        with self._cond:
+            current = self._seq
+            oldest = self._events[0][0] if self._events else current + 1
+
+        if not last_event_id:
+            return current, False
+        epoch, _, seq = last_event_id.partition('-')
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > current:
+            return current, True
+        # Events after seq must all still be in the buffer
+        if int(seq) + 1 < oldest:
+            return current, True
+        return int(seq), False
+
+    def wait_for(self, after_seq: int, timeout: float) -> List[Tuple[int, str]]:
+        """Events newer than after_seq, waiting up to timeout for the first one"""
+        with self._cond:
+            if self._seq <= after_seq and not self._closed:
+                self._cond.wait(timeout)
+            if self._seq <= after_seq:
+                return []
+            return [event for event in self._events if event[0] > after_seq]
+
+
+class DashboardRequestHandler(BaseHTTPRequestHandler):
+    """Routes GET requests to the dashboard file or the JSON API"""
+
+    server_version = "ContentDashboard/1.0"
+
+    # set on the server: store (NewsItemStore), broadcaster (NewsBroadcaster),
+    # drafts (DraftStore), quiet (bool)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        try:
+            if url.path in ('/', '/index.html', '/content_creator_dashboard.html'):
+                self._send_file(DASHBOARD_PATH, 'text/html; charset=utf-8')
+            elif url.path == '/api/items':
+                self._send_items(params)
+            elif url.path.startswith('/api/items/'):
+                self._send_item(unquote(url.path[len('/api/items/'):]))
+            elif url.path == '/api/stream':
+                self._stream(params)
+            elif url.path == '/api/sources':
+                store = self._store()
+                self._send_json(store.sources(), etag_key=f"sources-{store.etag}")
+            elif url.path == '/api/drafts':
+                self._send_drafts(params)
+            elif url.path.startswith('/api/drafts/'):
+                self._send_draft(unquote(url.path[len('/api/drafts/'):]))
+            elif url.path == '/metrics':
+                self._send_body(feed_metrics.read_textfiles().encode('utf-8'),
+                                'text/plain; version=0.0.4; charset=utf-8', None)
+            else:
+                self._send_error(404, f"No route for {url.path}")
+        except ValueError as e:
+            self._send_error(400, str(e))
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        try:
+            if url.path == '/api/drafts':
+                self._save_draft(self._read_json())
+            else:
+                self._send_error(404, f"No route for POST {url.path}")
+        except KeyError as e:
+            self._send_error(404, e.args[0])
+        except ValueError as e:
+            self._send_error(400, str(e))
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_POST_BODY_BYTES:
+            raise ValueError(f"Request body too large ({length} bytes)")
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            raise ValueError("Request body must be JSON")
+        if not isinstance(payload, dict):
+            raise ValueError("Request body must be a JSON object")
+        return payload
+
+    # ------------------------------------------------------------------ routes
+
+    def _store(self) -> NewsItemStore:
+        store = self.server.store
+        store.refresh()
+        return store
+
+    def _send_items(self, params: Dict[str, str]):
+        page = _positive_int(params.get('page', '1'), 'page')
+        per_page = min(_positive_int(params.get('per_page', str(DEFAULT_PER_PAGE)), 'per_page'), MAX_PER_PAGE)
+        filters = {key: params.get(key) or None for key in ('category', 'source', 'q', 'since')}
+
+        store = self._store()
+        # The content files' tag plus the query fully determine the page, so the
+        # ETag is known before any filtering - a 304 costs next to nothing
+        etag_key = f"items-{store.etag}-{page}-{per_page}-{sorted(filters.items())}"
+        if self._not_modified(etag_key):
+            return
+
+        items, total = store.query(offset=(page - 1) * per_page, limit=per_page, **filters)
+        self._send_json({
+            "items": items,
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "pages": (total + per_page - 1) // per_page
+        }, etag_key=etag_key)
+
+    def _send_item(self, item_id: str):
+        store = self._store()
+        item = store.get(item_id)
+        if item is None:
+            self._send_error(404, f"No item {item_id}")
+            return
+        self._send_json(item, etag_key=f"item-{store.etag}-{item_id}")
+
+    def _send_drafts(self, params: Dict[str, str]):
+        page = _positive_int(params.get('page', '1'), 'page')
+        per_page = min(_positive_int(params.get('per_page', str(DEFAULT_PER_PAGE)), 'per_page'), MAX_PER_PAGE)
+        filters = {key: params.get(key) or None for key in ('status', 'style', 'topic', 'q')}
+
+        drafts, total = self.server.drafts.list(offset=(page - 1) * per_page, limit=per_page, **filters)
+        self._send_json({
+            "drafts": drafts,
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "pages": (total + per_page - 1) // per_page
+        })
+
+    def _send_draft(self, draft_id: str):
+        draft = self.server.drafts.get(draft_id)
+        if draft is None:
+            self._send_error(404, f"No draft {draft_id}")
+            return
+        etag_key = f"draft-{draft_id}-{draft['rev']}"
+        if not self._not_modified(etag_key):
+            self._send_json(draft, etag_key=etag_key)
+
+    def _save_draft(self, payload: Dict):
+        text = payload.pop('text', None)
+        if not isinstance(text, str) or not text.strip():
+            raise ValueError("text is required")
+        draft_id = payload.pop('id', None) or None
+        fields = {key: str(value) for key, value in payload.items() if value is not None}
+        draft = self.server.drafts.save(text, draft_id, **fields)
+        self._send_json({key: draft[key] for key in ('id', 'rev', 'status', 'updated_at')},
+                        status=200 if draft_id else 201)
+
+    def _stream(self, params: Dict[str, str]):
+        """Hold the connection open and write SSE events until the client goes away"""
+        broadcaster = self.server.broadcaster
+        category = params.get('category') or None
+        last_event_id = self.headers.get('Last-Event-ID') or params.get('last_event_id')
+        seq, reset = broadcaster.resume_point(last_event_id)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('X-Accel-Buffering', 'no')
+        self.end_headers()
+        self.close_connection = True
+
+        try:
+            self.wfile.write(f"retry: {SSE_RETRY_MS}\n\n".encode('utf-8'))
+            if reset:
+                self._write_event('reset', broadcaster.event_id(seq), '{}')
+            self.wfile.flush()
+
+            while not broadcaster.closed:
+                events = broadcaster.wait_for(seq, HEARTBEAT_SECONDS)
+                if not events:
+                    self.wfile.write(b": keep-alive\n\n")
+                elif events[0][0] > seq + 1:
+                    # Fell further behind than the backlog holds
+                    self._write_event('reset', broadcaster.event_id(events[0][0] - 1), '{}')
+                for seq, payload in events:
+                    if category is not None:
+                        items = [item for item in json.loads(payload)["items"] if item["category"] == category]
+                        if not items:
+                            continue
+                        payload = json.dumps({"items": items}, ensure_ascii=False)
+                    self._write_event('items', broadcaster.event_id(seq), payload)
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _write_event(self, event: str, event_id: str, data: str):
+        self.wfile.write(f"id: {event_id}\nevent: {event}\ndata: {data}\n\n".encode('utf-8'))
+
+    def _send_file(self, path: str, content_type: str):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._send_error(404, f"{os.path.basename(path)} not found")
+            return
+        etag_key = f"file-{path}-{stat.st_mtime_ns}-{stat.st_size}"
+        if self._not_modified(etag_key):
+            return
+        with open(path, 'rb') as f:
+            self._send_body(f.read(), content_type, _etag(etag_key))
+
+    # ------------------------------------------------------------------ responses
+
+    def _not_modified(self, etag_key: str) -> bool:
+        etag = _etag(etag_key)
+        candidates = [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]
+        if etag not in candidates and '*' not in candidates:
+            return False
+        self.send_response(304)
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        return True
+
+    def _send_json(self, payload, status: int = 200, etag_key: Optional[str] = None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self._send_body(body, 'application/json; charset=utf-8',
+                        _etag(etag_key) if etag_key else None, status)
+
+    def _send_error(self, status: int, message: str):
+        self._send_json({"error": message}, status=status)
+
+    def _send_body(self, body: bytes, content_type: str, etag: Optional[str], status: int = 200):
+        encoding = None
+        if len(body) >= GZIP_MIN_BYTES and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body, compresslevel=5)
+            encoding = 'gzip'
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Vary', 'Accept-Encoding')
+        # no-cache = "revalidate every time", which is what makes the ETag useful
+        self.send_header('Cache-Control', 'no-cache')
+        if etag:
+            self.send_header('ETag', etag)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def log_message(self, format, *args):
+        if not getattr(self.server, 'quiet', False):
+            super().log_message(format, *args)
+
+
+def _etag(key: str) -> str:
+    return '"' + hashlib.sha1(key.encode('utf-8')).hexdigest()[:20] + '"'
+
+
+def _positive_int(value: str, name: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number")
+    if number < 1:
+        raise ValueError(f"{name} must be at least 1")
+    return number
+
+
+class DashboardServer(ThreadingHTTPServer):
+    """HTTP server bound to one NewsItemStore, with a live stream of its new items"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int] = ('127.0.0.1', 8000),
+                 store: Optional[NewsItemStore] = None, quiet: bool = False,
+                 watch_interval: float = WATCH_INTERVAL_SECONDS,
+                 drafts: Optional[DraftStore] = None):
+        self.store = store or NewsItemStore(DEFAULT_CONTENT_PATHS)
+        self.drafts = drafts or DraftStore()
+        self.quiet = quiet
+        self.broadcaster = NewsBroadcaster()
+        self.store.add_listener(self.broadcaster.publish)
+        self._stop_watching = threading.Event()
+        self._watcher = threading.Thread(target=self._watch, args=(watch_interval,), daemon=True)
+        super().__init__(address, DashboardRequestHandler)
+        self._watcher.start()
+
+    def _watch(self, interval: float):
+        """Poll the content files so new items are pushed even when no one is requesting pages"""
+        while not self._stop_watching.wait(interval):
+            try:
+                self.store.refresh()
+            except Exception as e:
+                # Never let one bad reload (or listener) stop the watcher
+                if not self.quiet:
+                    print(f"⚠️  Reload failed: {str(e)[:60]}")
+
+    def server_close(self):
+        self._stop_watching.set()
+        self.broadcaster.close()
+        self.drafts.close()
+        super().server_close()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+
+def main():
+    """Run the dashboard server"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Serve the content dashboard with a local news API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--content', nargs='*', default=list(DEFAULT_CONTENT_PATHS),
+                        help='Aggregated content JSON files (first wins on duplicates)')
+    parser.add_argument('--drafts', default='data/drafts', help='Draft store directory')
+    parser.add_argument('--quiet', action='store_true', help='No per-request log lines')
+    args = parser.parse_args()
+
+    server = DashboardServer((args.host, args.port), NewsItemStore(args.content), quiet=args.quiet,
+                             drafts=DraftStore(args.drafts))
+    print(f"🖥️  Dashboard: {server.url}  ({len(server.store)} news items)")
+    print("   Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
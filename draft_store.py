@@ -0,0 +1,461 @@
+"""
+Draft Store
+One place for every generated or hand-edited post, replacing loose .txt files
+
+Drafts are kept as an append-only JSONL log (data/drafts/drafts.jsonl): every
+save appends a full revision, nothing is rewritten in place, so a crash can at
+worst lose the line being written. A small SQLite index next to it maps each
+draft to the byte offset of its latest revision and indexes topic, style,
+status and creation time. Listing is an indexed LIMIT query and reopening a
+draft is a single seek + readline - cost depends on the page size, not on how
+many drafts have piled up.
+
+The index is derived data: delete it and it is rebuilt from the log. Autosave
+produces many revisions, so compact() rewrites the log keeping only the latest
+revision of each draft.
+
+Usage:
+    python draft_store.py list --status draft
+    python draft_store.py show 3f9a1c2b7d10
+    python draft_store.py import generated_posts/       # old .txt files
+    python draft_store.py compact
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from activity_log import ActivityLog
+
+
+DEFAULT_DRAFTS_DIR = 'data/drafts'
+
+STATUSES = ("draft", "ready", "posted", "archived")
+
+# Fields a caller may set; everything else is managed by the store
+FIELDS = ("topic", "style", "status", "content_type", "text", "source")
+
+PREVIEW_CHARS = 160
+
+
+class DraftStore:
+    """
+    Append-only draft log with an SQLite index of latest revisions
+    """
+
+    def __init__(self, directory: str = DEFAULT_DRAFTS_DIR, activity: Optional[ActivityLog] = None):
+        self.directory = directory
+        # Marking a draft "posted" is logged as post_published (default: logs/)
+        self.activity = activity
+        os.makedirs(directory, exist_ok=True)
+        self.log_path = os.path.join(directory, 'drafts.jsonl')
+        self.index_path = os.path.join(directory, 'drafts_index.db')
+
+        # timeout: the dashboard server and a CLI run may write at the same time.
+        # One connection is shared by the server's threads, guarded by _lock.
+        self._lock = threading.RLock()
+        self.db = sqlite3.connect(self.index_path, timeout=10, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS drafts (
+                id TEXT PRIMARY KEY,
+                rev INTEGER NOT NULL,
+                topic TEXT NOT NULL DEFAULT '',
+                style TEXT NOT NULL DEFAULT '',
+                status TEXT NOT NULL DEFAULT 'draft',
+                content_type TEXT NOT NULL DEFAULT '',
+                source TEXT NOT NULL DEFAULT '',
+                preview TEXT NOT NULL DEFAULT '',
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                log_offset INTEGER NOT NULL,
+                log_length INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_drafts_created ON drafts (created_at);
+            CREATE INDEX IF NOT EXISTS idx_drafts_status ON drafts (status, created_at);
+            CREATE INDEX IF NOT EXISTS idx_drafts_style ON drafts (style, created_at);
+            CREATE INDEX IF NOT EXISTS idx_drafts_topic ON drafts (topic COLLATE NOCASE, created_at);
+
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """)
+        self.db.commit()
+        self._catch_up()
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self) -> 'DraftStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------ index upkeep
+
+    def _meta(self, key: str, default: str = '') -> str:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key: str, value):
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def _log_identity(self) -> Tuple[str, int]:
+        """(inode, size) of the log - compaction swaps the inode"""
+        try:
+            stat = os.stat(self.log_path)
+        except FileNotFoundError:
+            return '', 0
+        return str(stat.st_ino), stat.st_size
+
+    def _index_is_current(self) -> bool:
+        inode, size = self._log_identity()
+        return inode == self._meta('log_inode') and str(size) == self._meta('log_size', '0')
+
+    def _catch_up(self):
+        """Index whatever the log has that the index doesn't (another process wrote)"""
+        with self._lock:
+            if self._index_is_current():
+                return
+            with self.db:
+                self.db.execute("BEGIN IMMEDIATE")
+                self._catch_up_locked()
+
+    def _catch_up_locked(self):
+        """Bring the index up to the log; caller holds the write transaction"""
+        inode, size = self._log_identity()
+        indexed = int(self._meta('log_size', '0'))
+        if inode == self._meta('log_inode') and indexed == size:
+            return
+        if inode != self._meta('log_inode') or indexed > size:
+            # Log was compacted or replaced: rebuild from scratch
+            self.db.execute("DELETE FROM drafts")
+            indexed = 0
+        for offset, length, record in self._scan(indexed):
+            self._index_record(record, offset, length)
+            indexed = offset + length
+        self._set_meta('log_inode', inode)
+        self._set_meta('log_size', indexed)
+
+    def _scan(self, start: int = 0) -> Iterator[Tuple[int, int, Dict]]:
+        """Yield (offset, length, record) for each complete line from start"""
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, 'rb') as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                length = len(line)
+                if line.endswith(b'\n'):
+                    try:
+                        yield offset, length, json.loads(line)
+                    except ValueError:
+                        pass
+                offset += length
+
+    def _index_record(self, record: Dict, offset: int, length: int):
+        self.db.execute(
+            """INSERT INTO drafts (id, rev, topic, style, status, content_type, source, preview,
+                                   created_at, updated_at, log_offset, log_length)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (id) DO UPDATE SET
+                   rev = excluded.rev, topic = excluded.topic, style = excluded.style,
+                   status = excluded.status, content_type = excluded.content_type,
+                   source = excluded.source, preview = excluded.preview,
+                   updated_at = excluded.updated_at, log_offset = excluded.log_offset,
+                   log_length = excluded.log_length
+               WHERE excluded.rev >= drafts.rev""",
+            (record["id"], record["rev"], record["topic"], record["style"], record["status"],
+             record["content_type"], record["source"], _preview(record["text"]),
+             record["created_at"], record["updated_at"], offset, length)
+        )
+
+    # ------------------------------------------------------------------ writes
+
+    def save(self, text: str, draft_id: Optional[str] = None, **fields) -> Dict:
+        """
+        Create a draft, or append a new revision of an existing one
+
+        Unchanged saves (same text and fields as the latest revision) are not
+        written, so an over-eager autosave costs nothing.
+
+        Returns:
+            The latest revision (new or unchanged)
+        """
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown draft fields: {', '.join(sorted(unknown))}")
+        if "status" in fields and fields["status"] not in STATUSES:
+            raise ValueError(f"Unknown status '{fields['status']}' (expected one of: {', '.join(STATUSES)})")
+
+        now = datetime.now().isoformat(timespec='seconds')
+        with self._lock, self.db:
+            # Serialises writers across processes; appends happen under it
+            self.db.execute("BEGIN IMMEDIATE")
+            self._catch_up_locked()
+
+            previous = self._read_latest(draft_id) if draft_id else None
+            if draft_id and previous is None:
+                raise KeyError(f"No draft {draft_id}")
+
+            if previous:
+                record = {**previous, **fields, "text": text}
+                if all(record[key] == previous[key] for key in FIELDS):
+                    return previous
+                record.update(rev=previous["rev"] + 1, updated_at=now)
+            else:
+                record = {"topic": "", "style": "", "status": "draft", "content_type": "", "source": "",
+                          **fields, "text": text,
+                          "id": uuid.uuid4().hex[:12], "rev": 1, "created_at": now, "updated_at": now}
+
+            offset, length = self._append(record)
+            self._index_record(record, offset, length)
+            self._set_meta('log_size', offset + length)
+            self._set_meta('log_inode', self._log_identity()[0])
+
+        if record["status"] == "posted" and (previous is None or previous["status"] != "posted"):
+            (self.activity or ActivityLog()).record(
+                "post_published", topic=record["topic"] or _preview(text)[:60],
+                style=record["style"], draft_id=record["id"]
+            )
+        return record
+
+    def set_status(self, draft_id: str, status: str) -> Dict:
+        latest = self.get(draft_id)
+        if latest is None:
+            raise KeyError(f"No draft {draft_id}")
+        return self.save(latest["text"], draft_id, status=status)
+
+    def _append(self, record: Dict) -> Tuple[int, int]:
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        with open(self.log_path, 'a+b') as f:
+            offset = f.seek(0, os.SEEK_END)
+            if offset:
+                f.seek(offset - 1)
+                if f.read(1) != b'\n':
+                    # Torn line from a crashed write: terminate it so ours parses
+                    f.write(b'\n')
+                    offset += 1
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        return offset, len(line)
+
+    def compact(self) -> Tuple[int, int]:
+        """
+        Rewrite the log with only the latest revision of each draft
+
+        Returns:
+            (bytes before, bytes after)
+        """
+        tmp_path = self.log_path + '.compact'
+        with self._lock, self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            self._catch_up_locked()
+            before = self._log_identity()[1]
+
+            rows = self.db.execute("SELECT id, log_offset, log_length FROM drafts ORDER BY log_offset").fetchall()
+            offsets = []
+            with open(self.log_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+                for row in rows:
+                    src.seek(row["log_offset"])
+                    offsets.append((dst.tell(), row["id"]))
+                    dst.write(src.read(row["log_length"]))
+                dst.flush()
+                os.fsync(dst.fileno())
+            os.replace(tmp_path, self.log_path)
+
+            self.db.executemany("UPDATE drafts SET log_offset = ? WHERE id = ?", offsets)
+            inode, after = self._log_identity()
+            self._set_meta('log_inode', inode)
+            self._set_meta('log_size', after)
+
+        return before, after
+
+    # ------------------------------------------------------------------ reads
+
+    def _read_latest(self, draft_id: str) -> Optional[Dict]:
+        row = self.db.execute(
+            "SELECT log_offset, log_length FROM drafts WHERE id = ?", (draft_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        with open(self.log_path, 'rb') as f:
+            f.seek(row["log_offset"])
+            return json.loads(f.read(row["log_length"]))
+
+    def get(self, draft_id: str) -> Optional[Dict]:
+        """Latest revision of one draft, with its full text"""
+        self._catch_up()
+        with self._lock:
+            return self._read_latest(draft_id)
+
+    def list(self, status: Optional[str] = None, style: Optional[str] = None,
+             topic: Optional[str] = None, q: Optional[str] = None,
+             offset: int = 0, limit: int = 20) -> Tuple[List[Dict], int]:
+        """
+        Newest drafts first, without their full text
+
+        Args:
+            status / style: exact match
+            topic: case-insensitive exact match
+            q: case-insensitive substring of topic or the text preview
+
+        Returns:
+            (page of index rows as dicts, total matching)
+        """
+        self._catch_up()
+        where, params = [], []
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if style:
+            where.append("style = ?")
+            params.append(style)
+        if topic:
+            where.append("topic = ? COLLATE NOCASE")
+            params.append(topic)
+        if q:
+            where.append("(topic LIKE ? OR preview LIKE ?)")
+            params.extend([f"%{q}%", f"%{q}%"])
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+
+        with self._lock:
+            total = self.db.execute(f"SELECT COUNT(*) FROM drafts{clause}", params).fetchone()[0]
+            rows = self.db.execute(
+                f"SELECT id, rev, topic, style, status, content_type, source, preview, created_at, updated_at "
+                f"FROM drafts{clause} ORDER BY created_at DESC, id LIMIT ? OFFSET ?",
+                [*params, limit, offset]
+            ).fetchall()
+        return [dict(row) for row in rows], total
+
+    def history(self, draft_id: str) -> List[Dict]:
+        """Every revision still in the log (a full scan - for occasional use)"""
+        return [record for _, _, record in self._scan() if record.get("id") == draft_id]
+
+    def __len__(self) -> int:
+        self._catch_up()
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM drafts").fetchone()[0]
+
+    # ------------------------------------------------------------------ migration
+
+    def import_text_files(self, directory: str = 'generated_posts') -> int:
+        """
+        Import the old generated_posts/*.txt files as drafts (one per style section)
+
+        Returns:
+            Number of drafts created
+        """
+        count = 0
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith('.txt'):
+                continue
+            with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                content = f.read()
+            for topic, style, text in _parse_legacy_file(content):
+                self.save(text, topic=topic, style=style, source=f"import:{name}")
+                count += 1
+        return count
+
+
+def _preview(text: str) -> str:
+    return ' '.join(text.split())[:PREVIEW_CHARS]
+
+
+_RULE = '=' * 60
+
+
+def _parse_legacy_file(content: str) -> Iterator[Tuple[str, str, str]]:
+    """
+    Split an old save_posts / create_from_notes file into (topic, style, text)
+    """
+    topic_match = re.search(r'^=== LinkedIn Posts? for: (.*?) ===$', content, re.M)
+    topic = topic_match.group(1) if topic_match else ''
+
+    # save_posts: blocks of RULE / "STYLE: X" / RULE / text / RULE
+    sections = content.split(_RULE)
+    found = False
+    for i, section in enumerate(sections):
+        style_match = re.fullmatch(r'\s*STYLE: (\S+)\s*', section)
+        if style_match and i + 1 < len(sections):
+            found = True
+            yield topic, style_match.group(1).lower(), sections[i + 1].strip()
+    if found:
+        return
+
+    # create_from_notes: "=== LinkedIn Post - X Style ===" header, text between the rules
+    style_match = re.search(r'^=== LinkedIn Post - (\S+) Style ===$', content, re.M)
+    if style_match and len(sections) >= 3:
+        yield topic, style_match.group(1).lower(), sections[1].strip()
+
+
+def main():
+    """Command-line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Browse and maintain post drafts')
+    parser.add_argument('--dir', default=DEFAULT_DRAFTS_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    listing = sub.add_parser('list', help='Newest drafts first')
+    listing.add_argument('--status', choices=STATUSES)
+    listing.add_argument('--style')
+    listing.add_argument('--topic')
+    listing.add_argument('-q', '--search')
+    listing.add_argument('--limit', type=int, default=20)
+
+    show = sub.add_parser('show', help='Print one draft')
+    show.add_argument('id')
+
+    status = sub.add_parser('status', help='Change a draft status')
+    status.add_argument('id')
+    status.add_argument('status', choices=STATUSES)
+
+    importer = sub.add_parser('import', help='Import old generated_posts/*.txt files')
+    importer.add_argument('directory', nargs='?', default='generated_posts')
+
+    sub.add_parser('compact', help='Drop superseded revisions from the log')
+
+    args = parser.parse_args()
+
+    with DraftStore(args.dir) as store:
+        if args.command == 'list':
+            drafts, total = store.list(args.status, args.style, args.topic, args.search, limit=args.limit)
+            print(f"\n📝 Drafts ({len(drafts)} of {total}):")
+            for draft in drafts:
+                print(f"   {draft['id']}  {draft['created_at'][:16]}  {draft['status']:<8} "
+                      f"{draft['style'] or '-':<10} {draft['topic'][:40]}")
+
+        elif args.command == 'show':
+            draft = store.get(args.id)
+            if draft is None:
+                print(f"❌ No draft {args.id}")
+                return
+            print(f"📝 {draft['topic']} [{draft['style']}, {draft['status']}, rev {draft['rev']}]\n")
+            print(draft['text'])
+
+        elif args.command == 'status':
+            try:
+                draft = store.set_status(args.id, args.status)
+                print(f"✅ {draft['id']} is now {draft['status']}")
+            except KeyError as e:
+                print(f"❌ {e.args[0]}")
+
+        elif args.command == 'import':
+            print(f"✅ Imported {store.import_text_files(args.directory)} drafts from {args.directory}")
+
+        elif args.command == 'compact':
+            before, after = store.compact()
+            print(f"✅ Compacted drafts log: {before:,} → {after:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
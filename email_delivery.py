@@ -0,0 +1,734 @@
+"""
+Outbound Email Delivery
+Persistent outbox + pooled SMTP sending for generated cold emails
+
+- EmailQueue:          on-disk outbox (SQLite) fed by ColdEmailGenerator / mail_merge output
+- SMTPConnectionPool:  a handful of reusable SMTP sessions shared by the sender threads
+- DomainRateLimiter:   per-recipient-domain send pacing (don't hammer one company's MX)
+- EmailSender:         drains due messages, retries temporary failures with backoff
+- LocalSMTPServer:     tiny in-process SMTP stand-in for testing the whole path offline
+
+Usage:
+    python email_delivery.py enqueue merged_emails.jsonl --to-field recruiter_email
+    python email_delivery.py send            # uses data/smtp_config.json
+    python email_delivery.py status
+    python email_delivery.py test-server     # local stand-in on localhost:8025
+"""
+
+import hashlib
+import json
+import os
+import queue
+import random
+import smtplib
+import socketserver
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from email.message import EmailMessage
+from email.parser import BytesParser
+from email import policy
+from typing import Dict, List, Optional, Tuple
+
+from activity_log import ActivityLog
+
+
+DEFAULT_OUTBOX_PATH = 'data/outbox.db'
+DEFAULT_SMTP_CONFIG = 'data/smtp_config.json'
+
+# Messages stuck in 'sending' longer than this (crashed run) go back to the queue
+STALE_SENDING_SECONDS = 600
+
+
+def split_subject(email_text: str, default_subject: str = "") -> Tuple[str, str]:
+    """
+    Split a generated email into (subject, body)
+
+    Templates start with an optional "Subject: ..." line; connection requests
+    have none and get default_subject.
+    """
+    text = email_text.strip('\n').strip()
+    first_line, _, rest = text.partition('\n')
+    if first_line.lower().startswith('subject:'):
+        return first_line[len('subject:'):].strip(), rest.strip('\n').rstrip()
+    return default_subject, text
+
+
+def recipient_domain(address: str) -> str:
+    return address.rsplit('@', 1)[-1].strip().lower()
+
+
+# ---------------------------------------------------------------------- outbox
+
+class EmailQueue:
+    """
+    Persistent outbox backed by SQLite
+
+    Status flow: queued -> sending -> sent | failed (with queued again on retry).
+    Re-enqueueing the same recipient/subject/body is ignored, so re-running a
+    merge never double-sends.
+    """
+
+    def __init__(self, path: str = DEFAULT_OUTBOX_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                dedupe_key TEXT UNIQUE NOT NULL,
+                to_addr TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                from_addr TEXT,
+                subject TEXT NOT NULL,
+                body TEXT NOT NULL,
+                meta TEXT,
+                status TEXT NOT NULL DEFAULT 'queued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                claimed_at REAL,
+                last_error TEXT,
+                created_at TEXT NOT NULL,
+                sent_at TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_messages_due ON messages (status, next_attempt_at);
+        """)
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    def enqueue(self, to_addr: str, subject: str, body: str,
+                from_addr: Optional[str] = None, meta: Optional[Dict] = None) -> Optional[int]:
+        """
+        Add a message to the outbox
+
+        Returns:
+            Message id, or None if the identical message was already queued/sent
+        """
+        to_addr = to_addr.strip()
+        if '@' not in to_addr:
+            raise ValueError(f"Invalid recipient address: {to_addr!r}")
+
+        dedupe_key = hashlib.sha1(f"{to_addr.lower()}\0{subject}\0{body}".encode('utf-8')).hexdigest()
+        with self.db:
+            cursor = self.db.execute(
+                """INSERT OR IGNORE INTO messages
+                   (dedupe_key, to_addr, domain, from_addr, subject, body, meta, next_attempt_at, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (dedupe_key, to_addr, recipient_domain(to_addr), from_addr, subject, body,
+                 json.dumps(meta, ensure_ascii=False) if meta else None,
+                 time.time(), datetime.now().isoformat())
+            )
+        return cursor.lastrowid if cursor.rowcount else None
+
+    def enqueue_email_text(self, to_addr: str, email_text: str, default_subject: str = "",
+                           from_addr: Optional[str] = None, meta: Optional[Dict] = None) -> Optional[int]:
+        """Enqueue a generated email whose first line may be 'Subject: ...'"""
+        subject, body = split_subject(email_text, default_subject)
+        if not subject:
+            raise ValueError(f"No subject for message to {to_addr} - pass default_subject")
+        return self.enqueue(to_addr, subject, body, from_addr, meta)
+
+    def enqueue_merge_file(self, merged_path: str, to_field: str = 'recruiter_email',
+                           default_subject: str = "", from_addr: Optional[str] = None) -> Tuple[int, int]:
+        """
+        Enqueue every email in a mail_merge JSONL file
+
+        Returns:
+            (queued, skipped) - skipped rows have no address or were already queued
+        """
+        queued = skipped = 0
+        with open(merged_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                to_addr = (record.get('recipient') or {}).get(to_field, '')
+                if not to_addr or '@' not in to_addr:
+                    skipped += 1
+                    continue
+                message_id = self.enqueue_email_text(to_addr, record['email'], default_subject,
+                                                     from_addr, meta=record.get('recipient'))
+                if message_id is None:
+                    skipped += 1
+                else:
+                    queued += 1
+        return queued, skipped
+
+    def recover_stale(self, now: Optional[float] = None) -> int:
+        """Requeue messages left in 'sending' by a crashed run"""
+        now = now or time.time()
+        with self.db:
+            cursor = self.db.execute(
+                "UPDATE messages SET status = 'queued', claimed_at = NULL "
+                "WHERE status = 'sending' AND claimed_at < ?",
+                (now - STALE_SENDING_SECONDS,)
+            )
+        return cursor.rowcount
+
+    def claim_due(self, limit: int, now: Optional[float] = None) -> List[sqlite3.Row]:
+        """Atomically mark up to `limit` due messages as 'sending' and return them"""
+        now = now or time.time()
+        with self.db:
+            # IMMEDIATE takes the write lock up front so two overlapping runs
+            # can never claim the same rows
+            self.db.execute("BEGIN IMMEDIATE")
+            rows = self.db.execute(
+                "SELECT * FROM messages WHERE status = 'queued' AND next_attempt_at <= ? "
+                "ORDER BY next_attempt_at, id LIMIT ?",
+                (now, limit)
+            ).fetchall()
+            self.db.executemany(
+                "UPDATE messages SET status = 'sending', claimed_at = ? WHERE id = ?",
+                [(now, row['id']) for row in rows]
+            )
+        return rows
+
+    def next_due_at(self) -> Optional[float]:
+        row = self.db.execute(
+            "SELECT MIN(next_attempt_at) FROM messages WHERE status = 'queued'"
+        ).fetchone()
+        return row[0]
+
+    def mark_sent(self, message_id: int):
+        with self.db:
+            self.db.execute(
+                "UPDATE messages SET status = 'sent', attempts = attempts + 1, sent_at = ?, "
+                "last_error = NULL WHERE id = ?",
+                (datetime.now().isoformat(), message_id)
+            )
+
+    def mark_retry(self, message_id: int, error: str, next_attempt_at: float):
+        with self.db:
+            self.db.execute(
+                "UPDATE messages SET status = 'queued', attempts = attempts + 1, last_error = ?, "
+                "next_attempt_at = ? WHERE id = ?",
+                (error, next_attempt_at, message_id)
+            )
+
+    def mark_failed(self, message_id: int, error: str):
+        with self.db:
+            self.db.execute(
+                "UPDATE messages SET status = 'failed', attempts = attempts + 1, last_error = ? WHERE id = ?",
+                (error, message_id)
+            )
+
+    def defer(self, message_id: int, next_attempt_at: float):
+        """Put a claimed message back without counting an attempt (rate limited)"""
+        with self.db:
+            self.db.execute(
+                "UPDATE messages SET status = 'queued', next_attempt_at = ? WHERE id = ?",
+                (next_attempt_at, message_id)
+            )
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self.db.execute("SELECT status, COUNT(*) FROM messages GROUP BY status").fetchall())
+
+    def failures(self, limit: int = 20) -> List[sqlite3.Row]:
+        return self.db.execute(
+            "SELECT id, to_addr, subject, attempts, last_error FROM messages "
+            "WHERE status = 'failed' ORDER BY id DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+
+
+# ---------------------------------------------------------------------- SMTP pool
+
+class SMTPConnectionPool:
+    """
+    Bounded pool of logged-in SMTP sessions
+
+    Connections are reused across messages; a session is recycled after
+    max_messages_per_connection sends or when it has been idle long enough
+    that the server may have dropped it (checked with NOOP).
+    """
+
+    def __init__(self, host: str, port: int = 587, size: int = 3,
+                 username: Optional[str] = None, password: Optional[str] = None,
+                 starttls: bool = False, use_ssl: bool = False, timeout: float = 30,
+                 max_messages_per_connection: int = 100, idle_check_seconds: float = 30):
+        self.host = host
+        self.port = port
+        self.size = size
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self.max_messages_per_connection = max_messages_per_connection
+        self.idle_check_seconds = idle_check_seconds
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.use_ssl:
+            conn = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                conn.starttls()
+        conn.ehlo_or_helo_if_needed()
+        if self.username:
+            conn.login(self.username, self.password or '')
+        with self._lock:
+            self.connections_opened += 1
+        return conn
+
+    def acquire(self):
+        """Borrow a session (blocks while all `size` sessions are in use)"""
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    entry = self._idle.get_nowait()
+                except queue.Empty:
+                    return [self._connect(), 0, time.monotonic()]
+
+                conn, sent, last_used = entry
+                if time.monotonic() - last_used < self.idle_check_seconds:
+                    return entry
+                try:
+                    if conn.noop()[0] == 250:
+                        return entry
+                except (smtplib.SMTPException, OSError):
+                    pass
+                self._quit(conn)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, entry, broken: bool = False):
+        """Return a session; broken or worn-out sessions are closed instead"""
+        try:
+            conn, sent, _ = entry
+            if broken or sent >= self.max_messages_per_connection:
+                self._quit(conn)
+            else:
+                self._idle.put([conn, sent, time.monotonic()])
+        finally:
+            self._slots.release()
+
+    def send(self, message: EmailMessage):
+        """Send one message on a pooled session"""
+        entry = self.acquire()
+        broken = False
+        try:
+            entry[0].send_message(message)
+            entry[1] += 1
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException):
+            # Session is fine, the server just refused this message; reset state
+            self._rset(entry[0])
+            raise
+        except OSError:
+            # Disconnects, timeouts and protocol errors (SMTPException is an OSError)
+            broken = True
+            raise
+        finally:
+            self.release(entry, broken)
+
+    def close(self):
+        while True:
+            try:
+                conn, _, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._quit(conn)
+
+    @staticmethod
+    def _rset(conn):
+        try:
+            conn.rset()
+        except (smtplib.SMTPException, OSError):
+            pass
+
+    @staticmethod
+    def _quit(conn):
+        try:
+            conn.quit()
+        except (smtplib.SMTPException, OSError):
+            conn.close()
+
+
+# ---------------------------------------------------------------------- pacing
+
+class DomainRateLimiter:
+    """Minimum spacing between sends to the same recipient domain"""
+
+    def __init__(self, per_minute: float = 6, overrides: Optional[Dict[str, float]] = None):
+        self.default_interval = 60.0 / per_minute if per_minute else 0.0
+        self.intervals = {domain: (60.0 / rate if rate else 0.0) for domain, rate in (overrides or {}).items()}
+        self._next_allowed = {}
+
+    def try_acquire(self, domain: str, now: float) -> float:
+        """
+        Returns 0 and consumes the slot if sending now is allowed,
+        otherwise the number of seconds until the domain is free
+        """
+        next_allowed = self._next_allowed.get(domain, 0.0)
+        if now < next_allowed:
+            return next_allowed - now
+        self._next_allowed[domain] = now + self.intervals.get(domain, self.default_interval)
+        return 0.0
+
+
+# ---------------------------------------------------------------------- sender
+
+class EmailSender:
+    """
+    Drains the outbox through the connection pool
+
+    Temporary failures (4xx replies, dropped connections, timeouts) are retried
+    with exponential backoff plus jitter; 5xx replies fail the message for good.
+    """
+
+    def __init__(self, outbox: EmailQueue, pool: SMTPConnectionPool, from_addr: str,
+                 limiter: Optional[DomainRateLimiter] = None, max_attempts: int = 5,
+                 backoff_base: float = 60, backoff_max: float = 6 * 3600,
+                 activity: Optional[ActivityLog] = None):
+        self.outbox = outbox
+        self.activity = activity
+        self.pool = pool
+        self.from_addr = from_addr
+        self.limiter = limiter or DomainRateLimiter()
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def _build_message(self, row) -> EmailMessage:
+        message = EmailMessage()
+        message['From'] = row['from_addr'] or self.from_addr
+        message['To'] = row['to_addr']
+        message['Subject'] = row['subject']
+        message.set_content(row['body'])
+        return message
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** max(0, attempts - 1)))
+        return delay * random.uniform(0.8, 1.2)
+
+    def _deliver(self, row) -> Tuple[str, str]:
+        """Runs on a worker thread: returns ('sent' | 'retry' | 'failed', error)"""
+        try:
+            self.pool.send(self._build_message(row))
+            return 'sent', ''
+        except smtplib.SMTPAuthenticationError:
+            raise
+        except smtplib.SMTPRecipientsRefused as e:
+            code, reply = next(iter(e.recipients.values()))
+            error = f"{code} {reply.decode('utf-8', 'replace') if isinstance(reply, bytes) else reply}"
+            return ('failed' if code >= 500 else 'retry'), error
+        except smtplib.SMTPResponseException as e:
+            error = f"{e.smtp_code} {e.smtp_error.decode('utf-8', 'replace') if isinstance(e.smtp_error, bytes) else e.smtp_error}"
+            return ('failed' if e.smtp_code >= 500 else 'retry'), error
+        except (smtplib.SMTPException, OSError) as e:
+            return 'retry', f"{type(e).__name__}: {e}"
+
+    def send_pending(self, workers: Optional[int] = None, max_wait: float = 300,
+                     limit: Optional[int] = None) -> Dict[str, int]:
+        """
+        Send everything that is due
+
+        Args:
+            workers: Sender threads (defaults to the pool size)
+            max_wait: Keep the run alive this long for rate-limited / retrying
+                      messages; anything due later is left for the next run
+            limit: Stop after this many delivery attempts
+
+        Returns:
+            Counts of sent / retry / failed / deferred outcomes for this run
+        """
+        workers = workers or self.pool.size
+        stats = {'sent': 0, 'retry': 0, 'failed': 0, 'deferred': 0}
+        attempts = 0
+        self.outbox.recover_stale()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while limit is None or attempts < limit:
+                now = time.time()
+                batch_size = workers * 4 if limit is None else min(workers * 4, limit - attempts)
+                rows = self.outbox.claim_due(batch_size, now)
+
+                if not rows:
+                    next_due = self.outbox.next_due_at()
+                    if next_due is None or next_due - now > max_wait:
+                        break
+                    time.sleep(max(0.0, next_due - now))
+                    continue
+
+                jobs = []
+                for row in rows:
+                    wait = self.limiter.try_acquire(row['domain'], now)
+                    if wait:
+                        self.outbox.defer(row['id'], now + wait)
+                        stats['deferred'] += 1
+                    else:
+                        jobs.append((row, executor.submit(self._deliver, row)))
+
+                # Database updates stay on this thread
+                unfinished = {row['id'] for row, _ in jobs}
+                delivered = []
+                try:
+                    for row, future in jobs:
+                        outcome, error = future.result()
+                        attempts += 1
+                        unfinished.discard(row['id'])
+                        if self._record(row, outcome, error, stats) == 'sent':
+                            delivered.append(row)
+                except BaseException:
+                    # e.g. bad SMTP credentials: put claimed messages straight back
+                    for message_id in unfinished:
+                        self.outbox.defer(message_id, now)
+                    raise
+                finally:
+                    if self.activity and delivered:
+                        # One append per batch, not one fsync per message
+                        self.activity.record_many("recruiter_contacted", [
+                            {"contact": row['to_addr'], "via": "email", "subject": row['subject']}
+                            for row in delivered
+                        ])
+
+        return stats
+
+    def _record(self, row, outcome: str, error: str, stats: Dict[str, int]) -> str:
+        if outcome == 'sent':
+            self.outbox.mark_sent(row['id'])
+        elif outcome == 'retry' and row['attempts'] + 1 < self.max_attempts:
+            self.outbox.mark_retry(row['id'], error, time.time() + self.backoff(row['attempts'] + 1))
+        else:
+            outcome = 'failed'
+            self.outbox.mark_failed(row['id'], error)
+        stats[outcome] += 1
+        print(f"  {'✅' if outcome == 'sent' else '🔁' if outcome == 'retry' else '❌'} "
+              f"{row['to_addr']:35} {error[:60]}")
+        return outcome
+
+
+# ---------------------------------------------------------------------- local stand-in
+
+class _SMTPStandInHandler(socketserver.StreamRequestHandler):
+    """Just enough ESMTP for smtplib: EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT"""
+
+    def _reply(self, text: str):
+        self.wfile.write(text.encode('utf-8') + b'\r\n')
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self._reply('220 localhost SMTP stand-in ready')
+        mail_from, recipients = None, []
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').rstrip('\r\n')
+            verb = command.split(' ', 1)[0].upper()
+
+            if verb == 'EHLO':
+                self._reply('250-localhost')
+                self._reply('250-8BITMIME')
+                self._reply('250 SMTPUTF8')
+            elif verb == 'HELO':
+                self._reply('250 localhost')
+            elif verb == 'MAIL':
+                mail_from, recipients = _angle_address(command), []
+                self._reply('250 OK')
+            elif verb == 'RCPT':
+                address = _angle_address(command)
+                code = server.rejection_for(address)
+                if code:
+                    self._reply(f'{code} Recipient rejected by stand-in')
+                else:
+                    recipients.append(address)
+                    self._reply('250 OK')
+            elif verb == 'DATA':
+                if not recipients:
+                    self._reply('503 No valid recipients')
+                    continue
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if not data_line or data_line in (b'.\r\n', b'.\n'):
+                        break
+                    lines.append(data_line[1:] if data_line.startswith(b'..') else data_line)
+                message = BytesParser(policy=policy.default).parsebytes(b''.join(lines))
+                with server.lock:
+                    server.messages.append({'from': mail_from, 'to': recipients, 'message': message})
+                mail_from, recipients = None, []
+                self._reply('250 OK queued')
+            elif verb == 'RSET':
+                mail_from, recipients = None, []
+                self._reply('250 OK')
+            elif verb == 'NOOP':
+                self._reply('250 OK')
+            elif verb == 'QUIT':
+                self._reply('221 Bye')
+                return
+            else:
+                self._reply('502 Command not implemented')
+
+
+def _angle_address(command: str) -> str:
+    start, end = command.find('<'), command.find('>')
+    if start != -1 and end > start:
+        return command[start + 1:end]
+    return command.split(':', 1)[-1].strip()
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """
+    In-process SMTP stand-in for tests and dry runs
+
+    Records every accepted message in .messages and every session in
+    .connections. `rejections` maps an address or a domain to a reply code
+    (e.g. {'bounce@acme.com': 550, 'busy.io': 451}) to simulate failures.
+
+        with LocalSMTPServer() as server:
+            pool = SMTPConnectionPool('127.0.0.1', server.port)
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, rejections: Optional[Dict[str, int]] = None):
+        super().__init__((host, port), _SMTPStandInHandler)
+        self.port = self.server_address[1]
+        self.rejections = rejections or {}
+        self.messages = []
+        self.connections = 0
+        self.lock = threading.Lock()
+        self._thread = None
+
+    def rejection_for(self, address: str) -> Optional[int]:
+        return self.rejections.get(address.lower()) or self.rejections.get(recipient_domain(address))
+
+    def start(self) -> 'LocalSMTPServer':
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> 'LocalSMTPServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ---------------------------------------------------------------------- CLI
+
+def load_smtp_config(path: str = DEFAULT_SMTP_CONFIG) -> Dict:
+    """
+    SMTP settings; credentials can come from SMTP_USERNAME / SMTP_PASSWORD
+    instead of being written to disk
+    """
+    config = {
+        "host": "127.0.0.1",
+        "port": 8025,
+        "starttls": False,
+        "use_ssl": False,
+        "pool_size": 3,
+        "from_addr": "",
+        "per_domain_per_minute": 6,
+        "domain_overrides": {},
+        "max_attempts": 5
+    }
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            config.update(json.load(f))
+    except FileNotFoundError:
+        pass
+    config["username"] = os.environ.get("SMTP_USERNAME", config.get("username"))
+    config["password"] = os.environ.get("SMTP_PASSWORD", config.get("password"))
+    return config
+
+
+def main():
+    """Command-line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Queue and send generated emails')
+    parser.add_argument('--outbox', default=DEFAULT_OUTBOX_PATH)
+    parser.add_argument('--config', default=DEFAULT_SMTP_CONFIG)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    enqueue = sub.add_parser('enqueue', help='Queue emails from a mail_merge JSONL file')
+    enqueue.add_argument('merged')
+    enqueue.add_argument('--to-field', default='recruiter_email')
+    enqueue.add_argument('--subject', default='', help='Subject for emails without a Subject: line')
+
+    send = sub.add_parser('send', help='Send everything that is due')
+    send.add_argument('--max-wait', type=float, default=300)
+
+    sub.add_parser('status', help='Show outbox counts and recent failures')
+
+    server = sub.add_parser('test-server', help='Run the local SMTP stand-in')
+    server.add_argument('--port', type=int, default=8025)
+
+    args = parser.parse_args()
+
+    if args.command == 'test-server':
+        with LocalSMTPServer(port=args.port) as stand_in:
+            print(f"📮 SMTP stand-in listening on 127.0.0.1:{stand_in.port} (Ctrl+C to stop)")
+            try:
+                while True:
+                    time.sleep(5)
+                    print(f"   {len(stand_in.messages)} messages over {stand_in.connections} connections")
+            except KeyboardInterrupt:
+                return
+
+    outbox = EmailQueue(args.outbox)
+    config = load_smtp_config(args.config)
+
+    if args.command == 'enqueue':
+        queued, skipped = outbox.enqueue_merge_file(args.merged, args.to_field, args.subject,
+                                                    config.get('from_addr') or None)
+        print(f"✅ Queued {queued} emails ({skipped} skipped)")
+
+    elif args.command == 'status':
+        print("📬 Outbox:")
+        for status, count in sorted(outbox.counts().items()):
+            print(f"   {status:10} {count}")
+        for row in outbox.failures():
+            print(f"   ❌ {row['to_addr']}: {row['last_error']}")
+
+    elif args.command == 'send':
+        if not config.get('from_addr'):
+            print("❌ Set from_addr in data/smtp_config.json first")
+            return
+        pool = SMTPConnectionPool(
+            config['host'], config['port'], size=config['pool_size'],
+            username=config.get('username'), password=config.get('password'),
+            starttls=config['starttls'], use_ssl=config['use_ssl']
+        )
+        sender = EmailSender(
+            outbox, pool, config['from_addr'],
+            DomainRateLimiter(config['per_domain_per_minute'], config['domain_overrides']),
+            max_attempts=config['max_attempts'],
+            activity=ActivityLog()
+        )
+        print(f"\n📤 Sending via {config['host']}:{config['port']}...\n")
+        try:
+            stats = sender.send_pending(max_wait=args.max_wait)
+        finally:
+            pool.close()
+        print(f"\n📊 Sent {stats['sent']}, retrying {stats['retry']}, failed {stats['failed']} "
+              f"using {pool.connections_opened} SMTP connections")
+
+    outbox.close()
+
+
+if __name__ == "__main__":
+    main()
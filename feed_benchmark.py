@@ -0,0 +1,579 @@
+"""
+Feed Aggregation Benchmark
+Runs the RSS pipeline against a local fixture feed server and reports how fast it is
+
+The fixture server (127.0.0.1, random port) serves generated RSS/Atom feeds
+shaped like the real sources - plus the awkward cases a morning run meets:
+arXiv-sized feeds (~1,000 items, ~2 MB), slow responders, 429 rate limits
+and malformed XML. Recorded feeds
+can be added with --fixtures DIR (every *.xml in it is served as-is).
+
+Each engine runs in its own child process, so peak RSS and CPU time belong to
+that engine alone. CPU time includes the engine's own worker processes (the
+pipeline's parsers); their peak RSS is reported separately, as the largest
+worker's. Per-feed latency is measured around rss_reader.fetch_feed.
+Results can be written as JSON (with the git commit) and compared later.
+
+Engines:
+    aggregate_all_feeds   rss_reader.aggregate_all_feeds as the morning run uses it
+    threaded              the same fetch_feed on a thread pool (reference for concurrency)
+    pipeline              rss_reader.iter_feeds on a FeedPipeline: downloads on threads, parsing
+                          on a process pool with PIPELINE_PROCESSES workers (see feed_pipeline.py)
+
+Usage:
+    python feed_benchmark.py run --feeds 100
+    python feed_benchmark.py run --feeds 2000 --engines threaded --json results/after.json
+    BENCH_PROCESSES=4 python feed_benchmark.py run --feeds 1000 --engines pipeline --mix rss=50,large=50
+    python feed_benchmark.py run --feeds 500 --mix rss=80,large=5,slow=5,ratelimit=5,malformed=5
+    python feed_benchmark.py compare results/before.json results/after.json
+    python feed_benchmark.py serve --port 8765        # fixture server only, for manual poking
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import random
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, peak RSS / CPU are reported as null
+    resource = None
+
+
+# Share of feeds of each kind (percent); see FixtureFeedServer for what each does
+DEFAULT_MIX = {"rss": 63, "atom": 20, "large": 2, "slow": 5, "ratelimit": 5, "malformed": 5}
+
+SLOW_DELAY_SECONDS = 0.25
+LARGE_FEED_ITEMS = 1000
+FIXTURE_VARIANTS = 16           # distinct generated documents per kind
+THREADED_WORKERS = 16
+PIPELINE_PROCESSES = int(os.environ.get('BENCH_PROCESSES', 0)) or None     # None: one per CPU
+
+WORDS = ("model agent vector retrieval benchmark transformer latency inference dataset "
+         "fine-tuning evaluation token context reasoning open-source release paper "
+         "training GPU embedding alignment multimodal pipeline production").split()
+
+
+# ---------------------------------------------------------------------- fixtures
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def make_rss(seed: int, items: int = 20, summary_words: int = 60) -> bytes:
+    """RSS 2.0 document with HTML in descriptions (what clean_html is for)"""
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 30, 9, 0, tzinfo=timezone.utc)
+    entries = []
+    for i in range(items):
+        title = _sentence(rng, rng.randint(5, 12))
+        description = f"<p>{_sentence(rng, summary_words)} &amp; <a href='https://example.com'>more</a></p>"
+        entries.append(
+            "<item>"
+            f"<title>{escape(title)}</title>"
+            f"<link>https://example.com/{seed}/{i}</link>"
+            f"<description>{escape(description)}</description>"
+            f"<pubDate>{format_datetime(now - timedelta(minutes=37 * i))}</pubDate>"
+            "</item>"
+        )
+    return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f'<title>Fixture feed {seed}</title>{"".join(entries)}</channel></rss>').encode('utf-8')
+
+
+def make_atom(seed: int, items: int = 20) -> bytes:
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 30, 9, 0, tzinfo=timezone.utc)
+    entries = []
+    for i in range(items):
+        entries.append(
+            "<entry>"
+            f"<title>{escape(_sentence(rng, rng.randint(5, 12)))}</title>"
+            f"<link href='https://example.com/atom/{seed}/{i}'/>"
+            f"<summary>{escape(_sentence(rng, 50))}</summary>"
+            f"<updated>{(now - timedelta(minutes=53 * i)).strftime('%Y-%m-%dT%H:%M:%SZ')}</updated>"
+            "</entry>"
+        )
+    return ('<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom">'
+            f'<title>Fixture atom {seed}</title>{"".join(entries)}</feed>').encode('utf-8')
+
+
+def make_malformed(seed: int) -> bytes:
+    """One of: truncated document, bad entity, HTML error page served as 200"""
+    document = make_rss(seed, items=5)
+    variant = seed % 3
+    if variant == 0:
+        return document[:len(document) // 2]
+    if variant == 1:
+        return document.replace(b'&amp;', b'&nbsp;', 1)
+    return b"<html><body><h1>Service temporarily unavailable</h1></body></html>"
+
+
+class FixtureFeedServer(ThreadingHTTPServer):
+    """
+    Local HTTP server for /feed/<kind>/<n>.xml
+
+    Kinds:
+        rss, atom    ordinary feeds (20 items)
+        large        arXiv-sized RSS (LARGE_FEED_ITEMS items with long abstracts)
+        slow         ordinary RSS after a delay
+        ratelimit    429 with Retry-After
+        malformed    broken XML or an HTML page with status 200
+        recorded     files from --fixtures, rotated by n
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, slow_delay: float = SLOW_DELAY_SECONDS,
+                 fixtures_dir: Optional[str] = None):
+        self.slow_delay = slow_delay
+        self.recorded = []
+        if fixtures_dir:
+            for name in sorted(os.listdir(fixtures_dir)):
+                if name.endswith('.xml'):
+                    with open(os.path.join(fixtures_dir, name), 'rb') as f:
+                        self.recorded.append(f.read())
+        self._documents: Dict[Tuple[str, int], bytes] = {}
+        self._documents_lock = threading.Lock()
+        self.responses: Dict[int, int] = {}
+        self._responses_lock = threading.Lock()
+        super().__init__(('127.0.0.1', port), FixtureRequestHandler)
+
+    def document(self, kind: str, n: int) -> Optional[bytes]:
+        """Generated once per (kind, variant) and reused"""
+        if kind == 'recorded':
+            return self.recorded[n % len(self.recorded)] if self.recorded else None
+        key = (kind, n % FIXTURE_VARIANTS)
+        with self._documents_lock:
+            if key not in self._documents:
+                seed = zlib.crc32(f"{kind}-{key[1]}".encode()) & 0xffff
+                if kind in ('rss', 'slow'):
+                    self._documents[key] = make_rss(seed)
+                elif kind == 'atom':
+                    self._documents[key] = make_atom(seed)
+                elif kind == 'large':
+                    self._documents[key] = make_rss(seed, items=LARGE_FEED_ITEMS, summary_words=220)
+                elif kind == 'malformed':
+                    self._documents[key] = make_malformed(key[1])
+                else:
+                    return None
+            return self._documents[key]
+
+    def count_response(self, status: int):
+        with self._responses_lock:
+            self.responses[status] = self.responses.get(status, 0) + 1
+
+    def take_responses(self) -> Dict[str, int]:
+        with self._responses_lock:
+            responses, self.responses = self.responses, {}
+        return {str(status): count for status, count in sorted(responses.items())}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> 'FixtureFeedServer':
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, status: int, body: bytes = b'', headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body and self.command != 'HEAD':
+            self.wfile.write(body)
+        self.server.count_response(status)
+
+    def do_GET(self):
+        parts = self.path.split('?', 1)[0].strip('/').split('/')
+        if len(parts) != 3 or parts[0] != 'feed' or not parts[2].endswith('.xml'):
+            self._respond(404, b'not found')
+            return
+        kind = parts[1]
+        try:
+            n = int(parts[2][:-4])
+        except ValueError:
+            self._respond(404, b'not found')
+            return
+
+        if kind == 'ratelimit':
+            self._respond(429, b'Too Many Requests', {'Retry-After': '60'})
+            return
+        document = self.server.document(kind, n)
+        if document is None:
+            self._respond(404, b'not found')
+            return
+        if kind == 'slow':
+            time.sleep(self.server.slow_delay)
+
+        content_type = 'application/atom+xml' if kind == 'atom' else 'application/rss+xml'
+        if kind == 'malformed' and document.startswith(b'<html'):
+            content_type = 'text/html'
+        headers = {'Content-Type': content_type}
+        self._respond(200, document, headers)
+
+    do_HEAD = do_GET
+
+
+# ---------------------------------------------------------------------- sources
+
+def parse_mix(text: Optional[str]) -> Dict[str, int]:
+    """'rss=70,large=5' -> {'rss': 70, 'large': 5}"""
+    if not text:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for part in text.split(','):
+        kind, _, share = part.partition('=')
+        kind = kind.strip()
+        if kind not in DEFAULT_MIX and kind != 'recorded':
+            raise ValueError(f"Unknown feed kind '{kind}'")
+        mix[kind] = int(share)
+    return mix
+
+
+def build_sources(base_url: str, feeds: int, mix: Dict[str, int], seed: int = 7) -> List[Dict]:
+    """Source list in rss_reader's sources.json shape, kinds shuffled deterministically"""
+    total = sum(mix.values())
+    kinds = []
+    for kind, share in mix.items():
+        kinds += [kind] * round(feeds * share / total)
+    kinds = (kinds + ['rss'] * feeds)[:feeds]
+    random.Random(seed).shuffle(kinds)
+    return [
+        {"category": f"bench_{kind}", "name": f"{kind}-{n}", "url": f"{base_url}/feed/{kind}/{n}.xml"}
+        for n, kind in enumerate(kinds)
+    ]
+
+
+# ---------------------------------------------------------------------- engines
+
+def _engine_sequential(sources_path: str) -> Dict:
+    import rss_reader
+    return rss_reader.aggregate_all_feeds(sources_path, hours_back=168)
+
+
+def _engine_threaded(sources_path: str) -> Dict:
+    import rss_reader
+    with open(sources_path, 'r', encoding='utf-8') as f:
+        sources = json.load(f)
+    with ThreadPoolExecutor(max_workers=THREADED_WORKERS) as executor:
+        results = list(executor.map(lambda source: rss_reader.fetch_feed(source['url'], 168), sources))
+    content = {}
+    for source, items in zip(sources, results):
+        content.setdefault(source['category'], {})[source['name']] = items
+    return content
+
+
+def _engine_pipeline(sources_path: str) -> Dict:
+    import rss_reader
+    from feed_pipeline import FeedPipeline
+    content = {}
+    with FeedPipeline(PIPELINE_PROCESSES, fetchers=THREADED_WORKERS) as pipeline:
+        for category, name, items in rss_reader.iter_feeds(sources_path, 168, pipeline=pipeline):
+            content.setdefault(category, {})[name] = items
+    return content
+
+
+ENGINES: Dict[str, Callable[[str], Dict]] = {
+    "aggregate_all_feeds": _engine_sequential,
+    "threaded": _engine_threaded,
+    "pipeline": _engine_pipeline,
+}
+
+
+def register_engine(name: str, run: Callable[[str], Dict]):
+    """
+    Add an engine: run(sources_json_path) -> {category: {source: [items]}}
+
+    Register at import time of your module (and import it before calling
+    run_benchmark) - on Windows/macOS the child processes re-import modules.
+    """
+    ENGINES[name] = run
+
+
+def _run_engine(name: str, sources_path: str, results: multiprocessing.Queue):
+    """Child process: run one engine with fetch_feed timed, report back"""
+    import rss_reader
+
+    latencies: List[Tuple[str, float, int]] = []
+    lock = threading.Lock()
+    fetch_feed = rss_reader.fetch_feed
+
+    def timed_fetch_feed(url, *args, **kwargs):
+        start = time.perf_counter()
+        items = fetch_feed(url, *args, **kwargs)
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append((url.rsplit('/', 2)[-2], elapsed, len(items)))
+        return items
+
+    rss_reader.fetch_feed = timed_fetch_feed
+    cpu_before = _cpu_seconds()
+    start = time.perf_counter()
+    # Engines print a line per feed; that's not what is being measured
+    with contextlib.redirect_stdout(io.StringIO()):
+        content = ENGINES[name](sources_path)
+    wall = time.perf_counter() - start
+    cpu = _cpu_seconds() - cpu_before if resource else None
+
+    results.put({
+        "wall": wall,
+        "cpu": cpu,
+        "peak_rss_mb": _peak_rss_mb(),
+        "children_peak_rss_mb": _peak_rss_mb(children=True),
+        "items": sum(len(items) for sources in content.values() for items in sources.values()),
+        "latencies": latencies,
+    })
+
+
+def _cpu_seconds() -> float:
+    """CPU time of this process plus its reaped children (a FeedPipeline's parsing workers)"""
+    if not resource:
+        return 0.0
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+def _peak_rss_mb(children: bool = False) -> Optional[float]:
+    """Peak RSS of this process, or with children=True of its largest reaped child"""
+    if not resource:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+# ---------------------------------------------------------------------- reporting
+
+def percentile(values: List[float], p: float) -> float:
+    """Linear-interpolated percentile of an already sorted list"""
+    if not values:
+        return 0.0
+    k = (len(values) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def _latency_summary(seconds: List[float]) -> Dict[str, float]:
+    ordered = sorted(seconds)
+    return {
+        "p50": round(1000 * percentile(ordered, 50), 2),
+        "p95": round(1000 * percentile(ordered, 95), 2),
+        "p99": round(1000 * percentile(ordered, 99), 2),
+        "max": round(1000 * ordered[-1], 2) if ordered else 0.0,
+    }
+
+
+def summarize(engine: str, feeds: int, raw: Dict, responses: Dict[str, int]) -> Dict:
+    by_kind: Dict[str, List[Tuple[float, int]]] = {}
+    for kind, seconds, items in raw["latencies"]:
+        by_kind.setdefault(kind, []).append((seconds, items))
+    return {
+        "engine": engine,
+        "feeds": feeds,
+        "items": raw["items"],
+        "wall_s": round(raw["wall"], 3),
+        "feeds_per_s": round(feeds / raw["wall"], 1) if raw["wall"] else None,
+        "items_per_s": round(raw["items"] / raw["wall"], 1) if raw["wall"] else None,
+        "latency_ms": _latency_summary([seconds for _, seconds, _ in raw["latencies"]]),
+        "by_kind": {
+            kind: {"feeds": len(samples), "items": sum(items for _, items in samples),
+                   **_latency_summary([seconds for seconds, _ in samples])}
+            for kind, samples in sorted(by_kind.items())
+        },
+        "cpu_s": round(raw["cpu"], 3) if raw["cpu"] is not None else None,
+        "peak_rss_mb": raw["peak_rss_mb"],
+        "children_peak_rss_mb": raw["children_peak_rss_mb"],
+        "responses": responses,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_result(result: Dict):
+    latency = result["latency_ms"]
+    print(f"\n⚡ {result['engine']}")
+    print(f"   {result['feeds']} feeds, {result['items']} items in {result['wall_s']:.2f}s "
+          f"→ {result['feeds_per_s']} feeds/s, {result['items_per_s']} items/s")
+    print(f"   per-feed latency: p50 {latency['p50']:.1f} ms  p95 {latency['p95']:.1f} ms  "
+          f"p99 {latency['p99']:.1f} ms  max {latency['max']:.1f} ms")
+    if result["cpu_s"] is not None:
+        workers = f" (workers: {result['children_peak_rss_mb']} MB)" if result['children_peak_rss_mb'] else ""
+        print(f"   CPU {result['cpu_s']:.2f}s, peak RSS {result['peak_rss_mb']} MB{workers}")
+    print(f"   responses: {', '.join(f'{status}×{count}' for status, count in result['responses'].items())}")
+    print(f"   {'kind':10} {'feeds':>6} {'items':>7} {'p50 ms':>8} {'p95 ms':>8}")
+    for kind, stats in result["by_kind"].items():
+        print(f"   {kind:10} {stats['feeds']:>6} {stats['items']:>7} {stats['p50']:>8.1f} {stats['p95']:>8.1f}")
+
+
+def run_benchmark(feeds: int, engines: List[str], mix: Dict[str, int],
+                  slow_delay: float = SLOW_DELAY_SECONDS, fixtures_dir: Optional[str] = None,
+                  workdir: str = 'data') -> Dict:
+    """
+    Benchmark each engine against a fresh fixture server
+
+    Returns:
+        {"meta": {...}, "config": {...}, "results": [one summary per engine]}
+    """
+    unknown = [name for name in engines if name not in ENGINES]
+    if unknown:
+        raise ValueError(f"Unknown engine(s): {', '.join(unknown)} (available: {', '.join(ENGINES)})")
+
+    results = []
+    with FixtureFeedServer(slow_delay=slow_delay, fixtures_dir=fixtures_dir) as server:
+        sources = build_sources(server.base_url, feeds, mix)
+        os.makedirs(workdir, exist_ok=True)
+        sources_path = os.path.join(workdir, f'.bench_sources_{os.getpid()}.json')
+        with open(sources_path, 'w', encoding='utf-8') as f:
+            json.dump(sources, f)
+        try:
+            for name in engines:
+                print(f"🏁 {name}: {feeds} feeds...", flush=True)
+                server.take_responses()
+                outbox = multiprocessing.Queue()
+                child = multiprocessing.Process(target=_run_engine, args=(name, sources_path, outbox))
+                child.start()
+                raw = None
+                while raw is None:
+                    try:
+                        raw = outbox.get(timeout=1)
+                    except queue.Empty:
+                        if not child.is_alive():
+                            raise RuntimeError(f"Engine {name} exited with code {child.exitcode}")
+                child.join()
+                results.append(summarize(name, feeds, raw, server.take_responses()))
+                print_result(results[-1])
+        finally:
+            os.remove(sources_path)
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec='seconds'),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "config": {"feeds": feeds, "mix": mix, "slow_delay_s": slow_delay,
+                   "recorded_fixtures": bool(fixtures_dir)},
+        "results": results,
+    }
+
+
+def compare(before: Dict, after: Dict):
+    """Print per-engine deltas between two result files"""
+    print(f"\n📊 {before['meta'].get('commit') or 'before'} → {after['meta'].get('commit') or 'after'}")
+    if before["config"] != after["config"]:
+        print("   ⚠️  Different benchmark configs - deltas are only indicative")
+    previous = {result["engine"]: result for result in before["results"]}
+    metrics = (("wall_s", "wall s"), ("feeds_per_s", "feeds/s"), ("cpu_s", "CPU s"), ("peak_rss_mb", "peak RSS MB"),
+               ("children_peak_rss_mb", "workers RSS MB"))
+    for result in after["results"]:
+        old = previous.get(result["engine"])
+        if not old:
+            print(f"\n   {result['engine']}: new engine")
+            continue
+        print(f"\n   {result['engine']}:")
+        rows = [(label, old.get(key), result.get(key)) for key, label in metrics]
+        rows += [(f"{p} ms", old["latency_ms"][p], result["latency_ms"][p]) for p in ("p50", "p95", "p99")]
+        for label, a, b in rows:
+            if a is None or b is None:
+                continue
+            change = f"{100 * (b - a) / a:+.1f}%" if a else "n/a"
+            print(f"      {label:12} {a:>10} → {b:<10} {change}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark feed aggregation against local fixtures')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help='Run the benchmark')
+    run.add_argument('--feeds', type=int, default=100, help='Number of feeds (10 to 10,000)')
+    run.add_argument('--engines', nargs='+', default=list(ENGINES), help=f"Engines: {', '.join(ENGINES)}")
+    run.add_argument('--mix', help='Feed kinds in percent, e.g. rss=70,large=5,slow=5,malformed=20')
+    run.add_argument('--slow-delay', type=float, default=SLOW_DELAY_SECONDS)
+    run.add_argument('--fixtures', help='Directory of recorded *.xml feeds (use kind "recorded" in --mix)')
+    run.add_argument('--json', help='Write machine-readable results here')
+
+    cmp = sub.add_parser('compare', help='Compare two result files')
+    cmp.add_argument('before')
+    cmp.add_argument('after')
+
+    serve = sub.add_parser('serve', help='Only run the fixture server')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--fixtures')
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        try:
+            report = run_benchmark(args.feeds, args.engines, parse_mix(args.mix),
+                                   args.slow_delay, args.fixtures)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        if args.json:
+            os.makedirs(os.path.dirname(args.json) or '.', exist_ok=True)
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            print(f"\n✅ Results written to {args.json}")
+
+    elif args.command == 'compare':
+        with open(args.before, 'r', encoding='utf-8') as f:
+            before = json.load(f)
+        with open(args.after, 'r', encoding='utf-8') as f:
+            after = json.load(f)
+        compare(before, after)
+
+    elif args.command == 'serve':
+        with FixtureFeedServer(port=args.port, fixtures_dir=args.fixtures) as server:
+            print(f"🧪 Fixture feeds at {server.base_url}/feed/<kind>/<n>.xml (Ctrl+C to stop)")
+            print(f"   kinds: {', '.join(DEFAULT_MIX)}{', recorded' if server.recorded else ''}")
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+Feed Discovery
+Turns homepage and channel URLs in the source registry into feed URLs
+
+A source URL that serves HTML is looked up once:
+
+- <link rel="alternate" type="application/rss+xml"> (or atom+xml) in the
+  page's <head>, resolved against the page URL;
+- YouTube channel pages (/@handle, /c/name, /user/name) - the channel id
+  from the page, turned into https://www.youtube.com/feeds/videos.xml?channel_id=...
+  (/channel/UC... and playlist URLs are mapped without a request).
+
+rss_reader.py does this on the fly when a source turns out to be a web page,
+fetches the discovered feed in the same run, and writes the feed URL back to
+content_sources.json (keeping the original as "page_url"), so later runs
+hit the feed directly.
+
+Usage:
+    python feed_discovery.py find https://www.youtube.com/@AndrejKarpathy
+    python feed_discovery.py add blogs "Lil'Log" https://lilianweng.github.io/
+    python feed_discovery.py resolve                    # every source in content_sources.json
+    python feed_discovery.py resolve --dry-run
+"""
+
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urljoin, urlsplit
+
+import requests
+
+
+DEFAULT_SOURCES_PATH = 'content_sources.json'
+
+FEED_TYPES = ('application/rss+xml', 'application/atom+xml', 'application/feed+xml')
+
+YOUTUBE_HOSTS = ('youtube.com', 'www.youtube.com', 'm.youtube.com')
+YOUTUBE_FEED = 'https://www.youtube.com/feeds/videos.xml'
+
+_CHANNEL_ID_RE = re.compile(rb'"(?:channelId|externalId|browseId)":"(UC[\w-]{22})"')
+_CHANNEL_PATH_RE = re.compile(r'^/channel/(UC[\w-]{22})')
+
+# Only the <head> is parsed for <link> tags; pages can be megabytes
+_HEAD_END_RE = re.compile(rb'</head\s*>', re.IGNORECASE)
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+class _FeedLinkParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.feeds: List[str] = []
+        self.channel_id: Optional[str] = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {name: value or '' for name, value in attrs}
+        if tag == 'link' and 'alternate' in attrs.get('rel', '').lower().split() \
+                and attrs.get('type', '').lower().split(';')[0].strip() in FEED_TYPES and attrs.get('href'):
+            self.feeds.append(attrs['href'])
+        elif tag == 'meta' and attrs.get('itemprop') in ('channelId', 'identifier') \
+                and attrs.get('content', '').startswith('UC'):
+            self.channel_id = self.channel_id or attrs['content']
+        elif tag == 'link' and attrs.get('rel', '').lower() == 'canonical':
+            match = _CHANNEL_PATH_RE.match(urlsplit(attrs.get('href', '')).path)
+            if match:
+                self.channel_id = self.channel_id or match.group(1)
+
+
+def is_youtube(url: str) -> bool:
+    return (urlsplit(url).hostname or '').lower() in YOUTUBE_HOSTS
+
+
+def youtube_feed_url(url: str) -> Optional[str]:
+    """Feed URL for YouTube URLs that name the channel or playlist directly, else None"""
+    if not is_youtube(url):
+        return None
+    parts = urlsplit(url)
+    if parts.path.startswith('/feeds/'):
+        return url
+    match = _CHANNEL_PATH_RE.match(parts.path)
+    if match:
+        return f"{YOUTUBE_FEED}?channel_id={match.group(1)}"
+    playlist = parse_qs(parts.query).get('list')
+    if parts.path == '/playlist' and playlist:
+        return f"{YOUTUBE_FEED}?playlist_id={playlist[0]}"
+    return None
+
+
+def discover_feed_urls(page_url: str, html: bytes) -> List[str]:
+    """
+    Feed URLs advertised by an HTML page, best first
+
+    Args:
+        page_url: URL the page was served from (relative hrefs resolve against it)
+        html: raw page body
+    """
+    head_end = _HEAD_END_RE.search(html)
+    parser = _FeedLinkParser()
+    # Tag and attribute names are ASCII; a wrong guess at the charset only garbles titles
+    parser.feed((html[:head_end.end()] if head_end else html).decode('utf-8', errors='replace'))
+
+    feeds = []
+    for href in parser.feeds:
+        feed_url = urljoin(page_url, href.strip())
+        # Comment feeds are advertised too, but aren't the site's posts
+        if feed_url not in feeds and '/comments/' not in feed_url:
+            feeds.append(feed_url)
+
+    if is_youtube(page_url):
+        channel_id = parser.channel_id
+        if channel_id is None:
+            match = _CHANNEL_ID_RE.search(html)
+            channel_id = match.group(1).decode('ascii') if match else None
+        if channel_id:
+            feed_url = f"{YOUTUBE_FEED}?channel_id={channel_id}"
+            if feed_url not in feeds:
+                feeds.insert(0, feed_url)
+    return feeds
+
+
+def _looks_like_feed(content_type: str, body: bytes) -> bool:
+    if 'html' in content_type:
+        return False
+    start = body[:512].lstrip()
+    return 'xml' in content_type or start.startswith(b'<?xml') or start.startswith(b'<rss') \
+        or start.startswith(b'<feed')
+
+
+class FeedResolver:
+    """
+    Remembers page URL -> feed URL resolutions made during a run
+
+    rss_reader hands it HTML bodies it got instead of a feed (discover());
+    update_registry() writes what was found back to the source registry.
+    """
+
+    def __init__(self, timeout: int = 15):
+        self.timeout = timeout
+        self.resolved: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def discover(self, page_url: str, html: bytes, base_url: Optional[str] = None) -> Optional[str]:
+        """Best feed URL in an HTML page already downloaded, or None (remembered when found)"""
+        feeds = discover_feed_urls(base_url or page_url, html)
+        if not feeds:
+            return None
+        with self._lock:
+            self.resolved[page_url] = feeds[0]
+        return feeds[0]
+
+    def resolve(self, url: str) -> Optional[str]:
+        """
+        Feed URL for any source URL: itself if it already serves a feed,
+        else whatever its page advertises
+
+        Raises:
+            requests.RequestException: the URL couldn't be fetched
+        """
+        direct = youtube_feed_url(url)
+        if direct:
+            if direct != url:
+                with self._lock:
+                    self.resolved[url] = direct
+            return direct
+
+        response = requests.get(url, timeout=self.timeout, headers=HEADERS)
+        response.raise_for_status()
+        if _looks_like_feed(response.headers.get('Content-Type', ''), response.content):
+            return url
+        return self.discover(url, response.content, base_url=response.url)
+
+    def update_registry(self, path: str = DEFAULT_SOURCES_PATH) -> int:
+        """
+        Point registry entries at their discovered feeds (atomically)
+
+        The original URL is kept as "page_url". Returns how many entries changed.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            sources = json.load(f)
+        changed = 0
+        for source in sources:
+            feed_url = self.resolved.get(source.get('url'))
+            if feed_url and feed_url != source['url']:
+                source.setdefault('page_url', source['url'])
+                source['url'] = feed_url
+                source['type'] = 'rss'
+                changed += 1
+        if changed:
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(sources, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        return changed
+
+
+def _load_sources(path: str) -> List[Dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Discover feed URLs for pages in the source registry')
+    parser.add_argument('--sources', default=DEFAULT_SOURCES_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+    find = sub.add_parser('find', help='Print the feeds a page advertises')
+    find.add_argument('url')
+    add = sub.add_parser('add', help='Add a source by homepage or channel URL')
+    add.add_argument('category')
+    add.add_argument('name')
+    add.add_argument('url')
+    resolve = sub.add_parser('resolve', help='Resolve every registry entry that is not a feed')
+    resolve.add_argument('--dry-run', action='store_true')
+    resolve.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    resolver = FeedResolver()
+
+    if args.command == 'find':
+        feed_url = youtube_feed_url(args.url)
+        if feed_url:
+            feeds = [feed_url]
+        else:
+            response = requests.get(args.url, timeout=resolver.timeout, headers=HEADERS)
+            response.raise_for_status()
+            if _looks_like_feed(response.headers.get('Content-Type', ''), response.content):
+                print(f"✅ {args.url} is already a feed")
+                return
+            feeds = discover_feed_urls(response.url, response.content)
+        if not feeds:
+            print(f"❌ No feed found on {args.url}")
+        for feed_url in feeds:
+            print(f"   {feed_url}")
+
+    elif args.command == 'add':
+        sources = _load_sources(args.sources)
+        if any(source['name'] == args.name and source['category'] == args.category for source in sources):
+            print(f"⚠️  {args.category}/{args.name} is already in {args.sources}")
+            return
+        try:
+            feed_url = resolver.resolve(args.url)
+        except requests.RequestException as e:
+            print(f"❌ Couldn't fetch {args.url}: {e}")
+            return
+        if not feed_url:
+            print(f"❌ No feed found on {args.url}")
+            return
+        entry = {"category": args.category, "name": args.name, "url": feed_url, "type": "rss"}
+        if feed_url != args.url:
+            entry["page_url"] = args.url
+        sources.append(entry)
+        tmp_path = f"{args.sources}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(sources, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, args.sources)
+        print(f"✅ Added {args.name}: {feed_url}")
+
+    elif args.command == 'resolve':
+        sources = _load_sources(args.sources)
+
+        def check(source: Dict):
+            try:
+                return source, resolver.resolve(source['url']), None
+            except requests.RequestException as e:
+                return source, None, e
+
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            results = list(executor.map(check, sources))
+        for source, feed_url, error in results:
+            if error is not None:
+                print(f"  {source['name']:30} 🔌 {str(error)[:60]}")
+            elif feed_url is None:
+                print(f"  {source['name']:30} ❌ no feed found")
+            elif feed_url != source['url']:
+                print(f"  {source['name']:30} 🔎 {feed_url}")
+        if args.dry_run:
+            print(f"\n{len(resolver.resolved)} source(s) would be updated")
+        else:
+            print(f"\n✅ Updated {resolver.update_registry(args.sources)} source(s) in {args.sources}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Feed Health
+Per-source failure tracking and a circuit breaker for the RSS aggregator
+
+fetch_feed reports the outcome class of every fetch (see feed_metrics.py)
+here. A source that fails THRESHOLD times in a row is quarantined: the
+aggregator skips it without touching the network until its retry time, then
+sends a single probe. A successful probe closes the breaker; a failed one
+doubles the wait, up to MAX_BACKOFF. Failures that won't fix themselves -
+a 4xx, an HTML page where a feed was expected, XML that doesn't parse - start
+with a day's wait instead of an hour's.
+
+So a dead URL (like a YouTube channel page instead of its RSS feed) costs one
+timeout or error a few times and then, at most, one probe a week.
+
+State lives in data/feed_health.json, keyed by URL, and is written
+atomically after each run.
+
+Usage:
+    python feed_health.py report            # quarantined sources and recent failures
+    python feed_health.py report --all
+    python feed_health.py reset URL         # give one source a fresh start
+    python feed_health.py reset --all
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+
+DEFAULT_HEALTH_PATH = 'data/feed_health.json'
+
+# Consecutive failures before a source is quarantined
+THRESHOLD = 3
+
+BASE_BACKOFF = timedelta(hours=1)
+PERMANENT_BACKOFF = timedelta(days=1)
+MAX_BACKOFF = timedelta(days=7)
+
+SUCCESS_OUTCOMES = ("ok", "discovered")
+
+# Outcome classes that retrying in an hour won't fix
+PERMANENT_OUTCOMES = ("http_4xx", "not_a_feed", "parse_error")
+
+CLOSED = "closed"
+OPEN = "open"
+
+
+def _now() -> datetime:
+    return datetime.now().replace(microsecond=0)
+
+
+class FeedHealth:
+    """
+    Circuit breaker state for every feed URL
+
+    Thread-safe, so fetches on a pool can report into one instance.
+    """
+
+    def __init__(self, path: str = DEFAULT_HEALTH_PATH, threshold: int = THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.sources: Dict[str, Dict] = json.load(f)
+        except FileNotFoundError:
+            self.sources = {}
+        except ValueError:
+            print(f"⚠️  {path} is corrupt - starting with fresh feed health")
+            self.sources = {}
+
+    def allow(self, url: str, now: Optional[datetime] = None) -> bool:
+        """False while the source is quarantined; True for a closed breaker or a due probe"""
+        state = self.sources.get(url)
+        if state is None or state["state"] == CLOSED:
+            return True
+        return (now or _now()) >= datetime.fromisoformat(state["retry_at"])
+
+    def record(self, url: str, outcome: str, source: Optional[str] = None,
+               now: Optional[datetime] = None) -> Dict:
+        """
+        Record one fetch outcome
+
+        Returns:
+            The source's updated state
+        """
+        now = now or _now()
+        with self._lock:
+            state = self.sources.setdefault(url, {
+                "source": source, "state": CLOSED, "consecutive_failures": 0, "failures_total": 0,
+                "last_outcome": None, "last_success": None, "last_failure": None,
+                "backoff_seconds": 0, "retry_at": None,
+            })
+            if source:
+                state["source"] = source
+            state["last_outcome"] = outcome
+
+            if outcome in SUCCESS_OUTCOMES:
+                state.update(state=CLOSED, consecutive_failures=0, last_success=now.isoformat(),
+                             backoff_seconds=0, retry_at=None)
+                return state
+
+            state["consecutive_failures"] += 1
+            state["failures_total"] += 1
+            state["last_failure"] = now.isoformat()
+            if state["state"] == OPEN:
+                # Failed probe: wait twice as long before the next one
+                backoff = min(timedelta(seconds=state["backoff_seconds"] * 2), MAX_BACKOFF)
+            elif state["consecutive_failures"] >= self.threshold:
+                backoff = PERMANENT_BACKOFF if outcome in PERMANENT_OUTCOMES else BASE_BACKOFF
+            else:
+                return state
+            state.update(state=OPEN, backoff_seconds=int(backoff.total_seconds()),
+                         retry_at=(now + backoff).isoformat())
+            return state
+
+    def quarantined(self) -> List[Dict]:
+        """Open breakers, soonest retry first"""
+        return sorted(({"url": url, **state} for url, state in self.sources.items() if state["state"] == OPEN),
+                      key=lambda state: state["retry_at"])
+
+    def failing(self) -> List[Dict]:
+        """Sources with recent failures that aren't quarantined (yet)"""
+        return sorted(({"url": url, **state} for url, state in self.sources.items()
+                       if state["state"] == CLOSED and state["consecutive_failures"]),
+                      key=lambda state: -state["consecutive_failures"])
+
+    def reset(self, url: Optional[str] = None) -> int:
+        """Forget one URL's history (or every URL's); returns how many were reset"""
+        with self._lock:
+            if url is None:
+                count = len(self.sources)
+                self.sources = {}
+                return count
+            return 1 if self.sources.pop(url, None) is not None else 0
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with self._lock, open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.sources, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def print_report(self, show_all: bool = False):
+        quarantined = self.quarantined()
+        if quarantined:
+            print(f"\n🚫 Quarantined sources ({len(quarantined)}):")
+            for state in quarantined:
+                print(f"   {str(state['source'] or state['url'])[:30]:30} {state['last_outcome']:<16} "
+                      f"{state['consecutive_failures']:>3} failures  next probe {state['retry_at']}")
+                if show_all:
+                    print(f"      {state['url']}")
+        failing = self.failing()
+        if failing:
+            print(f"\n⚠️  Failing sources ({len(failing)}):")
+            for state in failing:
+                print(f"   {str(state['source'] or state['url'])[:30]:30} {state['last_outcome']:<16} "
+                      f"{state['consecutive_failures']:>3} of {self.threshold} failures")
+        if show_all:
+            healthy = len(self.sources) - len(quarantined) - len(failing)
+            print(f"\n✅ Healthy sources: {healthy}")
+        elif not quarantined and not failing:
+            print("\n✅ All sources healthy")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Feed health and circuit breaker state')
+    parser.add_argument('--path', default=DEFAULT_HEALTH_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+    report = sub.add_parser('report', help='Quarantined and failing sources')
+    report.add_argument('--all', action='store_true', help='Include URLs and the healthy count')
+    reset = sub.add_parser('reset', help='Close the breaker for a source')
+    reset.add_argument('url', nargs='?')
+    reset.add_argument('--all', action='store_true')
+    args = parser.parse_args()
+
+    health = FeedHealth(args.path)
+    if args.command == 'report':
+        health.print_report(show_all=args.all)
+    elif args.command == 'reset':
+        if not args.url and not args.all:
+            parser.error('give a URL or --all')
+        count = health.reset(None if args.all else args.url)
+        health.save()
+        print(f"✅ Reset {count} source(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Feed Metrics
+Prometheus-style counters and histograms for the RSS aggregator
+
+rss_reader records every fetch here: attempts, outcome class (ok, timeout,
+connection_error, http_4xx, http_429, http_5xx, not_a_feed, discovered,
+parse_error, error), bytes downloaded, items parsed and latency -
+labelled by source and host. After a run the registry is written in the
+Prometheus text format as a textfile-collector file (data/metrics/rss_reader.prom
+by default), which node_exporter can pick up, and dashboard_server.py serves
+the same files on /metrics for a direct scrape.
+
+The aggregator is a short-lived process, so counters and histogram buckets
+are added onto the values already in the file - they keep increasing across
+runs, the way Prometheus expects counters to.
+
+Usage:
+    python rss_reader.py --metrics data/metrics/rss_reader.prom
+    python feed_metrics.py show                 # print the current file
+"""
+
+import argparse
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+DEFAULT_METRICS_DIR = 'data/metrics'
+DEFAULT_TEXTFILE = os.path.join(DEFAULT_METRICS_DIR, 'rss_reader.prom')
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0)
+
+OUTCOMES = ("ok", "discovered", "timeout", "connection_error", "http_4xx",
+            "http_429", "http_5xx", "not_a_feed", "parse_error", "error")
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        super().__init__(name, help_text, labels)
+        self.values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_labels(self.label_names, key)} {_number(value)}"
+                for key, value in sorted(self.values.items())]
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self.values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        self.counts: Dict[Tuple, List[int]] = {}    # per bucket, not cumulative
+        self.sums: Dict[Tuple, float] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            counts = self.counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[index] += 1
+            self.sums[key] = self.sums.get(key, 0.0) + value
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, counts in sorted(self.counts.items()):
+            running = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                running += count
+                le = '+Inf' if bound == float('inf') else _number(bound)
+                bucket_labels = _labels(self.label_names, key, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {running}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(self.sums[key])}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {running}")
+        return lines
+
+
+_SAMPLE_RE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*(?:\{.*\})?) (\S+)$')
+
+
+class Registry:
+    """A set of metrics rendered together in the Prometheus text format"""
+
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines += metric.render()
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str = DEFAULT_TEXTFILE, accumulate: bool = True) -> str:
+        """
+        Write the registry for node_exporter's textfile collector (atomically)
+
+        With accumulate, counter and histogram samples already in the file are
+        added to this run's values; gauges are replaced.
+
+        Returns:
+            The text written
+        """
+        text = self.render()
+        if accumulate:
+            text = _accumulate(_read(path), text, {m.name for m in self.metrics if m.kind == 'gauge'})
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+        return text
+
+
+def _read(path: str) -> str:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        return ''
+
+
+def _accumulate(previous: str, current: str, gauges: set) -> str:
+    """Add previous counter/histogram samples onto current; keep series only the previous run had"""
+    previous_values: Dict[str, float] = {}
+    previous_order: List[str] = []
+    for line in previous.splitlines():
+        match = _SAMPLE_RE.match(line)
+        if match and not line.startswith('#'):
+            previous_values[match.group(1)] = float(match.group(2))
+            previous_order.append(match.group(1))
+
+    lines, seen = [], set()
+    metric = None
+    for line in current.splitlines():
+        if line.startswith('# HELP '):
+            if metric:
+                lines += _carried_over(metric, previous_order, previous_values, seen, gauges)
+            metric = line.split()[2]
+        match = _SAMPLE_RE.match(line)
+        if match and not line.startswith('#'):
+            sample, value = match.group(1), float(match.group(2))
+            seen.add(sample)
+            if metric not in gauges:
+                value += previous_values.get(sample, 0)
+            line = f"{sample} {_number(value)}"
+        lines.append(line)
+    if metric:
+        lines += _carried_over(metric, previous_order, previous_values, seen, gauges)
+    return '\n'.join(lines) + '\n'
+
+
+def _carried_over(metric: str, order: List[str], values: Dict[str, float], seen: set, gauges: set) -> List[str]:
+    """Series of `metric` from earlier runs that this run didn't touch (counters never disappear)"""
+    if metric in gauges:
+        return []
+    carried = []
+    for sample in order:
+        base = sample.split('{', 1)[0]
+        if sample not in seen and base in (metric, f"{metric}_bucket", f"{metric}_sum", f"{metric}_count"):
+            carried.append(f"{sample} {_number(values[sample])}")
+            seen.add(sample)
+    return carried
+
+
+def read_textfiles(directory: str = DEFAULT_METRICS_DIR) -> str:
+    """All *.prom files in directory, concatenated (what /metrics serves)"""
+    try:
+        names = sorted(name for name in os.listdir(directory) if name.endswith('.prom'))
+    except OSError:
+        return ''
+    return ''.join(_read(os.path.join(directory, name)) for name in names)
+
+
+# ---------------------------------------------------------------------- aggregator metrics
+
+registry = Registry()
+
+FETCH_ATTEMPTS = registry.register(Counter(
+    'rss_fetch_attempts_total', 'Feed fetch attempts', ('source', 'host')))
+FETCH_OUTCOMES = registry.register(Counter(
+    'rss_fetch_outcomes_total', 'Feed fetches by outcome class', ('source', 'host', 'outcome')))
+FETCH_BYTES = registry.register(Counter(
+    'rss_fetch_bytes_total', 'Feed bytes downloaded', ('source', 'host')))
+ITEMS_PARSED = registry.register(Counter(
+    'rss_items_parsed_total', 'Items extracted from feeds', ('source', 'host')))
+FETCH_SECONDS = registry.register(Histogram(
+    'rss_fetch_duration_seconds', 'Feed fetch latency (request to parsed items)', ('source', 'host')))
+LAST_RUN = registry.register(Gauge(
+    'rss_last_run_timestamp_seconds', 'When the aggregator last finished'))
+LAST_RUN_SECONDS = registry.register(Gauge(
+    'rss_last_run_duration_seconds', 'How long the last aggregation run took'))
+LAST_RUN_FAILURES = registry.register(Gauge(
+    'rss_last_run_failed_sources', 'Sources that returned nothing in the last run'))
+QUARANTINED = registry.register(Gauge(
+    'rss_quarantined_sources', 'Sources skipped by the circuit breaker (see feed_health.py)'))
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url).hostname or ''
+
+
+def record_fetch(url: str, source: Optional[str], outcome: str, seconds: float,
+                 size: int = 0, items: int = 0):
+    """Record one fetch_feed call"""
+    labels = {"source": source or host_of(url), "host": host_of(url)}
+    FETCH_ATTEMPTS.inc(**labels)
+    FETCH_OUTCOMES.inc(outcome=outcome, **labels)
+    FETCH_SECONDS.observe(seconds, **labels)
+    if size:
+        FETCH_BYTES.inc(size, **labels)
+    if items:
+        ITEMS_PARSED.inc(items, **labels)
+
+
+def record_run(started: float, failed_sources: int, quarantined: int = 0):
+    LAST_RUN.set(time.time())
+    LAST_RUN_SECONDS.set(time.time() - started)
+    LAST_RUN_FAILURES.set(failed_sources)
+    QUARANTINED.set(quarantined)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Feed aggregator metrics')
+    sub = parser.add_subparsers(dest='command', required=True)
+    show = sub.add_parser('show', help='Print the metrics textfile(s)')
+    show.add_argument('--dir', default=DEFAULT_METRICS_DIR)
+    args = parser.parse_args()
+
+    if args.command == 'show':
+        text = read_textfiles(args.dir)
+        print(text or f"⚠️  No metrics in {args.dir} yet - run: python rss_reader.py")
+
+
+if __name__ == "__main__":
+    main()
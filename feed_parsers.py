@@ -0,0 +1,335 @@
+"""
+Feed Parsers
+Per-source item extraction for the RSS aggregator
+
+fetch_feed hands every parsed document to one parser, chosen by the feed's
+host (or a "parser" key on the source's registry entry), so each feed is read
+once, straight from the elements that source actually uses:
+
+    arxiv     arxiv.org RSS (and API Atom): abstract without the "arXiv:... Announce
+              Type: ... Abstract:" preamble; arxiv_id, authors, categories
+    reddit    reddit.com Atom: self-text without the "submitted by ... [link]
+              [comments]" trailer; external_link (the [link] target when it
+              isn't the comments page), author, subreddit
+    youtube   youtube.com Atom: media:group/media:description as the summary;
+              video_id, channel_id, views, thumbnail
+    generic   everything else: RSS 2.0, RSS 1.0 (RDF) or Atom, picked from the
+              document's root element
+
+Reddit's feeds carry no score - that needs its JSON API - so there is no
+score field.
+
+A new source-specific parser is a function from the document root to a list
+of FeedItems:
+
+    @register('hn', hosts=('news.ycombinator.com', 'hnrss.org'))
+    def parse_hn(root):
+        ...
+
+Usage:
+    python feed_parsers.py list
+    python feed_parsers.py parse feed.xml --url http://export.arxiv.org/rss/cs.AI
+    python feed_parsers.py parse feed.xml --parser youtube
+"""
+
+import html
+import itertools
+import re
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from item_stream import FeedItem
+from tracing import tracer
+
+
+# Items kept per feed (arXiv feeds list ~1,000)
+MAX_ITEMS = 10
+
+NO_TITLE = 'No title'
+NO_SUMMARY = 'No summary available'
+UNKNOWN_DATE = 'Unknown'
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+RSS1 = '{http://purl.org/rss/1.0/}'
+RDF = '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}'
+CONTENT = '{http://purl.org/rss/1.0/modules/content/}'
+DC = '{http://purl.org/dc/elements/1.1/}'
+ARXIV = '{http://arxiv.org/schemas/atom}'
+MEDIA = '{http://search.yahoo.com/mrss/}'
+YT = '{http://www.youtube.com/xml/schemas/2015}'
+
+_TAG_RE = re.compile(r'<[^>]+>')
+
+Parser = Callable[[ET.Element], List[FeedItem]]
+
+PARSERS: Dict[str, Parser] = {}
+HOSTS: Dict[str, str] = {}      # host -> parser name
+
+
+def clean_html(text: str) -> str:
+    """Remove HTML tags and decode entities"""
+    if not text:
+        return ""
+
+    with tracer.span("clean_html"):
+        # Decode HTML entities
+        text = html.unescape(text)
+
+        # Remove HTML tags (simple approach)
+        text = _TAG_RE.sub('', text)
+
+        # Clean up whitespace
+        text = ' '.join(text.split())
+
+        return text[:300]  # Limit to 300 chars
+
+
+def register(name: str, hosts: Tuple[str, ...] = ()) -> Callable[[Parser], Parser]:
+    """Decorator: make a parser available by name and for the given hosts (and their subdomains)"""
+    def decorator(parser: Parser) -> Parser:
+        PARSERS[name] = parser
+        for host in hosts:
+            HOSTS[host] = name
+        return parser
+    return decorator
+
+
+def parser_name(url: str, name: Optional[str] = None) -> str:
+    """
+    Name of the parser for a feed: name if given, else the one registered for
+    the URL's host or a parent domain, else 'generic'
+
+    Raises:
+        KeyError: name isn't a registered parser
+    """
+    if name:
+        if name not in PARSERS:
+            raise KeyError(f"unknown parser {name!r} (have: {', '.join(sorted(PARSERS))})")
+        return name
+    host = (urlsplit(url).hostname or '').lower()
+    while host:
+        if host in HOSTS:
+            return HOSTS[host]
+        host = host.partition('.')[2]
+    return 'generic'
+
+
+def parse_items(root: ET.Element, url: str, name: Optional[str] = None) -> List[FeedItem]:
+    """Items from a parsed feed document, by the parser for url (or the named one)"""
+    return PARSERS[parser_name(url, name)](root)
+
+
+def _text(element: Optional[ET.Element]) -> str:
+    return element.text or '' if element is not None else ''
+
+
+def _summary(text: str) -> str:
+    return clean_html(text) or NO_SUMMARY
+
+
+def _atom_link(entry: ET.Element) -> str:
+    """The entry's alternate link (Atom allows several, with rel)"""
+    links = entry.findall(f'{ATOM}link')
+    for link in links:
+        if link.get('rel', 'alternate') == 'alternate':
+            return link.get('href', '')
+    return links[0].get('href', '') if links else ''
+
+
+# ---------------------------------------------------------------------- generic
+
+def parse_rss(root: ET.Element, ns: str = '') -> List[FeedItem]:
+    """RSS 2.0 items (RSS 1.0 with ns=RSS1), each read in a single pass over its children"""
+    summary_tags = (f'{ns}description', 'summary', f'{CONTENT}encoded')
+    items = []
+    for item in itertools.islice(root.iter(f'{ns}item'), MAX_ITEMS):
+        fields: Dict[str, str] = {}
+        for child in item:
+            fields.setdefault(child.tag, child.text or '')
+        if f'{ns}title' not in fields or f'{ns}link' not in fields:
+            continue
+        summary = next((fields[tag] for tag in summary_tags if fields.get(tag)), '')
+        items.append(FeedItem(
+            title=clean_html(fields[f'{ns}title'] or NO_TITLE),
+            link=fields[f'{ns}link'].strip(),
+            summary=_summary(summary),
+            published=fields.get('pubDate') or fields.get(f'{DC}date') or UNKNOWN_DATE
+        ))
+    return items
+
+
+def parse_atom(root: ET.Element) -> List[FeedItem]:
+    """Atom entries"""
+    items = []
+    for entry in itertools.islice(root.iter(f'{ATOM}entry'), MAX_ITEMS):
+        title = entry.find(f'{ATOM}title')
+        if title is None:
+            continue
+        summary = _text(entry.find(f'{ATOM}summary')) or _text(entry.find(f'{ATOM}content'))
+        items.append(FeedItem(
+            title=clean_html(title.text or NO_TITLE),
+            link=_atom_link(entry),
+            summary=_summary(summary),
+            published=_text(entry.find(f'{ATOM}published')) or _text(entry.find(f'{ATOM}updated'))
+            or UNKNOWN_DATE
+        ))
+    return items
+
+
+@register('generic')
+def parse_generic(root: ET.Element) -> List[FeedItem]:
+    """RSS 2.0, RSS 1.0 or Atom, by the root element"""
+    if root.tag == f'{ATOM}feed':
+        return parse_atom(root)
+    if root.tag == f'{RDF}RDF':
+        return parse_rss(root, RSS1)
+    return parse_rss(root)
+
+
+# ---------------------------------------------------------------------- arXiv
+
+_ARXIV_PREAMBLE_RE = re.compile(r'^\s*arXiv:\S+\s+Announce Type:\s*(\S+)\s+Abstract:\s*')
+_ARXIV_ID_RE = re.compile(r'/abs/([^?#]+?)(?:v\d+)?$')
+_AUTHOR_SPLIT_RE = re.compile(r',\s*(?:and\s+)?|\s+and\s+')
+
+
+def _arxiv_id(link: str) -> str:
+    match = _ARXIV_ID_RE.search(link.strip())
+    return match.group(1) if match else ''
+
+
+@register('arxiv', hosts=('arxiv.org',))
+def parse_arxiv(root: ET.Element) -> List[FeedItem]:
+    """arXiv listing RSS (rss.arxiv.org, export.arxiv.org/rss) or API Atom (export.arxiv.org/api)"""
+    if root.tag == f'{ATOM}feed':
+        return _parse_arxiv_api(root)
+    items = []
+    for item in itertools.islice(root.iter('item'), MAX_ITEMS):
+        link = _text(item.find('link')).strip()
+        description = _text(item.find('description'))
+        preamble = _ARXIV_PREAMBLE_RE.match(description)
+        creators = _text(item.find(f'{DC}creator'))
+        items.append(FeedItem(
+            title=clean_html(_text(item.find('title')) or NO_TITLE),
+            link=link,
+            summary=_summary(description[preamble.end():] if preamble else description),
+            published=_text(item.find('pubDate')) or UNKNOWN_DATE,
+            extra={
+                "arxiv_id": _arxiv_id(link),
+                "authors": [name for name in _AUTHOR_SPLIT_RE.split(clean_html(creators)) if name],
+                "categories": [category.text for category in item.iter('category') if category.text],
+                "announce_type": _text(item.find(f'{ARXIV}announce_type'))
+                or (preamble.group(1) if preamble else ''),
+            }
+        ))
+    return items
+
+
+def _parse_arxiv_api(root: ET.Element) -> List[FeedItem]:
+    items = []
+    for entry in itertools.islice(root.iter(f'{ATOM}entry'), MAX_ITEMS):
+        link = _atom_link(entry) or _text(entry.find(f'{ATOM}id'))
+        items.append(FeedItem(
+            title=clean_html(_text(entry.find(f'{ATOM}title')) or NO_TITLE),
+            link=link,
+            summary=_summary(_text(entry.find(f'{ATOM}summary'))),
+            published=_text(entry.find(f'{ATOM}published')) or UNKNOWN_DATE,
+            extra={
+                "arxiv_id": _arxiv_id(link),
+                "authors": [_text(author.find(f'{ATOM}name')).strip() for author in entry.iter(f'{ATOM}author')],
+                "categories": [category.get('term') for category in entry.iter(f'{ATOM}category')
+                               if category.get('term')],
+            }
+        ))
+    return items
+
+
+# ---------------------------------------------------------------------- Reddit
+
+_REDDIT_TRAILER_RE = re.compile(r'(?:&#32;|\s)*submitted by', re.IGNORECASE)
+_REDDIT_LINK_RE = re.compile(r'<a href="([^"]+)">\[link\]</a>')
+
+
+@register('reddit', hosts=('reddit.com',))
+def parse_reddit(root: ET.Element) -> List[FeedItem]:
+    """Subreddit and user Atom feeds (reddit.com/r/<name>/.rss)"""
+    items = []
+    for entry in itertools.islice(root.iter(f'{ATOM}entry'), MAX_ITEMS):
+        link = _atom_link(entry)
+        content = _text(entry.find(f'{ATOM}content'))
+        external = _REDDIT_LINK_RE.search(content)
+        external_link = html.unescape(external.group(1)) if external else ''
+        category = entry.find(f'{ATOM}category')
+        items.append(FeedItem(
+            title=clean_html(_text(entry.find(f'{ATOM}title')) or NO_TITLE),
+            link=link,
+            summary=_summary(_REDDIT_TRAILER_RE.split(content, 1)[0]),
+            published=_text(entry.find(f'{ATOM}published')) or _text(entry.find(f'{ATOM}updated'))
+            or UNKNOWN_DATE,
+            extra={
+                "external_link": '' if external_link.rstrip('/') == link.rstrip('/') else external_link,
+                "author": _text(entry.find(f'{ATOM}author/{ATOM}name')).strip(),
+                "subreddit": category.get('term', '') if category is not None else '',
+            }
+        ))
+    return items
+
+
+# ---------------------------------------------------------------------- YouTube
+
+@register('youtube', hosts=('youtube.com',))
+def parse_youtube(root: ET.Element) -> List[FeedItem]:
+    """Channel and playlist feeds (youtube.com/feeds/videos.xml)"""
+    items = []
+    for entry in itertools.islice(root.iter(f'{ATOM}entry'), MAX_ITEMS):
+        statistics = entry.find(f'{MEDIA}group/{MEDIA}community/{MEDIA}statistics')
+        thumbnail = entry.find(f'{MEDIA}group/{MEDIA}thumbnail')
+        views = statistics.get('views', '') if statistics is not None else ''
+        items.append(FeedItem(
+            title=clean_html(_text(entry.find(f'{ATOM}title')) or NO_TITLE),
+            link=_atom_link(entry),
+            summary=_summary(_text(entry.find(f'{MEDIA}group/{MEDIA}description'))),
+            # <updated> moves whenever the view count does; <published> is the upload
+            published=_text(entry.find(f'{ATOM}published')) or UNKNOWN_DATE,
+            extra={
+                "video_id": _text(entry.find(f'{YT}videoId')),
+                "channel_id": _text(entry.find(f'{YT}channelId')),
+                "views": int(views) if views.isdigit() else None,
+                "thumbnail": thumbnail.get('url', '') if thumbnail is not None else '',
+            }
+        ))
+    return items
+
+
+def main():
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description='Feed parsers by source')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('list', help='Registered parsers and their hosts')
+    parse = sub.add_parser('parse', help='Parse a saved feed document and print its items')
+    parse.add_argument('path')
+    parse.add_argument('--url', default='', help='Pick the parser by this feed URL')
+    parse.add_argument('--parser', help='Use this parser regardless of the URL')
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        for name in sorted(PARSERS):
+            hosts = [host for host, parser_for in sorted(HOSTS.items()) if parser_for == name]
+            print(f"   {name:10} {', '.join(hosts) or '(default)'}")
+
+    elif args.command == 'parse':
+        try:
+            name = parser_name(args.url, args.parser)
+        except KeyError as e:
+            parser.error(e.args[0])
+        items = PARSERS[name](ET.parse(args.path).getroot())
+        print(f"✅ {len(items)} items ({name} parser)")
+        for item in items:
+            print(json.dumps(item.to_dict(), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,519 @@
+"""
+Item History
+Columnar, date-partitioned history of every aggregated item, for analytics
+
+Each run's item files are replaced by the next run, so compact() folds them
+into a long-lived history (run_daily.py does it every morning):
+
+    data/history/date=2026-10-19/items.parquet     with pyarrow installed
+    data/history/date=2026-10-19/items.npz         otherwise (NumPy arrays)
+
+A partition holds the items published that day (UTC) - or first seen that
+day, for feeds without usable dates. Items already in the history are
+skipped, so the same files can be compacted any number of times. Only the
+partitions that received new items are rewritten.
+
+Columns: id (the dashboard's item id), published and seen (epoch seconds),
+category and source (dictionary-encoded), title, link. Queries read only the
+partitions in their date range and only the columns they group on, then
+aggregate over NumPy arrays - a year of items takes a fraction of a second.
+
+    history = ItemHistory()
+    history.count(by=('day', 'category'), since='2026-01-01')
+    history.posted_sources()        # which sources the posted drafts came from
+
+Usage:
+    python item_history.py compact                         # latest aggregated items
+    python item_history.py compact snapshots/*.json        # older snapshots, any format
+    python item_history.py count --by category,day --since 2026-10-01
+    python item_history.py count --by source --category research --top 10
+    python item_history.py posted
+    python item_history.py stats
+"""
+
+import calendar
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from item_stream import iter_items
+from news_store import DEFAULT_CONTENT_PATHS, item_id, normalize_published
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+
+DEFAULT_HISTORY_DIR = 'data/history'
+
+FORMATS = {"parquet": "items.parquet", "npz": "items.npz"}
+
+# Columns count() can group by
+GROUP_COLUMNS = ("day", "category", "source")
+
+DICTIONARY_COLUMNS = ("category", "source")
+STRING_COLUMNS = ("title", "link")
+
+_SECONDS_PER_DAY = 86400
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("item history needs NumPy: pip install numpy (and pyarrow for Parquet files)")
+
+
+def _epoch(timestamp: str) -> int:
+    """'YYYY-MM-DDTHH:MM:SSZ' -> epoch seconds; -1 for ''"""
+    if not timestamp:
+        return -1
+    return calendar.timegm(time.strptime(timestamp, '%Y-%m-%dT%H:%M:%SZ'))
+
+
+def _day(epoch_seconds: int) -> str:
+    return datetime.fromtimestamp(epoch_seconds, tz=timezone.utc).strftime('%Y-%m-%d')
+
+
+def _check_day(value: Optional[str], name: str) -> Optional[str]:
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"{name} must be YYYY-MM-DD, got '{value}'")
+
+
+# ---------------------------------------------------------------------- npz encoding
+
+def _pack_strings(values: List[str]) -> Tuple['np.ndarray', 'np.ndarray']:
+    """Strings as one UTF-8 buffer plus offsets (Arrow's layout; no pickled objects)"""
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_strings(data: 'np.ndarray', offsets: 'np.ndarray') -> List[str]:
+    buffer = data.tobytes()
+    bounds = offsets.tolist()
+    return [buffer[start:end].decode('utf-8') for start, end in zip(bounds, bounds[1:])]
+
+
+def _encode_dictionary(values: List[str]) -> Tuple['np.ndarray', List[str]]:
+    index: Dict[str, int] = {}
+    codes = np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.int32, count=len(values))
+    return codes, list(index)
+
+
+# ---------------------------------------------------------------------- partitions
+
+class _Partition:
+    """Columns of one day: id/published/seen arrays, (codes, names) pairs, string lists"""
+
+    def __init__(self, columns: Dict):
+        self.columns = columns
+
+    def __len__(self) -> int:
+        column = next(iter(self.columns.values()))
+        return len(column[0] if isinstance(column, tuple) else column)
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict]) -> '_Partition':
+        columns = {
+            "id": np.array([row["id"] for row in rows], dtype='S16'),
+            "published": np.array([row["published"] for row in rows], dtype=np.int64),
+            "seen": np.array([row["seen"] for row in rows], dtype=np.int64),
+        }
+        for name in DICTIONARY_COLUMNS:
+            columns[name] = _encode_dictionary([row[name] for row in rows])
+        for name in STRING_COLUMNS:
+            columns[name] = [row[name] for row in rows]
+        return cls(columns)
+
+    def rows(self) -> List[Dict]:
+        names = {name: self.columns[name][1] for name in DICTIONARY_COLUMNS}
+        codes = {name: self.columns[name][0].tolist() for name in DICTIONARY_COLUMNS}
+        ids, published, seen = (self.columns[name].tolist() for name in ("id", "published", "seen"))
+        return [
+            {"id": ids[i], "published": published[i], "seen": seen[i],
+             **{name: names[name][codes[name][i]] for name in DICTIONARY_COLUMNS},
+             **{name: self.columns[name][i] for name in STRING_COLUMNS}}
+            for i in range(len(ids))
+        ]
+
+    # npz -----------------------------------------------------------------
+
+    def write_npz(self, path: str):
+        arrays = {name: self.columns[name] for name in ("id", "published", "seen")}
+        for name in DICTIONARY_COLUMNS:
+            codes, names = self.columns[name]
+            arrays[name] = codes
+            arrays[f"{name}_names"], arrays[f"{name}_names_offsets"] = _pack_strings(names)
+        for name in STRING_COLUMNS:
+            arrays[name], arrays[f"{name}_offsets"] = _pack_strings(self.columns[name])
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+
+    @classmethod
+    def read_npz(cls, path: str, columns: Iterable[str]) -> '_Partition':
+        result = {}
+        with np.load(path) as data:
+            for name in columns:
+                if name in DICTIONARY_COLUMNS:
+                    result[name] = (data[name], _unpack_strings(data[f"{name}_names"], data[f"{name}_names_offsets"]))
+                elif name in STRING_COLUMNS:
+                    result[name] = _unpack_strings(data[name], data[f"{name}_offsets"])
+                else:
+                    result[name] = data[name]
+        return cls(result)
+
+    # parquet -------------------------------------------------------------
+
+    def write_parquet(self, path: str):
+        table = {
+            "id": pa.array([value.decode('ascii') for value in self.columns["id"].tolist()], type=pa.string()),
+            "published": pa.array(self.columns["published"], type=pa.int64()),
+            "seen": pa.array(self.columns["seen"], type=pa.int64()),
+        }
+        for name in DICTIONARY_COLUMNS:
+            codes, names = self.columns[name]
+            table[name] = pa.DictionaryArray.from_arrays(pa.array(codes, type=pa.int32()),
+                                                         pa.array(names, type=pa.string()))
+        for name in STRING_COLUMNS:
+            table[name] = pa.array(self.columns[name], type=pa.string())
+        pq.write_table(pa.table(table), path, compression='zstd')
+
+    @classmethod
+    def read_parquet(cls, path: str, columns: Iterable[str]) -> '_Partition':
+        columns = list(columns)
+        table = pq.read_table(path, columns=columns)
+        result = {}
+        for name in columns:
+            array = table.column(name).combine_chunks()
+            if name in DICTIONARY_COLUMNS:
+                if not pa.types.is_dictionary(array.type):
+                    array = array.dictionary_encode()
+                result[name] = (array.indices.to_numpy(zero_copy_only=False).astype(np.int32),
+                                array.dictionary.to_pylist())
+            elif name in STRING_COLUMNS:
+                result[name] = array.to_pylist()
+            elif name == "id":
+                result[name] = np.array(array.to_pylist(), dtype='S16')
+            else:
+                result[name] = array.to_numpy(zero_copy_only=False)
+        return cls(result)
+
+
+def _merge_dictionary(parts: List[Tuple['np.ndarray', List[str]]]) -> Tuple['np.ndarray', List[str]]:
+    """Re-code per-partition dictionary columns against one shared dictionary"""
+    index: Dict[str, int] = {}
+    recoded = []
+    for codes, names in parts:
+        mapping = np.array([index.setdefault(name, len(index)) for name in names], dtype=np.int32)
+        recoded.append(mapping[codes] if len(mapping) else codes)
+    return (np.concatenate(recoded) if recoded else np.zeros(0, dtype=np.int32)), list(index)
+
+
+class ItemHistory:
+    """The history directory: compaction plus a few aggregate queries"""
+
+    def __init__(self, directory: str = DEFAULT_HISTORY_DIR, file_format: Optional[str] = None):
+        _require_numpy()
+        self.directory = directory
+        self.format = file_format or ("parquet" if pq is not None else "npz")
+        if self.format not in FORMATS:
+            raise ValueError(f"Unknown history format '{self.format}' (expected: {', '.join(FORMATS)})")
+        if self.format == "parquet" and pq is None:
+            raise ValueError("Parquet history needs pyarrow: pip install pyarrow")
+
+    # ------------------------------------------------------------------ partitions
+
+    def partitions(self, since: Optional[str] = None, until: Optional[str] = None) -> List[Tuple[str, str]]:
+        """(day, file) for every partition in [since, until], oldest first"""
+        since, until = _check_day(since, 'since'), _check_day(until, 'until')
+        try:
+            names = sorted(os.listdir(self.directory))
+        except FileNotFoundError:
+            return []
+        found = []
+        for name in names:
+            if not name.startswith('date='):
+                continue
+            day = name[len('date='):]
+            if (since and day < since) or (until and day > until):
+                continue
+            for file_name in FORMATS.values():
+                path = os.path.join(self.directory, name, file_name)
+                if os.path.exists(path):
+                    found.append((day, path))
+                    break
+        return found
+
+    def _read(self, path: str, columns: Iterable[str]) -> _Partition:
+        if path.endswith('.parquet'):
+            if pq is None:
+                raise ValueError(f"{path} is Parquet, which needs pyarrow: pip install pyarrow")
+            return _Partition.read_parquet(path, columns)
+        return _Partition.read_npz(path, columns)
+
+    def _write(self, day: str, partition: _Partition):
+        directory = os.path.join(self.directory, f"date={day}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, FORMATS[self.format])
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        if self.format == "parquet":
+            partition.write_parquet(tmp_path)
+        else:
+            partition.write_npz(tmp_path)
+        os.replace(tmp_path, path)
+        # A partition written in the other format earlier is superseded
+        for other in FORMATS.values():
+            if other != FORMATS[self.format] and os.path.exists(os.path.join(directory, other)):
+                os.remove(os.path.join(directory, other))
+
+    # ------------------------------------------------------------------ compaction
+
+    def compact(self, paths: Optional[Iterable[str]] = None, now: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Add items from stream files or JSON snapshots that the history doesn't have yet
+
+        Args:
+            paths: item files (default: the ones the dashboard reads)
+
+        Returns:
+            (items added, partitions rewritten)
+        """
+        seen = int(now if now is not None else time.time())
+        known = set()
+        for _, path in self.partitions():
+            known.update(self._read(path, ("id",)).columns["id"].tolist())
+
+        new_rows: Dict[str, List[Dict]] = {}
+        for path in (DEFAULT_CONTENT_PATHS if paths is None else paths):
+            try:
+                for item in iter_items(path):
+                    key = item_id(item).encode('ascii')
+                    if key in known:
+                        continue
+                    known.add(key)
+                    published = _epoch(normalize_published(item.get('published') or ''))
+                    new_rows.setdefault(_day(published if published >= 0 else seen), []).append({
+                        "id": key, "published": published, "seen": seen,
+                        "category": item.get('category') or '', "source": item.get('source') or '',
+                        "title": item.get('title') or '', "link": item.get('link') or '',
+                    })
+            except OSError:
+                continue
+
+        existing = dict(self.partitions())
+        for day, rows in new_rows.items():
+            if day in existing:
+                rows = self._read(existing[day], _ALL_COLUMNS).rows() + rows
+            self._write(day, _Partition.from_rows(rows))
+        return sum(len(rows) for rows in new_rows.values()), len(new_rows)
+
+    # ------------------------------------------------------------------ queries
+
+    def load(self, columns: Iterable[str], since: Optional[str] = None,
+             until: Optional[str] = None) -> Dict[str, object]:
+        """
+        Columns of every item in [since, until], concatenated across partitions
+
+        Returns:
+            {column: array}; "day" is days since 1970-01-01, dictionary columns
+            come as int32 codes with the names under "<column>_names", title
+            and link as lists
+        """
+        columns = list(columns)
+        stored = [name for name in columns if name != "day"]
+        parts, days = [], []
+        for day, path in self.partitions(since, until):
+            # "day" is the partition itself; ids are only read to know how many rows it has
+            partition = self._read(path, stored or ("id",))
+            parts.append(partition)
+            days.append(np.full(len(partition), _days_since_epoch(day), dtype=np.int32))
+
+        frame: Dict[str, object] = {}
+        if "day" in columns:
+            frame["day"] = np.concatenate(days) if days else np.zeros(0, dtype=np.int32)
+        for name in stored:
+            values = [part.columns[name] for part in parts]
+            if name in DICTIONARY_COLUMNS:
+                frame[name], frame[f"{name}_names"] = _merge_dictionary(values)
+            elif name in STRING_COLUMNS:
+                frame[name] = [value for part in values for value in part]
+            else:
+                frame[name] = np.concatenate(values) if values else np.zeros(0, dtype='S16' if name == "id" else np.int64)
+        return frame
+
+    def count(self, by: Iterable[str] = ("day",), since: Optional[str] = None, until: Optional[str] = None,
+              category: Optional[str] = None, source: Optional[str] = None) -> List[Tuple[Tuple, int]]:
+        """
+        Item counts grouped by any of day, category and source
+
+        Returns:
+            [((group values...), count)], ordered by the group values
+        """
+        by = tuple(by)
+        unknown = [name for name in by if name not in GROUP_COLUMNS]
+        if unknown:
+            raise ValueError(f"Can't group by {', '.join(unknown)} (expected: {', '.join(GROUP_COLUMNS)})")
+
+        filters = {name: value for name, value in (("category", category), ("source", source)) if value}
+        needed = list(dict.fromkeys(by + tuple(filters))) or ["day"]
+        frame = self.load(needed, since, until)
+        mask = np.ones(len(frame[needed[0]]), dtype=bool)
+        for name, value in filters.items():
+            names = frame[f"{name}_names"]
+            if value not in names:
+                return []
+            mask &= frame[name] == names.index(value)
+
+        # One int64 key per row (mixed radix over the group columns), counted with np.unique
+        key = np.zeros(int(mask.sum()), dtype=np.int64)
+        radices = []
+        for name in by:
+            values = frame[name][mask].astype(np.int64)
+            offset = int(values.min()) if len(values) else 0
+            radix = int(values.max()) - offset + 1 if len(values) else 1
+            key = key * radix + (values - offset)
+            radices.append((name, offset, radix))
+        keys, counts = np.unique(key, return_counts=True)
+
+        result = []
+        for key_value, count in zip(keys.tolist(), counts.tolist()):
+            labels = []
+            for name, offset, radix in reversed(radices):
+                key_value, value = divmod(key_value, radix)
+                value += offset
+                labels.append(_day(value * _SECONDS_PER_DAY) if name == "day" else frame[f"{name}_names"][value])
+            result.append((tuple(reversed(labels)), count))
+        return sorted(result)
+
+    def posted_sources(self, drafts_dir: Optional[str] = None) -> List[Tuple[str, str, int]]:
+        """
+        Which sources the posted drafts were written from
+
+        Drafts made from a news item carry "news:<item id>" (run_daily.py
+        generate) or the item's link (the dashboard) as their source.
+
+        Returns:
+            [(category, source, posts)], most posts first
+        """
+        from draft_store import DEFAULT_DRAFTS_DIR, DraftStore
+
+        with DraftStore(drafts_dir or DEFAULT_DRAFTS_DIR) as store:
+            drafts, _ = store.list(status="posted", limit=1_000_000)
+        references = [draft["source"] for draft in drafts if draft["source"]]
+        ids = [reference[len("news:"):].encode('ascii', 'replace') for reference in references
+               if reference.startswith("news:")]
+        links = {reference for reference in references if not reference.startswith("news:")}
+        if not ids and not links:
+            return []
+
+        frame = self.load(("id", "category", "source") + (("link",) if links else ()))
+        mask = np.isin(frame["id"], np.array(ids, dtype='S16'))
+        if links:
+            mask |= np.fromiter((link in links for link in frame["link"]), dtype=bool, count=len(frame["link"]))
+        # The same item can sit in several snapshots only once, so each row is one post
+        pairs = frame["category"][mask].astype(np.int64) * len(frame["source_names"]) + frame["source"][mask]
+        keys, counts = np.unique(pairs, return_counts=True)
+        result = [(frame["category_names"][key // len(frame["source_names"])],
+                   frame["source_names"][key % len(frame["source_names"])], count)
+                  for key, count in zip(keys.tolist(), counts.tolist())]
+        return sorted(result, key=lambda row: (-row[2], row[0], row[1]))
+
+    def stats(self) -> Dict:
+        partitions = self.partitions()
+        rows = sum(len(self._read(path, ("id",))) for _, path in partitions)
+        return {
+            "partitions": len(partitions),
+            "items": rows,
+            "bytes": sum(os.path.getsize(path) for _, path in partitions),
+            "first_day": partitions[0][0] if partitions else None,
+            "last_day": partitions[-1][0] if partitions else None,
+            "format": self.format,
+        }
+
+
+_ALL_COLUMNS = ("id", "published", "seen") + DICTIONARY_COLUMNS + STRING_COLUMNS
+
+
+def _days_since_epoch(day: str) -> int:
+    return calendar.timegm(time.strptime(day, '%Y-%m-%d')) // _SECONDS_PER_DAY
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Columnar item history: compaction and aggregate queries')
+    parser.add_argument('--dir', default=DEFAULT_HISTORY_DIR)
+    parser.add_argument('--format', choices=sorted(FORMATS), help='File format for rewritten partitions')
+    sub = parser.add_subparsers(dest='command', required=True)
+    compact = sub.add_parser('compact', help='Add new items from aggregated item files')
+    compact.add_argument('paths', nargs='*', help='Item files (default: the ones the dashboard reads)')
+    count = sub.add_parser('count', help='Items per day / category / source')
+    count.add_argument('--by', default='day', help='Comma-separated: day, category, source')
+    count.add_argument('--since')
+    count.add_argument('--until')
+    count.add_argument('--category')
+    count.add_argument('--source')
+    count.add_argument('--top', type=int, help='Only the N biggest groups')
+    sub.add_parser('posted', help='Sources behind posted drafts')
+    sub.add_parser('stats', help='Partitions, items and size on disk')
+    args = parser.parse_args()
+
+    try:
+        history = ItemHistory(args.dir, args.format)
+    except (ImportError, ValueError) as e:
+        print(f"❌ {e}")
+        return
+
+    if args.command == 'compact':
+        started = time.perf_counter()
+        added, partitions = history.compact(args.paths or None)
+        print(f"✅ Added {added} items to {partitions} partitions ({history.format}) "
+              f"in {time.perf_counter() - started:.2f}s")
+
+    elif args.command == 'count':
+        started = time.perf_counter()
+        by = [name.strip() for name in args.by.split(',') if name.strip()]
+        try:
+            rows = history.count(by, args.since, args.until, args.category, args.source)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        elapsed = time.perf_counter() - started
+        if args.top:
+            rows = sorted(rows, key=lambda row: -row[1])[:args.top]
+        print(f"\n📊 Items by {', '.join(by)}:")
+        for labels, total in rows:
+            print(f"   {' / '.join(labels):50} {total:>7}")
+        print(f"   ({sum(total for _, total in rows)} items in {elapsed * 1000:.0f} ms)")
+
+    elif args.command == 'posted':
+        rows = history.posted_sources()
+        if not rows:
+            print("\n⚠️  No posted drafts that link back to an item in the history")
+            return
+        print(f"\n📰 Sources behind posted drafts:")
+        for category, source, posts in rows:
+            print(f"   {category:15} {source:35} {posts:>4} posts")
+
+    elif args.command == 'stats':
+        stats = history.stats()
+        print(f"\n🗄️  {args.dir}: {stats['items']} items in {stats['partitions']} partitions "
+              f"({stats['bytes'] / 1024:.0f} KB, writing {stats['format']})")
+        if stats['partitions']:
+            print(f"   {stats['first_day']} .. {stats['last_day']}")
+
+
+if __name__ == "__main__":
+    main()
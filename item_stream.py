@@ -0,0 +1,234 @@
+"""
+Item Stream
+Streaming NDJSON storage for aggregated news items
+
+One item per line, with its category and source:
+
+    {"category": "blogs", "source": "OpenAI Blog", "title": "...", "link": "...", "summary": "...", "published": "..."}
+
+The aggregators write each feed's items as soon as the feed is parsed, so
+memory stays flat however many items a run collects, and the file is flushed
+after every feed. The run writes to <path>.partial and renames it into
+place only when it finishes cleanly, so an error or Ctrl-C never replaces
+the last complete output. What was written is left in <path>.partial, which
+iter_items() can still read up to the last complete feed.
+
+A path ending in .gz is gzip-compressed (flushed per feed too, so a partial
+file decompresses up to the last complete feed).
+
+Readers iterate lazily and can stop early:
+
+    for item in iter_items('aggregated_content.ndjson'):
+        ...
+
+iter_items() also reads the old {category: {source: [items]}} JSON files, so
+callers don't need to care which format is on disk.
+
+Usage:
+    python item_stream.py head aggregated_content.ndjson -n 5
+    python item_stream.py count aggregated_content.ndjson.gz
+    python item_stream.py convert aggregated_content.json aggregated_content.ndjson
+"""
+
+import gzip
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+
+DEFAULT_STREAM_PATH = 'aggregated_content.ndjson'
+
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _open_read(path: str):
+    """
+    Binary reader; gzip is recognised by its magic bytes, so .partial files work too
+
+    Lines are decoded one at a time by the caller: a torn last line can end
+    inside a multi-byte character, which a text reader would raise on.
+    """
+    with open(path, 'rb') as f:
+        compressed = f.read(2) == GZIP_MAGIC
+    if compressed:
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+
+class FeedItem:
+    """
+    One parsed feed item, as rss_reader passes it from fetch to export
+
+    Slotted, so a run's items cost far less than four-key dicts;
+    to_dict() gives the JSON shape written to the stream. extra holds
+    source-specific fields (arXiv authors, a Reddit post's outbound link, ...
+    see feed_parsers.py), written alongside the common ones.
+    """
+
+    __slots__ = ("title", "link", "summary", "published", "extra")
+
+    def __init__(self, title: str, link: str, summary: str, published: str,
+                 extra: Optional[Dict[str, Any]] = None):
+        self.title = title
+        self.link = link
+        self.summary = summary
+        self.published = published
+        self.extra = extra
+
+    def to_dict(self) -> Dict[str, Any]:
+        fields = {"title": self.title, "link": self.link, "summary": self.summary, "published": self.published}
+        if self.extra:
+            fields.update(self.extra)
+        return fields
+
+    def __repr__(self) -> str:
+        return f"FeedItem({self.title[:40]!r}, {self.link!r})"
+
+
+class ItemStreamWriter:
+    """
+    Writes feeds' items to an NDJSON file as they arrive
+
+        with ItemStreamWriter('aggregated_content.ndjson') as writer:
+            for category, source, items in feeds:
+                writer.write_feed(category, source, items)
+    """
+
+    def __init__(self, path: str = DEFAULT_STREAM_PATH):
+        self.path = path
+        self.partial_path = f"{path}.partial"
+        self.items = 0
+        self.feeds = 0
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if path.endswith('.gz'):
+            self._file = gzip.open(self.partial_path, 'wt', encoding='utf-8', compresslevel=6)
+        else:
+            self._file = open(self.partial_path, 'w', encoding='utf-8')
+
+    def write_feed(self, category: str, source: str, items: List[Union[FeedItem, Dict]]) -> int:
+        """Append one feed's items (FeedItems or dicts) and flush; returns how many were written"""
+        for item in items:
+            fields = item.to_dict() if isinstance(item, FeedItem) else item
+            self._file.write(json.dumps({"category": category, "source": source, **fields},
+                                        ensure_ascii=False) + '\n')
+        # TextIOWrapper.flush() reaches GzipFile.flush(), a zlib sync flush
+        self._file.flush()
+        self.items += len(items)
+        self.feeds += 1
+        return len(items)
+
+    def close(self):
+        """Finish the file and move it into place"""
+        if self._file.closed:
+            return
+        self._file.close()
+        os.replace(self.partial_path, self.path)
+
+    def abort(self):
+        """Close the file but leave it at <path>.partial; the previous output stays in place"""
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # An incomplete run mustn't replace the last complete output
+            self.abort()
+        return False
+
+
+def iter_items(path: str) -> Iterator[Dict]:
+    """
+    Items in a stream file (or a legacy aggregated JSON file), lazily
+
+    A torn last line - a writer killed mid-line, or a file caught while it is
+    being written - is skipped, as is a truncated gzip tail.
+
+    Raises:
+        OSError: the file can't be opened
+    """
+    if path.endswith('.json'):
+        # Old format: the whole document has to be parsed anyway
+        with open(path, 'r', encoding='utf-8') as f:
+            content = json.load(f)
+        for category, sources in content.items():
+            if not isinstance(sources, dict):
+                continue
+            for source, items in sources.items():
+                for item in items or []:
+                    yield {"category": category, "source": source, **item}
+        return
+
+    with _open_read(path) as f:
+        try:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    item = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    # Includes UnicodeDecodeError
+                    continue
+                yield item
+        except EOFError:
+            return
+
+
+def read_grouped(path: str) -> Dict[str, Dict[str, List[Dict]]]:
+    """A stream file in the {category: {source: [items]}} shape (whole file in memory)"""
+    content: Dict[str, Dict[str, List[Dict]]] = {}
+    for item in iter_items(path):
+        category, source = item.pop("category", ""), item.pop("source", "")
+        content.setdefault(category, {}).setdefault(source, []).append(item)
+    return content
+
+
+def main():
+    import argparse
+    import itertools
+
+    parser = argparse.ArgumentParser(description='Inspect and convert aggregated item streams')
+    sub = parser.add_subparsers(dest='command', required=True)
+    head = sub.add_parser('head', help='Print the first items')
+    head.add_argument('path')
+    head.add_argument('-n', type=int, default=10)
+    count = sub.add_parser('count', help='Items per category')
+    count.add_argument('path')
+    convert = sub.add_parser('convert', help='Rewrite a file in another format (.json -> .ndjson[.gz])')
+    convert.add_argument('source')
+    convert.add_argument('target')
+    args = parser.parse_args()
+
+    if args.command == 'head':
+        for item in itertools.islice(iter_items(args.path), args.n):
+            print(f"   [{item.get('category')}] {item.get('source')}: {str(item.get('title'))[:70]}")
+
+    elif args.command == 'count':
+        counts: Dict[str, int] = {}
+        for item in iter_items(args.path):
+            counts[item.get('category')] = counts.get(item.get('category'), 0) + 1
+        for category, total in sorted(counts.items()):
+            print(f"   {category:15} : {total:5} items")
+        print(f"   {'total':15} : {sum(counts.values()):5} items")
+
+    elif args.command == 'convert':
+        if args.target.endswith('.json'):
+            parser.error('convert writes NDJSON; give a .ndjson or .ndjson.gz target')
+        with ItemStreamWriter(args.target) as writer:
+            # Items of one feed are contiguous in every format, so group on the fly
+            for (category, source), items in itertools.groupby(
+                    iter_items(args.source), key=lambda item: (item.get('category'), item.get('source'))):
+                writer.write_feed(category, source, [
+                    {key: value for key, value in item.items() if key not in ('category', 'source')}
+                    for item in items
+                ])
+        print(f"✅ Wrote {writer.items} items from {writer.feeds} feeds to {args.target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Bulk Job Description Ranker
+Scores a folder or JSONL file of job descriptions against your profile
+
+For each posting it extracts skills and requirements (skill_extractor), then
+combines two signals:
+
+    coverage    - share of the posting's key skills you already have
+    similarity  - sparse TF-IDF cosine between the posting and your profile
+
+IDF is computed over the batch itself, so words every posting uses ("team",
+"experience") carry little weight and the distinctive ones dominate. Vectors
+are plain {term_id: weight} dicts; the profile vector is built once and each
+posting is scored by walking only its own terms.
+
+Usage:
+    python jd_ranker.py scraped_jobs.jsonl --top 20
+    python jd_ranker.py job_posts/ --out ranked_jobs.json
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from skill_extractor import SkillExtractor, get_default_extractor
+
+
+DEFAULT_PROFILE_PATH = 'data/your_profile.json'
+
+# How the final 0-100 match score is blended
+DEFAULT_WEIGHTS = {
+    "coverage": 0.55,       # key skills you have / key skills asked for
+    "similarity": 0.30,     # TF-IDF cosine, rescaled so the best posting in the batch is 1.0
+    "nice_to_have": 0.15    # same as coverage, for nice-to-have skills
+}
+
+# Field names accepted in JSON/JSONL postings (first non-empty wins)
+TEXT_FIELDS = ['description', 'job_description', 'text', 'body', 'content']
+TITLE_FIELDS = ['title', 'role', 'position']
+COMPANY_FIELDS = ['company', 'company_name', 'employer']
+
+TEXT_EXTENSIONS = ('.txt', '.md')
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+STOP_WORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can
+could do does doing for from had has have having he her here his how i if in into
+is it its just may me more most must my no not of on or our out over own per so
+some such than that the their them then there these they this those through to too
+under up very was we were what when where which while who whom why will with within
+would you your yours
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens without stop words ('c++' and 'c#' survive)"""
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def _first(row: Dict, fields: List[str]) -> str:
+    for field in fields:
+        value = row.get(field)
+        if value:
+            return str(value)
+    return ''
+
+
+def load_job_descriptions(path: str) -> Iterator[Dict]:
+    """
+    Stream job descriptions from a folder of .txt/.md files, JSONL or a JSON list
+
+    Yields:
+        {"id", "title", "company", "url", "text"} dicts; postings without text are skipped
+    """
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if not name.lower().endswith(TEXT_EXTENSIONS):
+                continue
+            with open(os.path.join(path, name), 'r', encoding='utf-8') as f:
+                text = f.read()
+            if text.strip():
+                title = text.strip().splitlines()[0].strip('# ').strip()
+                yield {"id": name, "title": title, "company": "", "url": "", "text": text}
+        return
+
+    if path.endswith('.jsonl'):
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = (json.loads(line) for line in f if line.strip())
+            yield from _postings_from_rows(rows)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+        if isinstance(rows, dict):
+            rows = rows.get('jobs', [])
+        yield from _postings_from_rows(rows)
+
+
+def _postings_from_rows(rows: Iterable[Dict]) -> Iterator[Dict]:
+    for i, row in enumerate(rows):
+        text = _first(row, TEXT_FIELDS)
+        if not text.strip():
+            continue
+        yield {
+            "id": str(row.get('id') or row.get('url') or i),
+            "title": _first(row, TITLE_FIELDS),
+            "company": _first(row, COMPANY_FIELDS),
+            "url": str(row.get('url') or ''),
+            "text": text
+        }
+
+
+def profile_text(profile: Dict) -> str:
+    """Every string in the profile (skills, project tech and descriptions, certifications)"""
+    parts = []
+
+    def walk(value):
+        if isinstance(value, str):
+            parts.append(value)
+        elif isinstance(value, dict):
+            for item in value.values():
+                walk(item)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item)
+
+    # Contact details would only add noise to the TF-IDF vector
+    walk({key: value for key, value in profile.items() if key != 'basic_info'})
+    return "\n".join(parts)
+
+
+class JobRanker:
+    """
+    Rank job descriptions against one profile
+
+    Build once per profile, then call rank() with any number of postings.
+    """
+
+    def __init__(self, profile: Dict, extractor: Optional[SkillExtractor] = None,
+                 weights: Optional[Dict] = None):
+        unknown = set(weights or {}) - set(DEFAULT_WEIGHTS)
+        if unknown:
+            raise ValueError(f"Unknown ranking weights: {', '.join(sorted(unknown))}")
+
+        self.extractor = extractor or get_default_extractor()
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+
+        text = profile_text(profile)
+        extracted = self.extractor.extract(text)
+        # Everything the profile mentions counts as a skill you have, however it was phrased
+        self.profile_skills = set(extracted["key_skills"]) | set(extracted["nice_to_have"])
+        self.profile_terms = Counter(tokenize(text))
+
+    @classmethod
+    def from_profile_file(cls, path: str = DEFAULT_PROFILE_PATH, **kwargs) -> 'JobRanker':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), **kwargs)
+
+    def rank(self, postings: Iterable[Dict], top: Optional[int] = None) -> List[Dict]:
+        """
+        Score and sort postings, best match first
+
+        Args:
+            postings: Dicts with at least "text" (see load_job_descriptions)
+            top: Keep only the best N
+
+        Returns:
+            List of dicts with id, title, company, url, score (0-100), coverage,
+            nice_to_have_coverage, similarity, matched/missing skills and requirements
+        """
+        vocabulary: Dict[str, int] = {}
+        document_frequency: List[int] = []
+        rows = []
+
+        # Pass 1: extract skills, count terms, collect document frequencies
+        for posting in postings:
+            counts = Counter()
+            for token in tokenize(posting["text"]):
+                term_id = vocabulary.get(token)
+                if term_id is None:
+                    term_id = vocabulary[token] = len(document_frequency)
+                    document_frequency.append(0)
+                counts[term_id] += 1
+            for term_id in counts:
+                document_frequency[term_id] += 1
+            rows.append((posting, counts, self.extractor.extract(posting["text"])))
+
+        if not rows:
+            return []
+
+        # Smoothed IDF, as in scikit-learn: log((1 + n) / (1 + df)) + 1
+        n_docs = len(rows)
+        idf = [math.log((1 + n_docs) / (1 + df)) + 1 for df in document_frequency]
+
+        profile_vector = self._vector(
+            ((vocabulary[token], count) for token, count in self.profile_terms.items() if token in vocabulary),
+            idf
+        )
+
+        # Pass 2: cosine against the profile (only terms both sides share contribute)
+        scored = []
+        for posting, counts, extracted in rows:
+            vector = self._vector(counts.items(), idf)
+            similarity = sum(weight * profile_vector.get(term_id, 0.0) for term_id, weight in vector.items())
+            scored.append((posting, extracted, similarity))
+
+        best_similarity = max(similarity for _, _, similarity in scored) or 1.0
+
+        results = [self._result(posting, extracted, similarity, best_similarity)
+                   for posting, extracted, similarity in scored]
+        results.sort(key=lambda result: result["score"], reverse=True)
+
+        return results[:top] if top else results
+
+    @staticmethod
+    def _vector(term_counts: Iterable[Tuple[int, int]], idf: List[float]) -> Dict[int, float]:
+        """Sublinear TF * IDF, L2-normalised"""
+        vector = {term_id: (1 + math.log(count)) * idf[term_id] for term_id, count in term_counts}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        if norm:
+            for term_id in vector:
+                vector[term_id] /= norm
+        return vector
+
+    def _result(self, posting: Dict, extracted: Dict, similarity: float, best_similarity: float) -> Dict:
+        key_skills = extracted["key_skills"]
+        nice_skills = extracted["nice_to_have"]
+        matched = [skill for skill in key_skills if skill in self.profile_skills]
+        missing = [skill for skill in key_skills if skill not in self.profile_skills]
+        nice_matched = [skill for skill in nice_skills if skill in self.profile_skills]
+
+        # A posting that names no skills gives no evidence either way
+        coverage = len(matched) / len(key_skills) if key_skills else 0.5
+        nice_coverage = len(nice_matched) / len(nice_skills) if nice_skills else 0.0
+
+        score = 100 * (
+            self.weights["coverage"] * coverage
+            + self.weights["similarity"] * similarity / best_similarity
+            + self.weights["nice_to_have"] * nice_coverage
+        )
+
+        return {
+            "id": posting.get("id", ""),
+            "title": posting.get("title", ""),
+            "company": posting.get("company", ""),
+            "url": posting.get("url", ""),
+            "score": round(score, 1),
+            "coverage": round(coverage, 3),
+            "nice_to_have_coverage": round(nice_coverage, 3),
+            "similarity": round(similarity, 4),
+            "matched_skills": matched,
+            "missing_skills": missing,
+            "nice_to_have_matched": nice_matched,
+            "requirements": extracted["requirements"],
+            "company_values": extracted["company_values"]
+        }
+
+
+def main():
+    """Rank a batch of job descriptions from the command line"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Rank job descriptions against your profile')
+    parser.add_argument('source', help='Folder of .txt/.md postings, or a JSON/JSONL file')
+    parser.add_argument('--profile', default=DEFAULT_PROFILE_PATH)
+    parser.add_argument('--top', type=int, default=20, help='How many to print (0 = all)')
+    parser.add_argument('--out', help='Write the full ranking to this JSON file')
+    args = parser.parse_args()
+
+    ranker = JobRanker.from_profile_file(args.profile)
+    ranked = ranker.rank(load_job_descriptions(args.source))
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(ranked, f, indent=2, ensure_ascii=False)
+        print(f"✅ Ranked {len(ranked)} postings into {args.out}")
+
+    print(f"\n🎯 APPLY FIRST ({len(ranked)} postings ranked)")
+    print("=" * 60)
+    for i, result in enumerate(ranked[:args.top or None], 1):
+        label = " @ ".join(part for part in (result["title"], result["company"]) if part) or result["id"]
+        print(f"{i:>3}. [{result['score']:5.1f}] {label[:60]}")
+        if result["missing_skills"]:
+            print(f"       missing: {', '.join(result['missing_skills'])}")
+
+
+if __name__ == "__main__":
+    main()
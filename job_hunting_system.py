@@ -13,6 +13,10 @@ import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 
+from application_tracker import FOLLOW_UP_SCHEDULE
+from mail_merge import MailMerge
+from skill_extractor import get_default_extractor
+
 
 class RecruiterFinder:
     """
@@ -136,6 +140,8 @@ class ColdEmailGenerator:
     
     def __init__(self):
         self.email_templates = self._load_templates()
+        self.mail_merge = MailMerge(self.email_templates)
+        self.skill_extractor = get_default_extractor()
     
     def _load_templates(self) -> Dict:
         """
@@ -285,23 +291,30 @@ Best regards,
             Personalized email ready to send
         """
         
-        template = self.email_templates.get(template_type, "")
-        
-        # Merge and handle missing keys gracefully
-        all_params = {**job_details, **your_profile}
+        # Templates are precompiled; known fields are filled and missing ones
+        # become [Placeholder Title] markers in the same pass
+        return self.mail_merge.render(template_type, job_details, your_profile)
+    
+    def queue_personalized_email(self, outbox, to_addr: str,
+                                 template_type: str,
+                                 job_details: Dict,
+                                 your_profile: Dict,
+                                 default_subject: str = "") -> Optional[int]:
+        """
+        Generate an email and put it in the outbox for delivery
         
-        # Replace placeholders, keep {} for missing keys
-        try:
-            email = template.format(**all_params)
-        except KeyError as e:
-            # If key is missing, replace with placeholder
-            import re
-            email = template
-            for match in re.findall(r'\{([^}]+)\}', template):
-                if match not in all_params:
-                    email = email.replace(f'{{{match}}}', f'[{match.replace("_", " ").title()}]')
+        Args:
+            outbox: email_delivery.EmailQueue
+            to_addr: Recipient address
+            default_subject: Used when the template has no 'Subject:' line
         
-        return email
+        Returns:
+            Outbox message id, or None if this exact email was already queued
+        """
+        email = self.generate_personalized_email(template_type, job_details, your_profile)
+        return outbox.enqueue_email_text(to_addr, email, default_subject,
+                                         meta={"template_type": template_type,
+                                               "company": job_details.get("company", "")})
     
     def analyze_job_description(self, job_description: str) -> Dict:
         """
@@ -314,35 +327,9 @@ Best regards,
             Dict with extracted key points
         """
         
-        # Keywords to look for
-        skills_keywords = [
-            "Python", "TensorFlow", "PyTorch", "Keras", "Scikit-learn",
-            "NLP", "Computer Vision", "Deep Learning", "ML Ops",
-            "AWS", "GCP", "Azure", "Docker", "Kubernetes",
-            "SQL", "NoSQL", "Spark", "Hadoop"
-        ]
-        
-        requirements_keywords = [
-            "Bachelor", "Master", "PhD", "years of experience",
-            "certification", "portfolio", "projects"
-        ]
-        
-        # Extract (simplified - in real implementation, use NLP)
-        extracted = {
-            "key_skills": [],
-            "requirements": [],
-            "nice_to_have": [],
-            "company_values": []
-        }
-        
-        # Simple keyword matching
-        jd_lower = job_description.lower()
-        
-        for skill in skills_keywords:
-            if skill.lower() in jd_lower:
-                extracted["key_skills"].append(skill)
-        
-        return extracted
+        # One pass over the text with the shared taxonomy automaton
+        # (data/skills_taxonomy.json - add synonyms there, not here)
+        return self.skill_extractor.extract(job_description)
     
     def create_email_customization_guide(self) -> str:
         """
@@ -502,16 +489,18 @@ class JobApplicationTracker:
         
         return template
     
-    def calculate_follow_up_dates(self, application_date: str) -> List[str]:
+    def calculate_follow_up_dates(self, application_date: str) -> Dict[str, datetime]:
         """
         Calculate when to follow up
+        
+        For tracked applications these dates are stored and scheduled by
+        application_tracker (python application_tracker.py due).
         """
         base_date = datetime.strptime(application_date, "%Y-%m-%d")
         
         follow_ups = {
-            "first_follow_up": base_date + timedelta(days=7),
-            "second_follow_up": base_date + timedelta(days=14),
-            "final_follow_up": base_date + timedelta(days=21)
+            kind: base_date + timedelta(days=days)
+            for kind, days in FOLLOW_UP_SCHEDULE
         }
         
         return follow_ups
@@ -3,13 +3,14 @@ LinkedIn Post Generator
 Transforms study notes into engaging LinkedIn posts about AI/ML learning
 """
 
-import json
-from datetime import datetime
-from typing import List, Dict
-import os
+from typing import List, Dict, Optional
+
+from draft_store import DraftStore
+from template_engine import TemplateEngine, get_default_engine
 
 class LinkedInPostGenerator:
-    def __init__(self):
+    def __init__(self, template_engine: TemplateEngine = None):
+        self.template_engine = template_engine or get_default_engine()
         self.post_styles = {
             "story": "Share a learning journey with personal insights",
             "tips": "Present key takeaways as actionable tips",
@@ -21,7 +22,8 @@ class LinkedInPostGenerator:
     def generate_post_variations(self, topic: str, key_points: List[str], 
                                  learning_context: str = "") -> Dict[str, str]:
         """
-        Generate 3 different post variations from study notes
+        Generate one post per personal_learning style in data/post_templates.json
+        (story, tips and breakdown by default)
         
         Args:
             topic: Main subject (e.g., "Neural Networks", "Random Forest")
@@ -29,102 +31,35 @@ class LinkedInPostGenerator:
             learning_context: Where you learned it (e.g., "GUVI AI/ML certification")
         """
         
-        posts = {}
-        
-        # Style 1: Personal Learning Story
-        posts["story"] = self._generate_story_post(topic, key_points, learning_context)
-        
-        # Style 2: Quick Tips Format
-        posts["tips"] = self._generate_tips_post(topic, key_points)
-        
-        # Style 3: Concept Breakdown
-        posts["breakdown"] = self._generate_breakdown_post(topic, key_points)
-        
-        return posts
-    
-    def _generate_story_post(self, topic: str, key_points: List[str], 
-                            learning_context: str) -> str:
-        """Generate a personal learning journey post"""
-        
-        context_line = f"while working through my {learning_context}" if learning_context else "in my AI/ML journey"
-        
-        post = f"""Just had a breakthrough moment with {topic} {context_line}! 🚀
-
-Here's what clicked for me:
-
-{self._format_points(key_points)}
-
-The real 'aha!' moment was understanding how all these pieces connect. It's amazing how {topic.lower()} bridges theory and practical implementation.
-
-What's been your biggest learning moment recently in AI/ML?
-
-#MachineLearning #AI #DataScience #Learning #TechCareer"""
-        
-        return post
-    
-    def _generate_tips_post(self, topic: str, key_points: List[str]) -> str:
-        """Generate a tips/takeaways format post"""
-        
-        post = f"""📚 Key insights from studying {topic}:
-
-{self._format_points(key_points, numbered=True)}
-
-These fundamentals are crucial for anyone diving into AI/ML. Save this for later reference!
-
-What would you add to this list?
-
-#ArtificialIntelligence #MachineLearning #DataScience #TechTips #AIMLCommunity"""
+        values = {
+            "topic": topic,
+            "key_points": key_points,
+            "learning_context": learning_context
+        }
         
-        return post
+        return {
+            style: self.template_engine.render("personal_learning", style, **values)
+            for style in self.template_engine.styles("personal_learning")
+        }
     
-    def _generate_breakdown_post(self, topic: str, key_points: List[str]) -> str:
-        """Generate a concept explanation post"""
-        
-        post = f"""🧠 Breaking down {topic} - simplified:
-
-Think of it this way: {key_points[0] if key_points else 'complex concepts become simple with the right mental model'}
-
-Key components:
-{self._format_points(key_points[1:] if len(key_points) > 1 else key_points)}
-
-The beauty of {topic} is how it transforms raw data into actionable insights. That's the power of modern AI/ML.
-
-Questions? Drop them in the comments - happy to discuss!
-
-#MachineLearning #AI #TechExplained #DataScience #LearningInPublic"""
-        
-        return post
-    
-    def _format_points(self, points: List[str], numbered: bool = False) -> str:
-        """Format bullet points for LinkedIn"""
-        formatted = []
-        for i, point in enumerate(points, 1):
-            if numbered:
-                formatted.append(f"{i}. {point}")
-            else:
-                formatted.append(f"→ {point}")
-        return "\n".join(formatted)
-    
-    def save_posts(self, posts: Dict[str, str], topic: str, output_dir: str = "generated_posts"):
-        """Save generated posts to files"""
-        os.makedirs(output_dir, exist_ok=True)
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{output_dir}/linkedin_posts_{topic.replace(' ', '_')}_{timestamp}.txt"
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(f"=== LinkedIn Posts for: {topic} ===\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            
-            for style, content in posts.items():
-                f.write(f"\n{'='*60}\n")
-                f.write(f"STYLE: {style.upper()}\n")
-                f.write(f"{'='*60}\n\n")
-                f.write(content)
-                f.write(f"\n\n{'='*60}\n")
+    def save_posts(self, posts: Dict[str, str], topic: str, store: Optional[DraftStore] = None) -> List[str]:
+        """
+        Save generated posts as drafts, one per style
         
-        print(f"✅ Posts saved to: {filename}")
-        return filename
+        Returns:
+            Draft ids (open them with: python draft_store.py show <id>)
+        """
+        drafts = store or DraftStore()
+        draft_ids = [
+            drafts.save(content, topic=topic, style=style, content_type="personal_learning",
+                        source="linkedin_post_generator")["id"]
+            for style, content in posts.items()
+        ]
+        if store is None:
+            drafts.close()
+        
+        print(f"✅ Saved {len(draft_ids)} drafts for '{topic}': {', '.join(draft_ids)}")
+        return draft_ids
     
     def create_posting_schedule(self, topics: List[str], posts_per_week: int = 3) -> List[Dict]:
         """Create a content calendar"""
@@ -173,7 +108,7 @@ def main():
         print("\n" + "-"*70)
     
     # Save to file
-    saved_file = generator.save_posts(posts1, topic1)
+    draft_ids = generator.save_posts(posts1, topic1)
     
     # Example 2: Quick demonstration with another topic
     print("\n\n" + "="*70)
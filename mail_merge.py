@@ -0,0 +1,190 @@
+"""
+Mail-Merge Engine for Cold Emails
+Precompiles email templates once, then renders each recipient in a single pass
+
+Known fields are substituted, unknown ones become readable markers such as
+[Specific Company Initiative] so you can see exactly what still needs a human
+touch. The bulk API streams recipient rows from CSV or JSONL and writes merged
+emails as JSONL, so memory stays flat no matter how many rows there are.
+
+Usage:
+    python mail_merge.py cold_email_with_job recipients.csv --out merged.jsonl
+"""
+
+import csv
+import json
+from collections import ChainMap
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from template_engine import CompiledTemplate
+
+
+def placeholder_marker(field: str) -> str:
+    """Marker shown for a field with no value: specific_result -> [Specific Result]"""
+    return f'[{field.replace("_", " ").title()}]'
+
+
+def flatten_profile(profile: Dict) -> Dict:
+    """
+    Lift nested sections of data/your_profile.json to top-level fields
+    (basic_info.your_name -> your_name); top-level keys win on conflicts
+    """
+    flat = {}
+    for value in profile.values():
+        if isinstance(value, dict):
+            flat.update({k: v for k, v in value.items() if not isinstance(v, (dict, list))})
+    flat.update({k: v for k, v in profile.items() if not isinstance(v, (dict, list))})
+    return flat
+
+
+class MergeTemplate:
+    """One email template compiled into a placeholder plan"""
+
+    __slots__ = ('name', 'compiled', 'markers')
+
+    def __init__(self, name: str, source: str):
+        self.name = name
+        self.compiled = CompiledTemplate(name, source)
+        # Markers are precomputed so rendering never re-formats field names
+        self.markers = {field: placeholder_marker(field) for field in self.compiled.fields}
+
+    @property
+    def fields(self) -> List[str]:
+        return self.compiled.fields
+
+    def render(self, values) -> str:
+        return self.compiled.render(values, self.markers.__getitem__)
+
+    def missing_fields(self, values) -> List[str]:
+        """Fields that would be rendered as [Placeholder] markers"""
+        return [field for field in self.compiled.fields if field not in values]
+
+
+class MailMerge:
+    """
+    Registry of compiled email templates with single and bulk rendering
+    """
+
+    def __init__(self, templates: Dict[str, str]):
+        self.templates = {name: MergeTemplate(name, source) for name, source in templates.items()}
+
+    @classmethod
+    def from_json(cls, path: str = 'data/email_templates.json') -> 'MailMerge':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def get(self, template_type: str) -> Optional[MergeTemplate]:
+        return self.templates.get(template_type)
+
+    def render(self, template_type: str, job_details: Dict, your_profile: Dict) -> str:
+        """
+        Render one email; your_profile values take precedence over job_details
+        (same as the old {**job_details, **your_profile} merge, without copying)
+
+        Returns:
+            Rendered email, or "" for an unknown template type
+        """
+        template = self.templates.get(template_type)
+        if template is None:
+            return ""
+        return template.render(ChainMap(your_profile, job_details))
+
+    def render_rows(self, template_type: str, rows: Iterable[Dict],
+                    your_profile: Optional[Dict] = None) -> Iterator[Tuple[Dict, str]]:
+        """
+        Lazily render one email per recipient row
+
+        Blank cells count as missing, so they show up as [Placeholder] markers.
+
+        Yields:
+            (row, email) pairs
+        """
+        template = self.templates.get(template_type)
+        if template is None:
+            raise KeyError(f"Unknown email template: {template_type}")
+
+        profile = your_profile or {}
+        render = template.render
+        for row in rows:
+            yield row, render(_row_values(profile, row))
+
+    def merge_file(self, template_type: str, recipients_path: str, output_path: str,
+                   your_profile: Optional[Dict] = None) -> int:
+        """
+        Stream recipients from CSV/JSONL into a JSONL file of merged emails
+
+        Each output line is {"recipient": row, "email": text, "missing": [fields]}.
+
+        Returns:
+            Number of emails written
+        """
+        template = self.templates.get(template_type)
+        if template is None:
+            raise KeyError(f"Unknown email template: {template_type}")
+
+        profile = your_profile or {}
+        count = 0
+        with open(output_path, 'w', encoding='utf-8') as out:
+            for row in iter_recipients(recipients_path):
+                values = _row_values(profile, row)
+                out.write(json.dumps({
+                    "recipient": row,
+                    "email": template.render(values),
+                    "missing": template.missing_fields(values)
+                }, ensure_ascii=False))
+                out.write('\n')
+                count += 1
+
+        return count
+
+
+def _row_values(profile: Dict, row: Dict) -> ChainMap:
+    """Profile over recipient row, ignoring blank cells"""
+    return ChainMap(profile, {key: value for key, value in row.items() if value not in (None, '')})
+
+
+def iter_recipients(path: str) -> Iterator[Dict]:
+    """
+    Stream recipient rows from CSV or JSONL one at a time
+
+    A plain JSON array is also accepted, but it has to be loaded whole -
+    prefer CSV or JSONL for large lists.
+    """
+    if path.endswith('.csv'):
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            yield from csv.DictReader(f)
+    elif path.endswith('.jsonl'):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+
+
+def main():
+    """Command-line bulk merge"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Merge recipient rows into email templates')
+    parser.add_argument('template', help='Template name, e.g. cold_email_with_job')
+    parser.add_argument('recipients', help='CSV or JSONL of recipient fields')
+    parser.add_argument('--templates', default='data/email_templates.json')
+    parser.add_argument('--profile', default='data/your_profile.json')
+    parser.add_argument('--out', default='merged_emails.jsonl')
+    args = parser.parse_args()
+
+    merge = MailMerge.from_json(args.templates)
+    try:
+        with open(args.profile, 'r', encoding='utf-8') as f:
+            profile = flatten_profile(json.load(f))
+    except FileNotFoundError:
+        profile = {}
+
+    count = merge.merge_file(args.template, args.recipients, args.out, profile)
+    print(f"✅ Merged {count} emails into {args.out}")
+
+
+if __name__ == "__main__":
+    main()
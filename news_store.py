@@ -0,0 +1,291 @@
+"""
+News Item Store
+In-memory index over aggregated feed items for the dashboard and its API
+
+Reads the item streams written by rss_reader.py and run_daily.py (NDJSON, see
+item_stream.py - older {category: {source: [items]}} JSON files too), merges
+them into one newest-first list and keeps small indexes by category and
+source. Every item gets a stable id (hash of its link, or of its title when
+there is no link), so the dashboard can refer to it.
+
+The files are re-read only when their modification time or size changes;
+`etag` is derived from those, so the API's ETags survive a server restart
+and change whenever the content does. Listeners registered with
+add_listener() are told which items are new after every reload, whichever
+thread triggered it - that is what feeds the dashboard's live stream.
+"""
+
+import hashlib
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from item_stream import iter_items
+
+
+DEFAULT_CONTENT_PATHS = ('data/aggregated_content.ndjson', 'aggregated_content.ndjson',
+                         'aggregated_content.ndjson.gz', 'data/aggregated_content.json',
+                         'aggregated_content.json')
+
+# rss_reader fills empty summaries with this; the API hands out '' instead
+PLACEHOLDER_SUMMARY = 'No summary available'
+
+# Fields every item has; anything else in a stream line is source-specific
+ITEM_FIELDS = ("id", "category", "source", "title", "link", "summary", "published", "published_at")
+
+
+def item_id(item: Dict) -> str:
+    key = item.get('link') or item.get('title') or ''
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def normalize_published(value: str) -> str:
+    """
+    RSS (RFC 822) or Atom (ISO 8601) date -> UTC 'YYYY-MM-DDTHH:MM:SSZ'
+
+    Feeds mix both formats, so this is what items are sorted and filtered on.
+    Unparseable dates ('Unknown') become '' and sort last.
+    """
+    if not value:
+        return ''
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return ''
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class NewsItem:
+    """
+    One item as the store holds it
+
+    A slotted object is under half the size of the equivalent dict, and
+    category and source names are interned, so the thousands of items from
+    one feed share a single copy. to_dict() gives the API's JSON shape,
+    including any source-specific fields the feed parser added (extra).
+    """
+
+    __slots__ = ("id", "category", "source", "title", "link", "summary", "published", "published_at", "extra")
+
+    def __init__(self, id: str, category: str, source: str, title: str, link: str,
+                 summary: str, published: str, published_at: str, extra: Optional[Dict] = None):
+        self.id = id
+        self.category = sys.intern(category)
+        self.source = sys.intern(source)
+        self.title = title
+        self.link = link
+        self.summary = summary
+        self.published = published
+        self.published_at = published_at
+        self.extra = extra
+
+    def to_dict(self) -> Dict:
+        fields = {name: getattr(self, name) for name in ITEM_FIELDS}
+        if self.extra:
+            fields.update(self.extra)
+        return fields
+
+    def __repr__(self) -> str:
+        return f"NewsItem({self.id!r}, {self.source!r}, {self.title[:40]!r})"
+
+
+def store_item(category: str, source: str, item: Dict) -> NewsItem:
+    """A stored item from an aggregated item dict"""
+    summary = item.get('summary') or ''
+    published = item.get('published') or ''
+    extra = {key: value for key, value in item.items() if key not in ITEM_FIELDS}
+    return NewsItem(item_id(item), category, source, item.get('title') or '', item.get('link') or '',
+                    '' if summary == PLACEHOLDER_SUMMARY else summary, published,
+                    normalize_published(published), extra or None)
+
+
+def flatten_aggregated(content: Dict) -> Iterable[NewsItem]:
+    """Yield one item per entry with category and source attached"""
+    for category, sources in content.items():
+        if not isinstance(sources, dict):
+            continue
+        for source, items in sources.items():
+            for item in items or []:
+                yield store_item(category, source, item)
+
+
+class NewsItemStore:
+    """
+    Newest-first item list with category/source indexes
+
+    Thread-safe for the many-readers case: a reload builds new structures and
+    swaps them in under a lock, readers take a consistent snapshot.
+    """
+
+    def __init__(self, paths: Iterable[str] = DEFAULT_CONTENT_PATHS):
+        self.paths = list(paths)
+        self.version = 0
+        self._lock = threading.Lock()
+        self._mtimes: Tuple = ()
+        self._by_path: Dict[str, Dict[str, NewsItem]] = {}
+        self._items: List[NewsItem] = []
+        self._by_id: Dict[str, NewsItem] = {}
+        self._by_category: Dict[str, List[int]] = {}
+        self._by_source: Dict[str, List[int]] = {}
+        self._search_text: List[str] = []
+        self._listeners: List[Callable[[List[Dict]], None]] = []
+        self.refresh()
+
+    def add_listener(self, callback: Callable[[List[Dict]], None]):
+        """
+        Call callback(new_items) after each reload that added items
+
+        new_items is newest-first. The first load is not reported - everything
+        would be "new" - so listeners only ever see deltas.
+        """
+        self._listeners.append(callback)
+
+    def _current_mtimes(self) -> Tuple:
+        mtimes = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                mtimes.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    @property
+    def etag(self) -> str:
+        """Short tag for the loaded files' mtimes and sizes, stable across processes"""
+        return hashlib.sha1(repr(self._mtimes).encode('utf-8')).hexdigest()[:16]
+
+    def refresh(self) -> bool:
+        """
+        Reload if any content file changed on disk
+
+        Returns:
+            True if the store was reloaded
+        """
+        mtimes = self._current_mtimes()
+        if mtimes == self._mtimes:
+            return False
+
+        with self._lock:
+            if mtimes == self._mtimes:
+                return False
+            first_load = self.version == 0
+            previous = self._by_id
+            self._load(mtimes)
+            added = [] if first_load else [item.to_dict() for item in self._items if item.id not in previous]
+
+        if added:
+            for callback in self._listeners:
+                callback(added)
+        return True
+
+    def _load(self, mtimes: Tuple):
+        by_path = {}
+        for path in self.paths:
+            items = {}
+            try:
+                for item in iter_items(path):
+                    item = store_item(item.get('category') or '', item.get('source') or '', item)
+                    items.setdefault(item.id, item)
+            except OSError:
+                continue
+            except ValueError:
+                # Caught mid-write, or corrupt: serve what it held last time, if
+                # anything, and leave it out otherwise - the other files still load
+                items = self._by_path.get(path, {})
+            by_path[path] = items
+
+        by_id = {}
+        # Earlier paths win on duplicates (data/ is what run_daily keeps fresh)
+        for items in by_path.values():
+            for item_id, item in items.items():
+                by_id.setdefault(item_id, item)
+
+        self._by_path = by_path
+        self._index(sorted(by_id.values(), key=lambda item: item.published_at, reverse=True))
+        self._mtimes = mtimes
+
+    def _index(self, items: List[NewsItem]):
+        by_category, by_source = {}, {}
+        for position, item in enumerate(items):
+            by_category.setdefault(item.category, []).append(position)
+            by_source.setdefault(item.source, []).append(position)
+
+        self._items = items
+        self._by_id = {item.id: item for item in items}
+        self._by_category = by_category
+        self._by_source = by_source
+        self._search_text = [f"{item.title}\n{item.summary}".lower() for item in items]
+        self.version += 1
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, item_id: str) -> Optional[Dict]:
+        item = self._by_id.get(item_id)
+        return item.to_dict() if item is not None else None
+
+    def sources(self) -> Dict[str, Dict[str, int]]:
+        """{category: {source: item count}}"""
+        items = self._items
+        summary = {}
+        for category, positions in self._by_category.items():
+            counts = summary.setdefault(category, {})
+            for position in positions:
+                source = items[position].source
+                counts[source] = counts.get(source, 0) + 1
+        return summary
+
+    def query(self, category: Optional[str] = None, source: Optional[str] = None,
+              q: Optional[str] = None, since: Optional[str] = None,
+              offset: int = 0, limit: int = 20) -> Tuple[List[Dict], int]:
+        """
+        Filter newest-first and return one page
+
+        Args:
+            category / source: exact match (served from the indexes)
+            q: case-insensitive substring of title or summary
+            since: UTC timestamp (YYYY-MM-DDTHH:MM:SSZ, or a prefix such as a date);
+                   only items published at or after it
+
+        Returns:
+            (items on this page, total matching items)
+        """
+        with self._lock:
+            items, search_text = self._items, self._search_text
+            by_category, by_source = self._by_category, self._by_source
+
+        # Start from the smallest index that applies, then narrow
+        if category is not None and source is not None:
+            positions = sorted(set(by_category.get(category, ())) & set(by_source.get(source, ())))
+        elif category is not None:
+            positions = by_category.get(category, [])
+        elif source is not None:
+            positions = by_source.get(source, [])
+        else:
+            positions = range(len(items))
+
+        if since:
+            # Positions are newest-first, so stop at the first older item
+            cut = len(positions)
+            for i, position in enumerate(positions):
+                if items[position].published_at < since:
+                    cut = i
+                    break
+            positions = positions[:cut]
+
+        if q:
+            needle = q.lower()
+            positions = [position for position in positions if needle in search_text[position]]
+
+        # Dicts only for the page that leaves the store
+        page = [items[position].to_dict() for position in positions[offset:offset + limit]]
+        return page, len(positions)
@@ -1,172 +1,328 @@
 """
 Improved RSS Feed Reader with Better Summary Extraction
 Handles multiple RSS formats and extracts summaries properly
+
+Usage:
+    python rss_reader.py                      # -> aggregated_content.ndjson
+    python rss_reader.py --output data/aggregated_content.ndjson.gz
+    python rss_reader.py --trace trace.json   # per-stage timings + Chrome trace
+    python rss_reader.py --metrics ""         # don't update data/metrics/rss_reader.prom
+    python rss_reader.py --health ""          # fetch every source, even quarantined ones
+    python rss_reader.py --no-discover        # don't look for feeds on HTML pages
+    python rss_reader.py --processes 4        # parse on 4 processes, download 16 feeds at a time
 """
 
 import requests
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 import json
-from typing import List, Dict
-import html
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
 
-def clean_html(text: str) -> str:
-    """Remove HTML tags and decode entities"""
-    if not text:
-        return ""
-    
-    # Decode HTML entities
-    text = html.unescape(text)
-    
-    # Remove HTML tags (simple approach)
-    import re
-    text = re.sub(r'<[^>]+>', '', text)
+import feed_metrics
+from feed_discovery import FeedResolver
+from feed_health import DEFAULT_HEALTH_PATH, FeedHealth
+from feed_parsers import NO_SUMMARY, PARSERS, clean_html, parser_name
+from item_stream import DEFAULT_STREAM_PATH, FeedItem, ItemStreamWriter
+from tracing import tracer
+
+def enable_tracing():
+    """
+    Record pipeline spans (see tracing.py), including DNS + TCP connect time
     
-    # Clean up whitespace
-    text = ' '.join(text.split())
+    requests doesn't expose connection setup, so urllib3's create_connection
+    is wrapped - only once tracing is asked for.
+    """
+    from urllib3.util import connection
     
-    return text[:300]  # Limit to 300 chars
+    if not getattr(connection.create_connection, 'traced', False):
+        original = connection.create_connection
+        
+        def create_connection(address, *args, **kwargs):
+            with tracer.span("connect", host=address[0]):
+                return original(address, *args, **kwargs)
+        
+        create_connection.traced = True
+        connection.create_connection = create_connection
+    tracer.enable()
+
+# While a download thread fetches, its status messages are collected here and
+# printed with the feed's line (see iter_feeds with a pipeline)
+_status_buffer = threading.local()
 
-def fetch_feed(url: str, hours_back: int = 24) -> List[Dict]:
+def _status(message: str, end: str = '\n'):
+    lines = getattr(_status_buffer, 'lines', None)
+    if lines is None:
+        print(message, end=end)
+    else:
+        lines.append(message + end)
+
+def fetch_feed(url: str, hours_back: int = 24, source: Optional[str] = None,
+               health: Optional[FeedHealth] = None, resolver: Optional[FeedResolver] = None,
+               parser: Optional[str] = None, pipeline=None) -> List[FeedItem]:
     """
     Fetch and parse RSS feed with improved summary extraction
+    
+    Items are extracted by the parser registered for the feed's host, or the
+    one named by parser (see feed_parsers.py). Every call is counted in feed_metrics (outcome class, bytes, items,
+    latency), labelled with source (default: the URL's host), and its outcome
+    is reported to health when given. With a resolver, a URL that serves an
+    HTML page is searched for the feed it advertises, which is then fetched
+    instead. With a pipeline (feed_pipeline.FeedPipeline), the body is spooled
+    and parsed on its process pool rather than in this thread.
     """
+    with tracer.span("fetch_feed", url=url):
+        return _fetch_feed(url, hours_back, source, health, resolver, parser, pipeline)
+
+def _fetch_feed(url: str, hours_back: int, source: Optional[str], health: Optional[FeedHealth],
+                resolver: Optional[FeedResolver], parser: Optional[str], pipeline) -> List[FeedItem]:
+    started = time.perf_counter()
+    outcome, size, items = "error", 0, []
     try:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         
-        response = requests.get(url, timeout=15, headers=headers)
-        response.raise_for_status()
-        
-        # Parse XML
-        root = ET.fromstring(response.content)
-        
-        items = []
-        
-        # Try RSS 2.0 format first
-        for item in root.findall('.//item')[:10]:
-            title_elem = item.find('title')
-            link_elem = item.find('link')
-            
-            # Try multiple summary fields
-            summary = ""
-            for field in ['description', 'summary', 'content:encoded', '{http://purl.org/rss/1.0/modules/content/}encoded']:
-                summary_elem = item.find(field)
-                if summary_elem is not None and summary_elem.text:
-                    summary = clean_html(summary_elem.text)
-                    break
-            
-            # If still no summary, try text content of description
-            if not summary:
-                desc_elem = item.find('description')
-                if desc_elem is not None:
-                    summary = clean_html(desc_elem.text or "")
-            
-            pub_date_elem = item.find('pubDate')
-            
-            if title_elem is not None and link_elem is not None:
-                items.append({
-                    'title': clean_html(title_elem.text or 'No title'),
-                    'link': link_elem.text or '',
-                    'summary': summary or 'No summary available',
-                    'published': pub_date_elem.text if pub_date_elem is not None else 'Unknown'
-                })
-        
-        # Try Atom format if no items found
-        if not items:
-            atom_ns = '{http://www.w3.org/2005/Atom}'
-            for entry in root.findall(f'.//{atom_ns}entry')[:10]:
-                title_elem = entry.find(f'{atom_ns}title')
-                link_elem = entry.find(f'{atom_ns}link')
-                
-                # Try multiple summary fields for Atom
-                summary = ""
-                for field in [f'{atom_ns}summary', f'{atom_ns}content']:
-                    summary_elem = entry.find(field)
-                    if summary_elem is not None and summary_elem.text:
-                        summary = clean_html(summary_elem.text)
-                        break
-                
-                updated_elem = entry.find(f'{atom_ns}updated')
-                
-                if title_elem is not None:
-                    link_href = link_elem.get('href') if link_elem is not None else ''
-                    items.append({
-                        'title': clean_html(title_elem.text or 'No title'),
-                        'link': link_href,
-                        'summary': summary or 'No summary available',
-                        'published': updated_elem.text if updated_elem is not None else 'Unknown'
-                    })
+        # stream=True returns once headers are in, so the body download is timed separately
+        with tracer.span("request"):
+            response = requests.get(url, timeout=15, headers=headers, stream=True)
+            response.raise_for_status()
+        if 'html' in response.headers.get('Content-Type', ''):
+            # A web page where the feed should be (e.g. a YouTube channel URL)
+            outcome = "not_a_feed"
+            if resolver is not None:
+                with tracer.span("discover"):
+                    feed_url = resolver.discover(url, response.content, base_url=response.url)
+                if feed_url:
+                    outcome = "discovered"
+                    _status(f"🔎 ", end='')
+                    return _fetch_feed(feed_url, hours_back, source, health, None, parser, pipeline)
+            response.close()
+            _status(f"⚠️  HTML page, not a feed")
+            return []
+        with tracer.span("download"):
+            body = response.content if pipeline is None else pipeline.read(response)
+            size = len(body)
         
-        return items[:10]
+        if pipeline is None:
+            items = parse_body(body, url, parser)
+        else:
+            items = pipeline.parse(body, url, parser)
+        outcome = "ok"
+        return items
         
     except requests.exceptions.Timeout:
-        print(f"⏱️  Timeout")
+        outcome = "timeout"
+        _status(f"⏱️  Timeout")
         return []
     except requests.exceptions.HTTPError as e:
-        if '429' in str(e):
-            print(f"⏸️  Rate limited")
-        elif '404' in str(e):
-            print(f"❌ 404")
+        status = e.response.status_code if e.response is not None else 0
+        outcome = "http_429" if status == 429 else "http_5xx" if status >= 500 else "http_4xx"
+        if status == 429:
+            _status(f"⏸️  Rate limited")
+        elif status == 404:
+            _status(f"❌ 404")
         else:
-            print(f"❌ HTTP {e}")
+            _status(f"❌ HTTP {e}")
+        return []
+    except requests.exceptions.ConnectionError as e:
+        outcome = "connection_error"
+        _status(f"🔌 {str(e)[:60]}")
+        return []
+    except ET.ParseError as e:
+        outcome = "parse_error"
+        _status(f"⚠️  Not valid XML ({e})")
         return []
     except Exception as e:
-        print(f"⚠️  {str(e)[:30]}")
+        _status(f"⚠️  {type(e).__name__}: {str(e)[:60]}")
         return []
+    finally:
+        feed_metrics.record_fetch(url, source, outcome, time.perf_counter() - started, size, len(items))
+        if health is not None:
+            health.record(url, outcome, source)
+
+def parse_body(body: bytes, url: str, parser: Optional[str] = None) -> List[FeedItem]:
+    """Items from a feed body, by the parser for url or the named one (see feed_parsers.py)"""
+    with tracer.span("parse", bytes=len(body)):
+        root = ET.fromstring(body)
+    
+    name = parser_name(url, parser)
+    with tracer.span("extract", parser=name):
+        return PARSERS[name](root)
 
-def aggregate_all_feeds(sources_json: str = 'content_sources.json', hours_back: int = 24) -> Dict:
+def aggregate_all_feeds(sources_json: str = 'content_sources.json', hours_back: int = 24,
+                        health: Optional[FeedHealth] = None,
+                        resolver: Optional[FeedResolver] = None) -> Dict[str, Dict[str, List[Dict]]]:
     """
     Aggregate content from all configured sources with better error handling
+    
+    Returns {category: {source: [item dicts]}}, the shape written to
+    aggregated_content.json. Holds every item in memory; main() streams them
+    to disk with iter_feeds instead.
     """
+    with tracer.span("aggregate_all_feeds", sources_json=sources_json):
+        all_content = {}
+        for category, name, items in iter_feeds(sources_json, hours_back, health, resolver):
+            all_content.setdefault(category, {})[name] = [item.to_dict() for item in items]
+        return all_content
+
+def iter_feeds(sources_json: str = 'content_sources.json', hours_back: int = 24,
+               health: Optional[FeedHealth] = None, resolver: Optional[FeedResolver] = None,
+               pipeline=None) -> Iterator[Tuple[str, str, List[FeedItem]]]:
+    """
+    Fetch the configured sources one by one, yielding (category, name, items)
     
+    With a pipeline (feed_pipeline.FeedPipeline), sources are fetched
+    concurrently and parsed on its process pool instead, and yielded as they
+    finish. With health, quarantined sources are skipped (their items come back
+    empty) until their next probe is due, and the state is saved afterwards.
+    With a resolver, feeds discovered on HTML pages are written back to
+    sources_json, so the next run fetches them directly. Both happen even if
+    the run is interrupted.
+    """
     try:
-        with open(sources_json, 'r', encoding='utf-8') as f:
+        with tracer.span("load_sources"), open(sources_json, 'r', encoding='utf-8') as f:
             sources = json.load(f)
     except FileNotFoundError:
         print(f"❌ Error: {sources_json} not found!")
         print("   Run 'python setup.py' first")
-        return {}
+        return
     
-    all_content = {}
+    started = time.time()
     total_items = 0
     total_with_summaries = 0
+    failed_sources = 0
+    skipped_sources = 0
     
     print("\n📡 Fetching RSS feeds with summaries...\n")
     
-    for source in sources:
-        category = source['category']
-        name = source['name']
-        url = source['url']
-        
-        print(f"  {name:30} ", end='')
-        items = fetch_feed(url, hours_back)
-        
-        if items:
-            # Count items with actual summaries
-            with_summaries = sum(1 for item in items if item['summary'] != 'No summary available')
-            print(f"✅ ({len(items)} items, {with_summaries} with summaries)")
-            total_items += len(items)
-            total_with_summaries += with_summaries
-        else:
-            print("")
-        
-        if category not in all_content:
-            all_content[category] = {}
+    def fetch(source: Dict) -> List[FeedItem]:
+        with tracer.span("feed", source=source['name'], category=source['category']):
+            return fetch_feed(source['url'], hours_back, source=source['name'], health=health,
+                              resolver=resolver, parser=source.get('parser'), pipeline=pipeline)
+    
+    try:
+        for source, items in _fetch_sources(sources, fetch, health, pipeline):
+            category = source['category']
+            name = source['name']
+            
+            if items is None:
+                skipped_sources += 1
+                print(f"🚫 quarantined until {health.sources[source['url']]['retry_at']}")
+                yield category, name, []
+                continue
+            
+            if items:
+                # Count items with actual summaries
+                with_summaries = sum(1 for item in items if item.summary != NO_SUMMARY)
+                print(f"✅ ({len(items)} items, {with_summaries} with summaries)")
+                total_items += len(items)
+                total_with_summaries += with_summaries
+            else:
+                failed_sources += 1
+                print("")
+            
+            yield category, name, items
         
-        all_content[category][name] = items
+        print(f"\n📊 Results:")
+        print(f"   Total items: {total_items}")
+        print(f"   With summaries: {total_with_summaries}")
+        print(f"   Without summaries: {total_items - total_with_summaries}")
+        if skipped_sources:
+            print(f"   Skipped (quarantined): {skipped_sources} - see: python feed_health.py report")
+    finally:
+        if resolver is not None and resolver.resolved:
+            try:
+                changed = resolver.update_registry(sources_json)
+                print(f"   Discovered feeds: {changed} - {sources_json} now points at them")
+            except (OSError, ValueError) as e:
+                print(f"   ⚠️  Couldn't update {sources_json}: {e}")
+        if health is not None:
+            health.save()
+        feed_metrics.record_run(started, failed_sources, len(health.quarantined()) if health is not None else 0)
+
+def _fetch_sources(sources: List[Dict], fetch, health: Optional[FeedHealth],
+                   pipeline) -> Iterator[Tuple[Dict, Optional[List[FeedItem]]]]:
+    """
+    (source, items) per source - items None while it is quarantined - with
+    the start of its line printed
     
-    print(f"\n📊 Results:")
-    print(f"   Total items: {total_items}")
-    print(f"   With summaries: {total_with_summaries}")
-    print(f"   Without summaries: {total_items - total_with_summaries}")
+    In registry order without a pipeline; otherwise in the order the fetches
+    finish on the pipeline's download threads, each with its status messages.
+    """
+    if pipeline is None:
+        for source in sources:
+            print(f"  {source['name']:30} ", end='')
+            allowed = health is None or health.allow(source['url'])
+            yield source, fetch(source) if allowed else None
+        return
+    
+    def fetch_quietly(source: Dict) -> Tuple[List[FeedItem], str]:
+        _status_buffer.lines = []
+        try:
+            return fetch(source), ''.join(_status_buffer.lines)
+        finally:
+            _status_buffer.lines = None
     
-    return all_content
+    allowed = []
+    for source in sources:
+        if health is None or health.allow(source['url']):
+            allowed.append(source)
+        else:
+            print(f"  {source['name']:30} ", end='')
+            yield source, None
+    for source, (items, status) in pipeline.map(fetch_quietly, allowed):
+        print(f"  {source['name']:30} {status}", end='')
+        yield source, items
 
 def main():
     """Main function"""
+    import argparse
+    import os
+    
+    parser = argparse.ArgumentParser(description='Aggregate RSS/Atom feeds into aggregated_content.ndjson')
+    parser.add_argument('--output', default=os.environ.get('RSS_OUTPUT', DEFAULT_STREAM_PATH),
+                        help='Items file, one JSON item per line (.gz to compress)')
+    parser.add_argument('--trace', default=os.environ.get('RSS_TRACE'),
+                        help='Time each pipeline stage; write a Chrome trace (JSON) here')
+    parser.add_argument('--metrics', default=os.environ.get('RSS_METRICS', feed_metrics.DEFAULT_TEXTFILE),
+                        help='Prometheus textfile to update after the run ("" to skip)')
+    parser.add_argument('--health', default=os.environ.get('RSS_HEALTH', DEFAULT_HEALTH_PATH),
+                        help='Circuit breaker state file ("" to fetch every source regardless)')
+    parser.add_argument('--no-discover', action='store_true',
+                        help="Don't look for feed links when a source URL is a web page")
+    parser.add_argument('--processes', type=int, default=int(os.environ.get('RSS_PROCESSES', 0)),
+                        help='Parse on this many worker processes while downloading concurrently '
+                             '(0: one feed at a time, in this process)')
+    parser.add_argument('--fetchers', type=int, default=16,
+                        help='Concurrent downloads with --processes')
+    args = parser.parse_args()
+    if args.output.endswith('.json'):
+        parser.error('--output is NDJSON; use .ndjson or .ndjson.gz '
+                     '(python item_stream.py convert turns it into other shapes)')
+    if args.trace:
+        enable_tracing()
+    pipeline = None
+    if args.processes > 0:
+        from feed_pipeline import FeedPipeline
+        pipeline = FeedPipeline(args.processes, args.fetchers)
     
+    try:
+        _run(args.output, FeedHealth(args.health) if args.health else None,
+             None if args.no_discover else FeedResolver(), pipeline)
+    finally:
+        if pipeline is not None:
+            pipeline.close()
+        if args.metrics:
+            feed_metrics.registry.write_textfile(args.metrics)
+        if args.trace:
+            tracer.print_summary(total_stage="aggregate_all_feeds")
+            print(f"\n✅ Trace: {args.trace} ({tracer.export_chrome(args.trace)} spans) - "
+                  f"open in chrome://tracing or ui.perfetto.dev")
+
+def _run(output: str = DEFAULT_STREAM_PATH, health: Optional[FeedHealth] = None,
+         resolver: Optional[FeedResolver] = None, pipeline=None):
     print("\n" + "="*70)
     print("  IMPROVED RSS FEED AGGREGATOR")
     print("="*70)
@@ -178,56 +334,55 @@ def main():
         print("   Please run 'python setup.py' first")
         return
     
-    # Fetch feeds
-    content = aggregate_all_feeds(hours_back=168)  # Last week for better summaries
+    # Each feed's items go to disk as soon as it is parsed; only counts and one
+    # sample item are kept, so memory doesn't grow with the number of items
+    totals = {}     # category -> [items, with summaries]
+    sample = None
+    try:
+        with tracer.span("aggregate_all_feeds", output=output), ItemStreamWriter(output) as writer:
+            # Last week for better summaries
+            for category, source_name, items in iter_feeds(hours_back=168, health=health, resolver=resolver,
+                                                           pipeline=pipeline):
+                with tracer.span("write", source=source_name):
+                    writer.write_feed(category, source_name, items)
+                
+                with_summaries = [item for item in items if item.summary != NO_SUMMARY]
+                counts = totals.setdefault(category, [0, 0])
+                counts[0] += len(items)
+                counts[1] += len(with_summaries)
+                if sample is None and with_summaries:
+                    sample = (source_name, with_summaries[0])
+    except OSError as e:
+        print(f"\n❌ Error saving: {e}")
+        return
     
-    if not content:
+    if not totals:
         print("\n⚠️  No content fetched")
         return
     
-    # Save to file
-    try:
-        with open('aggregated_content.json', 'w', encoding='utf-8') as f:
-            json.dump(content, f, indent=2, ensure_ascii=False)
-        
-        print(f"\n✅ Saved to: aggregated_content.json")
-        
-        # Print detailed summary
-        print("\n📊 Summary by Category:")
-        for category, sources in content.items():
-            total = sum(len(items) for items in sources.values())
-            with_summaries = sum(
-                sum(1 for item in items if item['summary'] != 'No summary available')
-                for items in sources.values()
-            )
-            print(f"  {category:15} : {total:3} items ({with_summaries:3} with summaries)")
-        
-        # Show sample with summary
+    print(f"\n✅ Saved to: {output} ({writer.items} items)")
+    
+    # Print detailed summary
+    print("\n📊 Summary by Category:")
+    for category, (total, with_summaries) in totals.items():
+        print(f"  {category:15} : {total:3} items ({with_summaries:3} with summaries)")
+    
+    # Show sample with summary
+    if sample is not None:
+        source_name, item = sample
         print("\n📝 Sample Item with Summary:")
-        for category, sources in content.items():
-            for source_name, items in sources.items():
-                for item in items:
-                    if item['summary'] and item['summary'] != 'No summary available':
-                        print(f"\n  Source: {source_name}")
-                        print(f"  Title: {item['title'][:60]}...")
-                        print(f"  Summary: {item['summary'][:150]}...")
-                        print(f"  Link: {item['link']}")
-                        break
-                if any(item['summary'] != 'No summary available' for item in items):
-                    break
-            if any(any(item['summary'] != 'No summary available' for item in items) for items in sources.values()):
-                break
-        
-        print("\n" + "="*70)
-        print("  COMPLETE!")
-        print("="*70)
-        print("\nNext steps:")
-        print("  1. Review: aggregated_content.json")
-        print("  2. Run: python run_daily.py")
-        print("  3. Create posts using the dashboard")
-        
-    except Exception as e:
-        print(f"\n❌ Error saving: {e}")
+        print(f"\n  Source: {source_name}")
+        print(f"  Title: {item.title[:60]}...")
+        print(f"  Summary: {item.summary[:150]}...")
+        print(f"  Link: {item.link}")
+    
+    print("\n" + "="*70)
+    print("  COMPLETE!")
+    print("="*70)
+    print("\nNext steps:")
+    print(f"  1. Review: python item_stream.py head {output}")
+    print("  2. Run: python run_daily.py")
+    print("  3. Create posts using the dashboard")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,25 +3,79 @@
 AI/ML Career Launch System - Daily Runner
 Run this script every morning to prepare your content and job hunting tasks
 
+Each subcommand imports only what it needs (feedparser, the tracker, the
+template engine...), and JSON config is read through a parsed-copy cache, so
+the quick read-only commands are cheap enough for shell hooks and cron.
+
 Usage:
-    python run_daily.py          # Daily content prep
-    python run_daily.py --review # Weekly review
+    python run_daily.py              # Full morning run (fetch + plan + news + jobs)
+    python run_daily.py fetch        # Refresh news only
+    python run_daily.py plan         # Today's content plan
+    python run_daily.py news         # Top news items
+    python run_daily.py history      # Fold the latest items into data/history (item_history.py)
+    python run_daily.py jobs         # Job hunting tasks and follow-ups due
+    python run_daily.py review       # Weekly review (same as --review)
+    python run_daily.py generate     # Draft today's post (news, or --topic/--point for learning)
+    python run_daily.py --profile-import plan   # Startup/import timing report
 """
 
 import json
+import marshal
 import os
 import sys
+import time
+from contextlib import nullcontext
 from datetime import datetime
 import argparse
 
 
+STARTED = time.perf_counter()
+
+# Parsed copies of the JSON config files, keyed by the source's mtime and size
+CACHE_DIR = 'data/.cache'
+
+# Fetched news, one item per line (item_stream.py); the JSON file is what older versions wrote
+NEWS_PATH = 'data/aggregated_content.ndjson'
+LEGACY_NEWS_PATH = 'data/aggregated_content.json'
+
+
 def load_json(filepath, default=None):
-    """Load JSON file safely"""
+    """
+    Load JSON file safely
+    
+    The parsed result is cached in data/.cache as marshal data (several times
+    faster to load than JSON) and reused until the file's mtime or size changes.
+    """
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
-    except:
+        stat = os.stat(filepath)
+    except OSError:
         return default or {}
+    key = [stat.st_mtime_ns, stat.st_size]
+    cache_path = os.path.join(CACHE_DIR, filepath.replace('/', '_').replace(os.sep, '_') + '.marshal')
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_key, data = marshal.load(f)
+        if cached_key == key:
+            return data
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return default or {}
+    
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            marshal.dump([key, data], f)
+        os.replace(tmp_path, cache_path)
+    except (OSError, ValueError):
+        pass
+    return data
 
 
 def print_header(text, char="="):
@@ -38,46 +92,51 @@ def fetch_rss_feeds():
     try:
         # Try to import feedparser
         import feedparser
-        from datetime import timedelta
-        
-        sources = load_json('data/content_sources.json', {})
-        all_content = {}
-        count = 0
-        
+    except ImportError:
+        print("⚠️  feedparser not installed")
+        print("   Run: pip install feedparser --break-system-packages")
+        print("   For now, using cached content...")
+        return 0
+    from item_stream import ItemStreamWriter
+    
+    sources = load_json('data/content_sources.json', {})
+    
+    # Each feed is written as soon as it is parsed (and the file only replaced
+    # at the end), so the dashboard never sees a half-written file
+    with ItemStreamWriter(NEWS_PATH) as writer:
         for category, feeds in sources.items():
-            all_content[category] = {}
             for name, url in list(feeds.items())[:2]:  # Limit to 2 per category for speed
+                items = []
                 try:
                     print(f"   Fetching {name}...", end=" ")
                     feed = feedparser.parse(url)
                     
-                    items = []
                     for entry in feed.entries[:3]:  # Get top 3 items
                         items.append({
                             'title': entry.get('title', 'No title'),
                             'link': entry.get('link', ''),
                             'summary': entry.get('summary', '')[:150]
                         })
-                    
-                    all_content[category][name] = items
-                    count += len(items)
                     print("✅")
                 except Exception as e:
                     print(f"⚠️ ({str(e)[:30]})")
-                    all_content[category][name] = []
-        
-        # Save aggregated content
-        with open('data/aggregated_content.json', 'w', encoding='utf-8') as f:
-            json.dump(all_content, f, indent=2)
-        
-        print(f"✅ Fetched {count} news items")
-        return all_content
-        
-    except ImportError:
-        print("⚠️  feedparser not installed")
-        print("   Run: pip install feedparser --break-system-packages")
-        print("   For now, using cached content...")
-        return load_json('data/aggregated_content.json', {})
+                writer.write_feed(category, name, items)
+    
+    print(f"✅ Fetched {writer.items} news items")
+    return writer.items
+
+
+def compact_history():
+    """Add the latest fetched items to the columnar item history"""
+    try:
+        from item_history import ItemHistory
+        history = ItemHistory()
+    except (ImportError, ValueError) as e:
+        print(f"⚠️  Item history skipped: {e}")
+        return
+    
+    added, partitions = history.compact()
+    print(f"🗄️  Item history: {added} new items ({partitions} days updated)")
 
 
 def check_content_calendar():
@@ -111,7 +170,7 @@ def check_content_calendar():
         """)
     elif 'news' in content_type.lower():
         print("""
-   1. Check: data/aggregated_content.json (see below)
+   1. Check: the top news below (python run_daily.py news)
    2. Pick: Most interesting news item
    3. Open: content_creator_dashboard.html
    4. Choose: "News Update" tab
@@ -138,7 +197,7 @@ def check_content_calendar():
         print("""
    Flexible day! Choose based on:
    - What you learned this week
-   - Interesting news (check aggregated_content.json)
+   - Interesting news (python run_daily.py news)
    - Tools you've tried
         """)
     
@@ -149,39 +208,60 @@ def show_top_news():
     """Display top news items"""
     print_header("🔥 TOP NEWS ITEMS")
     
-    content = load_json('data/aggregated_content.json', {})
+    from item_stream import iter_items
     
-    if not content:
+    path = NEWS_PATH if os.path.exists(NEWS_PATH) else LEGACY_NEWS_PATH
+    if not os.path.exists(path):
         print("\n⚠️  No news items yet. Run 'python setup.py' first!")
         return
     
+    # Read lazily: stops after the fifth source, however big the file is
     count = 0
-    for category, sources in content.items():
+    seen_sources = set()
+    for item in iter_items(path):
+        if item.get('source') in seen_sources:  # One per source
+            continue
+        seen_sources.add(item.get('source'))
+        print(f"\n📰 {item.get('source')}:")
+        print(f"   {item.get('title', 'No title')}")
+        print(f"   🔗 {item.get('link', 'No link')[:60]}...")
+        count += 1
         if count >= 5:
             break
-        for source, items in sources.items():
-            if count >= 5:
-                break
-            for item in items[:1]:  # One per source
-                print(f"\n📰 {source}:")
-                print(f"   {item.get('title', 'No title')}")
-                print(f"   🔗 {item.get('link', 'No link')[:60]}...")
-                count += 1
-                if count >= 5:
-                    break
     
     if count == 0:
         print("\n⚠️  No news items found. RSS feeds may be unavailable.")
         print("   You can still create posts from your own learning!")
 
 
+def show_due_today():
+    """Show follow-ups and next actions due today (only the due rows are read)"""
+    from application_tracker import open_tracker
+    
+    with open_tracker() as tracker:
+        items = tracker.agenda()
+    
+    if not items:
+        print("\n✅ No follow-ups due today")
+        return
+    
+    print(f"\n⏰ DUE TODAY ({len(items)}):")
+    for item in items:
+        overdue = " (overdue)" if item['due_date'] < datetime.now().strftime("%Y-%m-%d") else ""
+        print(f"   [ ] {item['company']} - {item['role']}: {item['action']}{overdue}")
+        if item['follow_up_id']:
+            print(f"       → done? python application_tracker.py done {item['follow_up_id']}")
+
+
 def show_job_hunting_tasks():
     """Show job hunting tasks"""
     print_header("💼 TODAY'S JOB HUNTING TASKS")
     
+    show_due_today()
+    
     print("""
 MORNING (30 min):
-  [ ] Check data/application_tracker.json
+  [ ] Check due actions: python application_tracker.py due
   [ ] Send follow-up emails (Day 7/14/21)
   [ ] Find 3 new job postings
 
@@ -199,7 +279,7 @@ EVENING (60 min):
   
   [ ] Apply to 2-3 jobs on LinkedIn/Naukri
   
-  [ ] Update data/application_tracker.json
+  [ ] Log them: python application_tracker.py add <company> <role>
 
 📊 WEEKLY TARGET:
    - 10-15 applications sent
@@ -238,92 +318,141 @@ AFTER YOU POST:
 
 
 def log_activity():
-    """Log today's activity"""
-    today = datetime.now()
-    
-    log_entry = {
-        "date": today.strftime("%Y-%m-%d"),
-        "day": today.strftime("%A"),
-        "status": "prep_completed",
-        "timestamp": today.isoformat()
-    }
+    """Log today's activity (one appended line, see activity_log.py)"""
+    from activity_log import ActivityLog
     
-    # Load existing logs
+    today = datetime.now()
     try:
-        with open('logs/activity_log.json', 'r') as f:
-            logs = json.load(f)
-    except:
-        logs = []
-    
-    logs.append(log_entry)
-    
-    # Save logs
-    os.makedirs('logs', exist_ok=True)
-    with open('logs/activity_log.json', 'w', encoding='utf-8') as f:
-        json.dump(logs, f, indent=2)
+        ActivityLog().record("prep_completed", when=today, day=today.strftime("%A"))
+    except OSError as e:
+        print(f"⚠️  Could not write activity log: {e}")
+
+
+# Event type -> (low, high, label) per week, matching the targets shown each morning
+WEEKLY_TARGETS = {
+    "post_published": (2, 3, "posts published"),
+    "application_sent": (10, 15, "applications sent"),
+    "recruiter_contacted": (5, 7, "recruiters contacted"),
+    "follow_up_sent": (2, 3, "follow-ups sent"),
+}
 
 
 def weekly_review():
-    """Show weekly review"""
+    """Show weekly review for the last 7 days against the 7 days before"""
     print_header("📊 WEEKLY REVIEW")
     
-    try:
-        with open('logs/activity_log.json', 'r') as f:
-            logs = json.load(f)
-        
-        # Get last 7 days
-        recent = logs[-7:] if len(logs) >= 7 else logs
-        
-        print(f"\n📈 Activity Summary:")
-        print(f"   Days active: {len(recent)}")
-        
-        # Check content tracker
-        tracker = load_json('data/application_tracker.json', {})
-        apps = tracker.get('applications', [])
-        
-        print(f"   Job applications: {len(apps)}")
-        
-        # Status breakdown
-        if apps:
-            statuses = {}
-            for app in apps:
-                status = app.get('status', 'Unknown')
-                statuses[status] = statuses.get(status, 0) + 1
-            
-            print(f"\n📋 Application Status:")
-            for status, count in statuses.items():
-                print(f"   {status}: {count}")
-        
-        print(f"\n💡 INSIGHTS:")
-        print(f"   - Are you posting 2-3x per week?")
-        print(f"   - Are you sending 10-15 applications?")
-        print(f"   - Are you following up consistently?")
-        
-        print(f"\n🎯 NEXT WEEK GOALS:")
-        print(f"   [ ] Plan 3 content topics")
-        print(f"   [ ] Target 5 new companies")
-        print(f"   [ ] Follow up on pending applications")
-        
-    except:
+    # Window totals come from the activity log's prefix sums and the tracker's
+    # indexes - constant work however long you've been logging
+    from datetime import timedelta
+    from activity_log import ActivityLog
+    from application_tracker import open_tracker, week_start
+    
+    activity = ActivityLog()
+    if not activity.summary()["days"]:
         print("\n⚠️  No activity logs yet. Keep using the system!")
+        return
+    
+    today = datetime.now()
+    since = week_start(today)
+    previous_since = week_start(today - timedelta(days=7))
+    previous_until = (today - timedelta(days=7)).strftime("%Y-%m-%d")
+    this_week = activity.window(since)
+    last_week = activity.window(previous_since, previous_until)
+    
+    print(f"\n📈 Activity Summary ({since} → {today.strftime('%Y-%m-%d')}):")
+    print(f"   Days active: {activity.days_active(since)}/7 "
+          f"(last week {activity.days_active(previous_since, previous_until)}/7)")
+    for event_type, (_, _, label) in WEEKLY_TARGETS.items():
+        print(f"   {label.capitalize()}: {this_week[event_type]} (last week {last_week[event_type]})")
+    
+    with open_tracker() as tracker:
+        statuses = tracker.status_counts()
+        total = sum(statuses.values())
+        overdue = len(tracker.follow_ups_due((today - timedelta(days=1)).strftime("%Y-%m-%d")))
+    
+    print(f"   Job applications in tracker: {total}")
+    
+    # Status breakdown
+    if statuses:
+        print(f"\n📋 Application Status:")
+        for status, count in statuses.items():
+            print(f"   {status}: {count}")
+    
+    print(f"\n💡 INSIGHTS:")
+    goals = []
+    for event_type, (low, high, label) in WEEKLY_TARGETS.items():
+        count = this_week[event_type]
+        trend = count - last_week[event_type]
+        trend_text = f"{'+' if trend > 0 else ''}{trend} vs last week" if trend else "same as last week"
+        if count >= low:
+            print(f"   ✅ {count} {label} - on target ({low}-{high}), {trend_text}")
+        else:
+            print(f"   ⚠️  {count} {label} - below target ({low}-{high}), {trend_text}")
+            goals.append(f"Reach {low}+ {label} (this week: {count})")
+    
+    responses = sum(statuses.get(status, 0) for status in ("Interview", "Offer"))
+    if total:
+        print(f"   📬 Response rate: {responses}/{total} applications reached interview or offer "
+              f"({100 * responses // total}%)")
+    if overdue:
+        print(f"   ⏰ {overdue} follow-ups overdue - see: python application_tracker.py due")
+        goals.append(f"Clear the {overdue} overdue follow-ups")
+    
+    print(f"\n🎯 NEXT WEEK GOALS:")
+    for goal in goals or ["Keep the same pace - all weekly targets met"]:
+        print(f"   [ ] {goal}")
+    print(f"   [ ] Plan 3 content topics")
+    print(f"   [ ] Target 5 new companies")
 
 
-def main():
-    """Main function"""
-    parser = argparse.ArgumentParser(description='AI/ML Career Daily Runner')
-    parser.add_argument('--review', action='store_true', help='Show weekly review')
-    args = parser.parse_args()
+def generate_post(topic=None, points=None, style=None):
+    """Draft today's post: learning variations for --topic, else a news post from the top item"""
+    from draft_store import DraftStore
+    
+    print_header("✍️  GENERATE TODAY'S POST")
     
-    if args.review:
-        weekly_review()
+    if topic:
+        from linkedin_post_generator import LinkedInPostGenerator
+        
+        if not points:
+            print("\n⚠️  Add a few key insights: --point \"...\" --point \"...\"")
+            return
+        generator = LinkedInPostGenerator()
+        posts = generator.generate_post_variations(topic=topic, key_points=points)
+        if style:
+            posts = {name: post for name, post in posts.items() if name == style} or posts
+        for name, post in posts.items():
+            print(f"\n--- {name.upper()} ---\n{post}")
+        generator.save_posts(posts, topic)
         return
     
-    # Daily workflow
+    from content_creator_system import ContentTypeGenerator
+    from news_store import NewsItemStore
+    
+    items, _ = NewsItemStore().query(limit=1)
+    if not items:
+        print("\n⚠️  No news items yet. Run: python run_daily.py fetch")
+        print("   Or draft a learning post: python run_daily.py generate --topic \"...\" --point \"...\"")
+        return
+    item = items[0]
+    post = ContentTypeGenerator().generate_news_post(
+        item['title'], item['summary'] or item['title'], item['source'], item['link'], style or "informative"
+    )
+    print(f"\n📰 {item['source']}: {item['title']}\n\n{post}")
+    with DraftStore() as drafts:
+        draft = drafts.save(post, topic=item['title'], style=style or "informative",
+                            content_type="news_update", source=f"news:{item['id']}")
+    print(f"\n✅ Saved draft {draft['id']} - add YOUR perspective before posting!")
+
+
+def run_daily_prep():
+    """The full morning run"""
     print_header("🚀 AI/ML CAREER LAUNCH SYSTEM")
     print(f"Good morning! Let's prepare today's content and tasks.")
     
     # Fetch RSS feeds
     fetch_rss_feeds()
+    compact_history()
     
     # Check calendar
     check_content_calendar()
@@ -358,5 +487,95 @@ def main():
     """)
 
 
+class ImportProfiler:
+    """
+    Times the imports a command triggers (--profile-import)
+    
+    Wraps __import__ and records the inclusive time of each import started
+    directly by this script's code - nested imports are part of their parent.
+    """
+    
+    def __init__(self):
+        import builtins
+        self._builtins = builtins
+        self._original = builtins.__import__
+        self._depth = 0
+        self.timings = []
+        self.modules_before = len(sys.modules)
+    
+    def __enter__(self) -> 'ImportProfiler':
+        self._builtins.__import__ = self._import
+        return self
+    
+    def __exit__(self, *exc):
+        self._builtins.__import__ = self._original
+    
+    def _import(self, name, *args, **kwargs):
+        if name in sys.modules or self._depth:
+            return self._original(name, *args, **kwargs)
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            return self._original(name, *args, **kwargs)
+        finally:
+            self._depth -= 1
+            self.timings.append((name, time.perf_counter() - start))
+    
+    def report(self, command: str, dispatched_at: float, finished_at: float):
+        print_header(f"⏱️  STARTUP REPORT - {command}", "-")
+        print(f"   Script import → dispatch:  {1000 * (dispatched_at - STARTED):7.1f} ms")
+        print(f"   Command (incl. imports):   {1000 * (finished_at - dispatched_at):7.1f} ms")
+        print(f"   Modules loaded by command: {len(sys.modules) - self.modules_before}")
+        for name, seconds in sorted(self.timings, key=lambda timing: -timing[1])[:10]:
+            print(f"      {1000 * seconds:7.1f} ms  {name}")
+        print("   Interpreter startup is not included: python -X importtime run_daily.py ...")
+
+
+COMMANDS = {
+    "daily": run_daily_prep,
+    "fetch": fetch_rss_feeds,
+    "plan": check_content_calendar,
+    "news": show_top_news,
+    "history": compact_history,
+    "jobs": show_job_hunting_tasks,
+    "review": weekly_review,
+}
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='AI/ML Career Daily Runner')
+    parser.add_argument('--review', action='store_true', help='Show weekly review (same as: review)')
+    parser.add_argument('--profile-import', action='store_true',
+                        help='Report startup and per-import timings after the command')
+    sub = parser.add_subparsers(dest='command')
+    
+    sub.add_parser('daily', help='Full morning run (default)')
+    sub.add_parser('fetch', help='Refresh news from RSS feeds')
+    sub.add_parser('plan', help="Today's content plan")
+    sub.add_parser('news', help='Top news items')
+    sub.add_parser('history', help='Add the latest items to the columnar history')
+    sub.add_parser('jobs', help='Job hunting tasks and follow-ups due')
+    sub.add_parser('review', help='Weekly review')
+    
+    generate = sub.add_parser('generate', help="Draft today's post")
+    generate.add_argument('--topic', help='Learning topic (default: post about the top news item)')
+    generate.add_argument('--point', action='append', dest='points', help='Key insight (repeat)')
+    generate.add_argument('--style', help='Only this style (story/tips/breakdown, or a news style)')
+    
+    args = parser.parse_args()
+    command = 'review' if args.review else (args.command or 'daily')
+    
+    profiler = ImportProfiler() if args.profile_import else nullcontext()
+    dispatched_at = time.perf_counter()
+    with profiler:
+        if command == 'generate':
+            generate_post(args.topic, args.points, args.style)
+        else:
+            COMMANDS[command]()
+    if args.profile_import:
+        profiler.report(command, dispatched_at, time.perf_counter())
+
+
 if __name__ == "__main__":
     main()
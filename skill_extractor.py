@@ -0,0 +1,283 @@
+"""
+Job Description Skill Extractor
+Aho-Corasick matcher over a skills taxonomy, built once and scanned in one pass
+
+The taxonomy (data/skills_taxonomy.json) maps canonical names to synonyms:
+
+    "skills":         {"Scikit-learn": ["scikit-learn", "sklearn"], ...}
+    "requirements":   {"PhD": ["phd", "ph.d", "doctorate"], ...}
+    "company_values": {"Ownership": ["ownership", "bias for action"], ...}
+    "sections":       cue phrases that switch between required and nice-to-have
+
+Every synonym goes into a single automaton, so a job description is read once
+no matter how many terms there are. Matches only count on word boundaries:
+"sql" does not fire inside "nosql" and "java" does not fire inside "javascript".
+
+Skills found under a "Nice to have" / "Preferred qualifications" heading, or in
+a sentence ending with "... is a plus", land in nice_to_have instead of
+key_skills.
+
+Usage:
+    python skill_extractor.py job_posting.txt
+"""
+
+import json
+import os
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'skills_taxonomy.json')
+
+# Taxonomy categories that produce output, in the order of the result dict
+CATEGORIES = ("skills", "requirements", "company_values")
+
+# Section cues: nice_to_have and required persist until the next cue,
+# nice_inline ("Docker is a plus") only applies to its own sentence
+SECTION_CUES = ("nice_to_have", "nice_inline", "required")
+
+# Canonical names shorter than this are only matched through their synonyms
+# when they have any: "R" would fire on "R&D", so the taxonomy lists "r programming"
+MIN_CANONICAL_PATTERN = 4
+
+_YEARS_RE = re.compile(r'(\d+)\s*\+?\s*(?:-\s*\d+\s*)?$')
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class SkillExtractor:
+    """
+    Multi-pattern matcher for job descriptions
+
+    The automaton is stored as flat lists indexed by state: goto dicts, failure
+    links and output tuples of (pattern length, category, canonical name).
+    """
+
+    def __init__(self, taxonomy: Optional[Dict] = None):
+        self.taxonomy = {key: {} for key in CATEGORIES + ("sections",)}
+        self._goto: List[Dict[str, int]] = []
+        self._fail: List[int] = []
+        self._out: List[Tuple] = []
+        self._dirty = True
+        if taxonomy:
+            self.add_taxonomy(taxonomy)
+
+    @classmethod
+    def from_json(cls, path: str = DEFAULT_TAXONOMY_PATH) -> 'SkillExtractor':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    # ------------------------------------------------------------------ taxonomy
+
+    def add_taxonomy(self, taxonomy: Dict):
+        """Merge a taxonomy dict (same layout as the JSON file) into this one"""
+        for category, terms in taxonomy.items():
+            for canonical, synonyms in terms.items():
+                self.add_terms(category, canonical, synonyms)
+
+    def add_terms(self, category: str, canonical: str, synonyms: Iterable[str] = ()):
+        """
+        Register a canonical term and its synonyms
+
+        The canonical name itself is matched too, unless it is shorter than
+        MIN_CANONICAL_PATTERN and synonyms are given. For the "sections"
+        category the canonical name is the cue type (see SECTION_CUES).
+        """
+        if category not in self.taxonomy:
+            raise ValueError(f"Unknown taxonomy category '{category}' "
+                             f"(expected one of: {', '.join(self.taxonomy)})")
+        if category == "sections" and canonical not in SECTION_CUES:
+            raise ValueError(f"Unknown section cue '{canonical}' "
+                             f"(expected one of: {', '.join(SECTION_CUES)})")
+
+        patterns = self.taxonomy[category].setdefault(canonical, [])
+        synonyms = list(synonyms)
+        if category == "sections" or (synonyms and len(canonical.strip()) < MIN_CANONICAL_PATTERN):
+            candidates = synonyms
+        else:
+            candidates = [canonical, *synonyms]
+        for pattern in candidates:
+            pattern = pattern.strip().lower()
+            if pattern and pattern not in patterns:
+                patterns.append(pattern)
+        self._dirty = True
+
+    # ------------------------------------------------------------------ automaton
+
+    def _build(self):
+        """Build trie, failure links and merged outputs (breadth-first)"""
+        goto = [{}]
+        out = [[]]
+
+        for category, terms in self.taxonomy.items():
+            for canonical, patterns in terms.items():
+                for pattern in patterns:
+                    state = 0
+                    for ch in pattern:
+                        nxt = goto[state].get(ch)
+                        if nxt is None:
+                            nxt = len(goto)
+                            goto[state][ch] = nxt
+                            goto.append({})
+                            out.append([])
+                        state = nxt
+                    out[state].append((len(pattern), category, canonical))
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                if state:
+                    f = fail[state]
+                    while f and ch not in goto[f]:
+                        f = fail[f]
+                    fail[nxt] = goto[f].get(ch, 0)
+                # Outputs of the suffix state are already merged (parents go first)
+                out[nxt].extend(out[fail[nxt]])
+
+        self._goto = goto
+        self._fail = fail
+        self._out = [tuple(o) for o in out]
+        self._dirty = False
+
+    def iter_matches(self, text: str):
+        """
+        Yield (start, end, category, canonical) for every word-bounded match
+
+        Matches come out in order of their end offset, longest first among
+        those ending at the same offset. text should already be lowercased.
+        """
+        if self._dirty:
+            self._build()
+
+        goto, fail, out = self._goto, self._fail, self._out
+        length = len(text)
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+
+            end = i + 1
+            right_ok = end == length or not _is_word_char(text[end])
+            for size, category, canonical in out[state]:
+                start = end - size
+                # Only ends that are word characters need a boundary ("c++" may touch text)
+                if _is_word_char(ch) and not right_ok:
+                    continue
+                if start > 0 and _is_word_char(text[start]) and _is_word_char(text[start - 1]):
+                    continue
+                yield start, end, category, canonical
+
+    # ------------------------------------------------------------------ extraction
+
+    def extract(self, job_description: str) -> Dict[str, List[str]]:
+        """
+        Extract skills, requirements, nice-to-haves and values in one pass
+
+        Returns:
+            Dict with key_skills, requirements, nice_to_have and company_values,
+            each a list of canonical names in order of first appearance
+        """
+        text = job_description.lower()
+
+        # skill -> number of mentions that count as required (insertion order = first seen)
+        required: Dict[str, int] = {}
+        nice: Dict[str, None] = {}
+        requirements: Dict[str, None] = {}
+        values: Dict[str, None] = {}
+
+        in_nice_section = False
+        cue_end = -1
+        scanned = 0
+        sentence_skills = []
+
+        for start, end, category, canonical in self.iter_matches(text):
+            # Sentence scope for "... is a plus": a newline, ';' or '. ' closes it.
+            # Only text not looked at before is searched, keeping this linear.
+            if start > scanned:
+                gap = text[scanned:start]
+                if '\n' in gap or ';' in gap or '. ' in gap:
+                    sentence_skills = []
+                scanned = start
+
+            if category == "sections":
+                # Only the longest cue ending here counts (matches come longest first):
+                # "preferred qualifications" is not also "qualifications"
+                if end == cue_end:
+                    continue
+                cue_end = end
+
+            if category == "skills":
+                if in_nice_section:
+                    nice.setdefault(canonical, None)
+                    required.setdefault(canonical, 0)
+                else:
+                    required[canonical] = required.get(canonical, 0) + 1
+                    sentence_skills.append(canonical)
+            elif category == "requirements":
+                if canonical == "Years of experience":
+                    years = _YEARS_RE.search(text[max(0, start - 12):start])
+                    if years:
+                        canonical = f"{years.group(1)}+ years of experience"
+                requirements.setdefault(canonical, None)
+            elif category == "company_values":
+                values.setdefault(canonical, None)
+            elif canonical == "nice_to_have":
+                in_nice_section = True
+            elif canonical == "required":
+                # "Python required, Docker a plus" - Python stays a key skill
+                in_nice_section = False
+                sentence_skills = []
+            else:
+                # Inline cue: everything named earlier in this sentence was optional
+                for skill in sentence_skills:
+                    required[skill] -= 1
+                    nice.setdefault(skill, None)
+                sentence_skills = []
+
+        # A skill asked for outright anywhere is a key skill, even if also "a plus"
+        return {
+            "key_skills": [skill for skill, count in required.items() if count > 0],
+            "requirements": list(requirements),
+            "nice_to_have": [skill for skill in nice if required[skill] <= 0],
+            "company_values": list(values)
+        }
+
+
+_default_extractor = None
+
+
+def get_default_extractor() -> SkillExtractor:
+    """Shared extractor for data/skills_taxonomy.json, built on first use"""
+    global _default_extractor
+    if _default_extractor is None:
+        _default_extractor = SkillExtractor.from_json()
+    return _default_extractor
+
+
+def main():
+    """Print what the extractor finds in a job description file"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Extract skills and requirements from a job description')
+    parser.add_argument('job_description', help='Text file with the job posting')
+    parser.add_argument('--taxonomy', default=DEFAULT_TAXONOMY_PATH)
+    args = parser.parse_args()
+
+    with open(args.job_description, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    extracted = SkillExtractor.from_json(args.taxonomy).extract(text)
+    print(json.dumps(extracted, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Compiled Post Template Engine
+Data-driven templates for LinkedIn posts, parsed once into render plans
+
+Templates live in data/post_templates.json, grouped by content type and style.
+Placeholders use str.format-like braces with optional filters:
+
+    {topic}                      plain substitution
+    {topic|lower}                filtered
+    {features|head:4|checks}     filters chain left to right
+    {{ and }}                    literal braces
+
+Every template is compiled at load time: unknown fields, unknown filters and bad
+filter arguments raise TemplateError immediately instead of at render time.
+Rendering walks the precompiled plan and joins the pieces once.
+"""
+
+import json
+import os
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+DEFAULT_TEMPLATES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'post_templates.json')
+
+
+class TemplateError(ValueError):
+    """Raised for invalid templates or missing render values"""
+
+
+# ---------------------------------------------------------------------- filters
+
+def _as_list(value) -> List:
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value] if value else []
+
+
+def _join_points(value, marker: str) -> str:
+    return "\n".join(f"{marker}{point}" for point in _as_list(value))
+
+
+def _numbered(value, arg=None) -> str:
+    return "\n".join(f"{i}. {point}" for i, point in enumerate(_as_list(value), 1))
+
+
+def _first(value, arg=None):
+    items = _as_list(value)
+    return items[0] if items else ''
+
+
+def _rest(value, arg=None) -> List:
+    items = _as_list(value)
+    return items[1:] if len(items) > 1 else items
+
+
+def _prefix(value, arg: str):
+    return f"{arg}{value}" if value else ''
+
+
+# name -> (function(value, arg), argument parser or None when no argument is allowed)
+FILTERS: Dict[str, Tuple[Callable, Optional[Callable]]] = {
+    "lower": (lambda value, arg=None: str(value).lower(), None),
+    "upper": (lambda value, arg=None: str(value).upper(), None),
+    "title": (lambda value, arg=None: str(value).title(), None),
+    "nospace": (lambda value, arg=None: str(value).replace(' ', ''), None),
+    "truncate": (lambda value, arg: str(value)[:arg], int),
+    "head": (lambda value, arg: _as_list(value)[:arg], int),
+    "first": (_first, None),
+    "rest": (_rest, None),
+    "default": (lambda value, arg: value if value else arg, str),
+    "prefix": (_prefix, str),
+    "arrows": (lambda value, arg=None: _join_points(value, "→ "), None),
+    "checks": (lambda value, arg=None: _join_points(value, "✓ "), None),
+    "bullets": (lambda value, arg=None: _join_points(value, "• "), None),
+    "numbered": (_numbered, None),
+}
+
+_TOKEN_RE = re.compile(r'\{\{|\}\}|\{([^{}]*)\}|[{}]')
+_FIELD_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+# ---------------------------------------------------------------------- compiler
+
+class CompiledTemplate:
+    """
+    A template parsed into a render plan
+
+    The plan is a tuple of (literal, field, filters) steps; field is None for
+    the trailing literal. Rendering appends each piece to a list and joins once.
+    """
+
+    __slots__ = ('name', 'source', 'fields', '_plan')
+
+    def __init__(self, name: str, source: str, allowed_fields: Optional[Iterable[str]] = None):
+        self.name = name
+        self.source = source
+        self._plan = self._compile(source, set(allowed_fields) if allowed_fields is not None else None)
+        self.fields = sorted({field for _, field, _ in self._plan if field})
+
+    def _compile(self, source: str, allowed: Optional[set]) -> Tuple:
+        plan = []
+        literal = []
+        position = 0
+
+        for match in _TOKEN_RE.finditer(source):
+            literal.append(source[position:match.start()])
+            position = match.end()
+            token = match.group(0)
+
+            if token == '{{':
+                literal.append('{')
+                continue
+            if token == '}}':
+                literal.append('}')
+                continue
+            if match.group(1) is None:
+                raise TemplateError(f"{self.name}: unbalanced '{token}' at offset {match.start()}")
+
+            parts = match.group(1).split('|')
+            field = parts[0].strip()
+            if not _FIELD_RE.match(field):
+                raise TemplateError(f"{self.name}: invalid placeholder '{{{match.group(1)}}}'")
+            if allowed is not None and field not in allowed:
+                raise TemplateError(
+                    f"{self.name}: unknown field '{field}' (allowed: {', '.join(sorted(allowed))})"
+                )
+
+            filters = []
+            for spec in parts[1:]:
+                # Arguments are taken verbatim (leading/trailing spaces matter for prefix)
+                name, has_arg, arg = spec.partition(':')
+                name = name.strip()
+                if name not in FILTERS:
+                    raise TemplateError(f"{self.name}: unknown filter '{name}' in '{{{match.group(1)}}}'")
+                func, parse_arg = FILTERS[name]
+                if parse_arg is None:
+                    if has_arg:
+                        raise TemplateError(f"{self.name}: filter '{name}' takes no argument")
+                    filters.append((func, None))
+                    continue
+                if not has_arg:
+                    raise TemplateError(f"{self.name}: filter '{name}' needs an argument")
+                try:
+                    filters.append((func, parse_arg(arg)))
+                except ValueError:
+                    raise TemplateError(f"{self.name}: bad argument '{arg}' for filter '{name}'")
+
+            plan.append((''.join(literal), field, tuple(filters)))
+            literal = []
+
+        literal.append(source[position:])
+        plan.append((''.join(literal), None, ()))
+
+        return tuple(plan)
+
+    def render(self, values: Dict, missing: Optional[Callable[[str], str]] = None) -> str:
+        """
+        Render with a mapping of field values
+
+        Args:
+            values: Any mapping (dict, ChainMap, ...) of field -> value
+            missing: Called with the field name when a value is absent; its return
+                     value is inserted as-is. Without it a missing value raises.
+        """
+        parts = []
+        append = parts.append
+        for literal, field, filters in self._plan:
+            append(literal)
+            if field is None:
+                continue
+            if field not in values:
+                if missing is None:
+                    raise TemplateError(f"{self.name}: missing value for '{field}'")
+                append(missing(field))
+                continue
+            value = values[field]
+            for func, arg in filters:
+                value = func(value, arg)
+            append(value if isinstance(value, str) else str(value))
+
+        return ''.join(parts)
+
+
+# ---------------------------------------------------------------------- registry
+
+class TemplateEngine:
+    """
+    Registry of compiled templates, keyed by (content_type, style)
+
+    Each content type in the JSON file may declare:
+        fields         - placeholders its styles are allowed to use
+        styles         - {style_name: template text}
+        default_style  - style used for unknown style names
+        hook_options / structure - editorial metadata, passed through untouched
+    """
+
+    def __init__(self, templates_path: str = DEFAULT_TEMPLATES_PATH):
+        self.templates_path = templates_path
+        self.definitions = {}
+        self._compiled = {}
+        self.load(templates_path)
+
+    def load(self, templates_path: str):
+        """(Re)load and compile every template in the file"""
+        with open(templates_path, 'r', encoding='utf-8') as f:
+            definitions = json.load(f)
+        self.load_definitions(definitions)
+
+    def load_definitions(self, definitions: Dict):
+        """Compile templates from an already-parsed definitions dict"""
+        compiled = {}
+        for content_type, definition in definitions.items():
+            fields = definition.get('fields')
+            styles = definition.get('styles', {})
+            for style, source in styles.items():
+                if isinstance(source, list):
+                    source = "\n".join(source)
+                compiled[(content_type, style)] = CompiledTemplate(f"{content_type}/{style}", source, fields)
+
+            default_style = definition.get('default_style')
+            if default_style is not None and default_style not in styles:
+                raise TemplateError(f"{content_type}: default_style '{default_style}' has no template")
+
+        # Swap in only after everything compiled, so a bad file never half-loads
+        self.definitions = definitions
+        self._compiled = compiled
+
+    def content_types(self) -> List[str]:
+        return list(self.definitions)
+
+    def styles(self, content_type: str) -> List[str]:
+        return list(self.definitions.get(content_type, {}).get('styles', {}))
+
+    def get(self, content_type: str, style: Optional[str] = None) -> CompiledTemplate:
+        """Compiled template for a style, falling back to the content type's default_style"""
+        template = self._compiled.get((content_type, style))
+        if template is not None:
+            return template
+
+        default_style = self.definitions.get(content_type, {}).get('default_style')
+        template = self._compiled.get((content_type, default_style))
+        if template is None:
+            raise TemplateError(f"No template for {content_type}/{style}")
+
+        return template
+
+    def render(self, content_type: str, style: Optional[str] = None, **values) -> str:
+        return self.get(content_type, style).render(values)
+
+    def render_many(self, content_type: str, style: Optional[str],
+                    rows: Iterable[Dict]) -> Iterator[str]:
+        """Render one post per row of values - for bulk generation"""
+        render = self.get(content_type, style).render
+        for row in rows:
+            yield render(row)
+
+
+_default_engine = None
+
+
+def get_default_engine() -> TemplateEngine:
+    """Shared engine for data/post_templates.json, compiled on first use"""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = TemplateEngine()
+    return _default_engine
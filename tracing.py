@@ -0,0 +1,179 @@
+"""
+Pipeline Tracing
+Low-overhead timing spans for the feed aggregation pipeline
+
+    from tracing import tracer
+
+    with tracer.span("parse", bytes=len(body)):
+        root = ET.fromstring(body)
+
+Tracing is off by default: span() then returns one shared no-op context
+manager, so an instrumented call costs an attribute check and a function call.
+When enabled (rss_reader.py --trace trace.json, or RSS_TRACE=trace.json),
+every span is recorded with its thread, and:
+
+- export_chrome() writes Chrome trace format - open it in chrome://tracing
+  or https://ui.perfetto.dev to see each feed's stages on a timeline;
+- print_summary() prints per-stage totals and the slowest sources.
+
+Spans opened with source=... label everything nested inside them on that
+thread, so stage timings can be broken down per feed.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'args', 'start', 'previous_source')
+
+    def __init__(self, tracer: 'Tracer', name: str, args: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        local = self.tracer._local
+        self.previous_source = getattr(local, 'source', None)
+        if 'source' in self.args:
+            local.source = self.args['source']
+        elif self.previous_source is not None:
+            self.args['source'] = self.previous_source
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.tracer._local.source = self.previous_source
+        # list.append is atomic; no lock on the hot path
+        self.tracer.events.append((self.name, self.start, end - self.start, threading.get_ident(), self.args))
+        return False
+
+
+class Tracer:
+    """Collects (name, start_ns, duration_ns, thread id, args) spans while enabled"""
+
+    def __init__(self):
+        self.enabled = False
+        self.events: List[tuple] = []
+        self._local = threading.local()
+        self._origin = time.perf_counter_ns()
+
+    def enable(self):
+        self.events = []
+        self._origin = time.perf_counter_ns()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name: str, **args):
+        """Context manager timing one stage; args end up in the trace event"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, name, args)
+
+    # ------------------------------------------------------------------ export
+
+    def export_chrome(self, path: str) -> int:
+        """
+        Write a Chrome trace (JSON object format, complete 'X' events)
+
+        Returns:
+            Number of spans written
+        """
+        pid = os.getpid()
+        thread_numbers: Dict[int, int] = {}
+        events = []
+        for name, start, duration, thread, args in self.events:
+            tid = thread_numbers.setdefault(thread, len(thread_numbers) + 1)
+            events.append({
+                "name": name, "cat": "rss", "ph": "X", "pid": pid, "tid": tid,
+                "ts": (start - self._origin) / 1000, "dur": duration / 1000,
+                "args": {key: value if isinstance(value, (int, float, str, bool)) else str(value)
+                         for key, value in args.items()}
+            })
+        for thread, tid in thread_numbers.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                           "args": {"name": "main" if thread == threading.main_thread().ident else f"worker-{tid}"}})
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(self.events)
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Returns:
+            {"stages": {name: {count, total_ms, mean_ms, max_ms}},
+             "sources": {source: {stage: total_ms}}}
+        """
+        stages: Dict[str, Dict] = {}
+        sources: Dict[str, Dict[str, float]] = {}
+        for name, _, duration, _, args in self.events:
+            ms = duration / 1e6
+            stage = stages.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stage["count"] += 1
+            stage["total_ms"] += ms
+            stage["max_ms"] = max(stage["max_ms"], ms)
+            source = args.get('source')
+            if source is not None:
+                per_source = sources.setdefault(source, {})
+                per_source[name] = per_source.get(name, 0.0) + ms
+        for stage in stages.values():
+            stage["mean_ms"] = stage["total_ms"] / stage["count"]
+        return {"stages": stages, "sources": sources}
+
+    def print_summary(self, top_sources: int = 10, total_stage: Optional[str] = None):
+        """
+        Per-stage table plus the slowest sources
+
+        Args:
+            total_stage: span whose time the percentages are relative to
+                         (default: the stage with the largest total)
+        """
+        summary = self.summary()
+        stages = summary["stages"]
+        if not stages:
+            print("\n⏱️  No spans recorded")
+            return
+        total = stages[total_stage]["total_ms"] if total_stage in stages else \
+            max(stage["total_ms"] for stage in stages.values())
+
+        print(f"\n⏱️  Pipeline stages ({len(self.events)} spans)")
+        print(f"   {'stage':24} {'count':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'share':>6}")
+        for name, stage in sorted(stages.items(), key=lambda entry: -entry[1]["total_ms"]):
+            print(f"   {name:24} {stage['count']:>7} {stage['total_ms']:>10.1f} {stage['mean_ms']:>9.2f} "
+                  f"{stage['max_ms']:>9.1f} {100 * stage['total_ms'] / total:>5.1f}%")
+        print("   (nested stages are included in their parents' totals)")
+
+        sources = summary["sources"]
+        if sources:
+            columns = [name for name in ("request", "connect", "download", "parse", "extract", "clean_html")
+                       if name in stages]
+            slowest = sorted(sources.items(), key=lambda entry: -max(entry[1].values()))[:top_sources]
+            print(f"\n🐢 Slowest sources (ms)")
+            print(f"   {'source':30} " + " ".join(f"{name:>10}" for name in columns))
+            for source, times in slowest:
+                print(f"   {str(source)[:30]:30} " + " ".join(f"{times.get(name, 0.0):>10.1f}" for name in columns))
+
+
+# Process-wide tracer the pipeline modules use
+tracer = Tracer()